@@ -0,0 +1,14 @@
+"""Helpers shared by the benchmark scripts.
+
+The scripts run as `python benchmarks/<name>.py`, which puts this directory
+on `sys.path`, so they import it as `from _stats import pct`.
+"""
+
+
+def pct(samples: list[float], q: float, scale: float = 1000.0) -> float:
+    """The `q` quantile (nearest rank) of `samples` in seconds, times `scale`
+    (milliseconds by default); NaN when there are no samples."""
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * scale
@@ -0,0 +1,161 @@
+"""Approval latency while /chat is overloaded: priority admission vs one queue.
+
+Parks `--approvals` trades waiting for approval, then keeps `--chat-clients`
+clients sending LLM-bound `/chat` requests back to back (sleeping for the
+`Retry-After` they are given when shed) and, once the chat queue is full,
+approves the parked trades one every `--approve-every-ms`. It runs twice
+in-process against the offline fake model:
+
+- `fifo`: every run waits in one queue for `--max-concurrency` slots and
+  nothing is shed (the old single semaphore);
+- `priority`: the API's admission controller, where approvals are served
+  first and may use `--reserved` slots chats cannot, and chats beyond
+  `--chat-max-waiting` queued get 503 with Retry-After.
+
+Reports /approve and /chat latency percentiles, chat throughput and sheds.
+
+    python benchmarks/admission.py --chat-clients 300 --max-concurrency 50 --latency-ms 200
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections import Counter
+
+from _stats import pct
+
+
+def _fifo(capacity: int):
+    from langgraph_cb.admission import AdmissionController, Budget
+
+    class Fifo(AdmissionController):
+        """One queue for every kind of run; nothing is shed."""
+
+        def __init__(self):
+            super().__init__(capacity, {"all": Budget(capacity)})
+
+        async def acquire(self, kind: str, slots: int = 1) -> float:
+            return await super().acquire("all", slots)
+
+        def release(self, kind: str, slots: int = 1, held=None) -> None:
+            super().release("all", slots, held)
+
+        def saturated(self, kind: str) -> bool:
+            return False
+
+    return Fifo()
+
+
+async def _run(app, args, label: str) -> dict:
+    import httpx
+
+    chat_latency: list[float] = []
+    approve_latency: list[float] = []
+    statuses: Counter[int] = Counter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        parked = []
+        for i in range(args.approvals):
+            body = (
+                await client.post(
+                    "/chat", json={"message": "Buy 10 MSFT", "thread_id": f"{label}-buy-{i}"}
+                )
+            ).json()
+            assert body["status"] == "approval_required", body
+            parked.append(body["thread_id"])
+
+        stop = asyncio.Event()
+
+        async def chatter(c: int) -> None:
+            turn = 0
+            while not stop.is_set():
+                start = time.perf_counter()
+                response = await client.post(
+                    "/chat",
+                    json={
+                        "message": f"Tell me a story, part {turn}",
+                        "thread_id": f"{label}-chat-{c}",
+                    },
+                    timeout=None,
+                )
+                statuses[response.status_code] += 1
+                if response.status_code == 503:
+                    await asyncio.sleep(float(response.headers["retry-after"]))
+                else:
+                    chat_latency.append(time.perf_counter() - start)
+                turn += 1
+
+        async def approver() -> None:
+            # Let the chat clients fill every slot and the queue first.
+            await asyncio.sleep(args.warmup)
+            for thread_id in parked:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/approve", json={"thread_id": thread_id, "decision": "yes"}, timeout=None
+                )
+                assert response.status_code == 200, response.text
+                approve_latency.append(time.perf_counter() - start)
+                await asyncio.sleep(args.approve_every_ms / 1000)
+            stop.set()
+
+        start = time.perf_counter()
+        await asyncio.gather(approver(), *(chatter(c) for c in range(args.chat_clients)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "approve": approve_latency,
+        "chat": chat_latency,
+        "statuses": statuses,
+        "elapsed": elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chat-clients", type=int, default=300)
+    parser.add_argument("--approvals", type=int, default=40)
+    parser.add_argument("--approve-every-ms", type=float, default=50.0)
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds before approving")
+    parser.add_argument("--max-concurrency", type=int, default=50)
+    parser.add_argument("--reserved", type=int, default=5)
+    parser.add_argument("--chat-max-waiting", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="median model latency")
+    args = parser.parse_args()
+
+    os.environ["LANGGRAPH_CB_MODEL"] = "fake"
+    os.environ["LANGGRAPH_CB_FAKE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LANGGRAPH_CB_FAKE_LATENCY_SIGMA"] = "0.3"
+    os.environ["LANGGRAPH_CB_MAX_CONCURRENCY"] = str(args.max_concurrency)
+    os.environ["LANGGRAPH_CB_APPROVAL_RESERVED"] = str(args.reserved)
+    os.environ["LANGGRAPH_CB_CHAT_MAX_WAITING"] = str(args.chat_max_waiting)
+    os.environ["LANGGRAPH_CB_APPROVAL_TTL"] = "0"
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+    from langgraph_cb import api
+
+    priority = api._admission
+    results = {}
+    for label, controller in (("fifo", _fifo(args.max_concurrency)), ("priority", priority)):
+        api._admission = controller
+        results[label] = asyncio.run(_run(api.app, args, label))
+
+    print(
+        f"{args.chat_clients} chat clients, {args.max_concurrency} slots "
+        f"({args.reserved} reserved), {args.latency_ms:g} ms model\n"
+    )
+    print(
+        f"{'':>9} {'approve p50':>12} {'p99':>8} {'max':>8} "
+        f"{'chat p50':>9} {'p99':>8} {'chats/s':>8} {'503s':>6}"
+    )
+    for label, r in results.items():
+        print(
+            f"{label:>9} {pct(r['approve'], 0.5):>10.0f}ms {pct(r['approve'], 0.99):>6.0f}ms "
+            f"{max(r['approve']) * 1000:>6.0f}ms {pct(r['chat'], 0.5):>7.0f}ms "
+            f"{pct(r['chat'], 0.99):>6.0f}ms {len(r['chat']) / r['elapsed']:>8.1f} "
+            f"{r['statuses'][503]:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Hit rate, wrong-answer rate and lookup cost of the semantic answer cache.
+
+Stores one phrasing of each synthetic knowledge question, then asks the
+other phrasings (should hit), the same relation about a different subject
+and a negated phrasing (both must miss) at several similarity thresholds. A hit that returns another
+question's answer counts as wrong. Also times lookups as the cache fills
+with `--entries` questions and checks that price/trade questions are never
+served.
+
+    python benchmarks/answer_cache.py --entries 10000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+# relation -> phrasings; every phrasing of a relation asks the same question.
+RELATIONS = {
+    "capital": [
+        "What is the capital of {x}?",
+        "capital of {x}?",
+        "Which city is the capital of {x}",
+        "Tell me the capital city of {x}",
+    ],
+    "author": [
+        "Who wrote {x}?",
+        "who is the writer of {x}",
+        "Who was {x} written by?",
+        "{x} was written by whom?",
+    ],
+    "height": [
+        "How tall is {x}?",
+        "how high is {x}",
+        "What is the height of {x}?",
+        "{x} height?",
+    ],
+    "discovered": [
+        "Who discovered {x}?",
+        "who first discovered {x}",
+        "{x} was discovered by who?",
+        "Who was the discoverer of {x}",
+    ],
+}
+# A negated question shares almost every word with the stored one.
+NEGATED = {
+    "capital": "Which city is not the capital of {x}?",
+    "author": "Who didn't write {x}?",
+    "height": "What is not the height of {x}?",
+    "discovered": "Who never discovered {x}?",
+}
+SUBJECTS = {
+    "capital": ["France", "Germany", "Japan", "Kenya", "Peru", "Norway", "Egypt", "Chile"],
+    "author": ["Hamlet", "Macbeth", "Dracula", "Emma", "Ulysses", "Beloved", "Middlemarch"],
+    "height": ["Mount Everest", "K2", "Kilimanjaro", "Mont Blanc", "Denali", "Aconcagua"],
+    "discovered": ["penicillin", "radium", "insulin", "oxygen", "electrons", "X-rays"],
+}
+UNSAFE = [
+    "What is the price of AAPL?",
+    "Buy 10 shares of Tesla",
+    "How is the market doing today?",
+    "what does it cost",
+    "Who wrote it?",
+]
+
+
+def _facts() -> list[tuple[str, str]]:
+    return [(rel, subject) for rel, subjects in SUBJECTS.items() for subject in subjects]
+
+
+def _quality(threshold: float) -> dict:
+    from langgraph_cb.cache.semantic import SemanticAnswerCache
+
+    cache = SemanticAnswerCache(threshold=threshold)
+    facts = _facts()
+    for rel, subject in facts:
+        cache.update(RELATIONS[rel][0].format(x=subject), f"{rel}:{subject}")
+
+    hits = wrong = asked = 0
+    for rel, subject in facts:
+        for phrasing in RELATIONS[rel][1:]:
+            asked += 1
+            answer = cache.lookup(phrasing.format(x=subject))
+            if answer is not None:
+                hits += 1
+                wrong += answer != f"{rel}:{subject}"
+
+    # Same relation, unseen subject: any answer is wrong.
+    cross = cross_wrong = 0
+    for rel, subjects in SUBJECTS.items():
+        for phrasing in RELATIONS[rel]:
+            cross += 1
+            cross_wrong += cache.lookup(phrasing.format(x="Atlantis")) is not None
+    negated = sum(
+        cache.lookup(NEGATED[rel].format(x=subject)) is not None for rel, subject in facts
+    )
+    return {
+        "hit_rate": hits / asked,
+        "wrong": wrong / max(hits, 1),
+        "unseen_served": cross_wrong / cross,
+        "negated_served": negated / len(facts),
+    }
+
+
+def _latency(entries: int, lookups: int) -> list[tuple[int, float]]:
+    from langgraph_cb.cache.semantic import SemanticAnswerCache
+
+    rng = random.Random(0)
+    cache = SemanticAnswerCache(max_entries=entries)
+    words = [f"topic{i}" for i in range(5000)]
+    results = []
+    checkpoints = {entries // 10, entries // 2, entries}
+    for i in range(1, entries + 1):
+        cache.update(f"Explain {rng.choice(words)} versus {rng.choice(words)} {i}", "a")
+        if i in checkpoints:
+            samples = []
+            for _ in range(lookups):
+                question = f"Explain {rng.choice(words)} versus {rng.choice(words)}"
+                start = time.perf_counter()
+                cache.lookup(question)
+                samples.append(time.perf_counter() - start)
+            results.append((len(cache), statistics.median(samples)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    from langgraph_cb.cache.semantic import SemanticAnswerCache
+
+    print(
+        f"{'threshold':>9} {'hit rate':>9} {'wrong hits':>11} {'unseen served':>14} "
+        f"{'negated served':>15}"
+    )
+    for threshold in (0.5, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95):
+        q = _quality(threshold)
+        print(
+            f"{threshold:>9.2f} {q['hit_rate']:>9.1%} {q['wrong']:>11.1%} "
+            f"{q['unseen_served']:>14.1%} {q['negated_served']:>15.1%}"
+        )
+
+    cache = SemanticAnswerCache()
+    for question in UNSAFE:
+        cache.update(question, "cached")
+    served = sum(cache.lookup(question) is not None for question in UNSAFE)
+    print(f"\nprice/trade/contextual questions served: {served} of {len(UNSAFE)}")
+
+    print(f"\n{'entries':>8} {'lookup ms':>10}")
+    for size, seconds in _latency(args.entries, args.lookups):
+        print(f"{size:>8} {seconds * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""End-to-end load test of the HITL API against the offline fake model.
+
+Runs the FastAPI app in-process (no sockets, no OpenAI key) and drives a mix
+of buy flows (/chat -> /approve), free-form price questions the fast-path
+rules cannot parse (model -> tools, `--llm-ratio`) and well-formed price
+questions (answered by the rules) at the given concurrency. Reports
+p50/p95/p99 latency per endpoint, throughput, peak RSS and the share of
+chatbot turns served without a model call.
+
+    python benchmarks/api_load.py --requests 2000 --concurrency 200 --latency-ms 300
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import time
+
+from _stats import pct
+
+
+async def _drive(
+    app, total: int, concurrency: int, buy_ratio: float, llm_ratio: float
+) -> dict:
+    import httpx
+
+    latencies: dict[str, list[float]] = {"/chat": [], "/approve": []}
+    errors = 0
+    slots = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def post(path: str, payload: dict) -> dict:
+            nonlocal errors
+            start = time.perf_counter()
+            response = await client.post(path, json=payload, timeout=None)
+            latencies[path].append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+                return {}
+            return response.json()
+
+        async def flow(i: int) -> None:
+            async with slots:
+                slot = i % 100
+                if slot < buy_ratio * 100:
+                    body = await post("/chat", {"message": f"Buy {i % 50 + 1} MSFT"})
+                    if body.get("status") == "approval_required":
+                        await post(
+                            "/approve", {"thread_id": body["thread_id"], "decision": "yes"}
+                        )
+                elif slot < (buy_ratio + llm_ratio) * 100:
+                    await post("/chat", {"message": "Is AAPL or MSFT worth more right now?"})
+                else:
+                    await post("/chat", {"message": "What is the price of AAPL and MSFT?"})
+
+        start = time.perf_counter()
+        await asyncio.gather(*(flow(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+
+    return {"latencies": latencies, "elapsed": elapsed, "errors": errors}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="conversations to run")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="median model latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.3)
+    parser.add_argument("--buy-ratio", type=float, default=0.5)
+    parser.add_argument(
+        "--llm-ratio", type=float, default=0.25, help="price questions sent to the model"
+    )
+    args = parser.parse_args()
+
+    os.environ["LANGGRAPH_CB_MODEL"] = "fake"
+    os.environ["LANGGRAPH_CB_FAKE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LANGGRAPH_CB_FAKE_LATENCY_SIGMA"] = str(args.latency_sigma)
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+    from langgraph_cb.api import app
+    from langgraph_cb.metrics import metrics
+
+    result = asyncio.run(
+        _drive(app, args.requests, args.concurrency, args.buy_ratio, args.llm_ratio)
+    )
+    total = sum(len(v) for v in result["latencies"].values())
+
+    print(f"{'endpoint':<10} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for path, samples in result["latencies"].items():
+        if samples:
+            print(
+                f"{path:<10} {len(samples):>6} {pct(samples, 0.50):>8.1f} "
+                f"{pct(samples, 0.95):>8.1f} {pct(samples, 0.99):>8.1f}"
+            )
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    routes = metrics.chatbot_routes.values()
+    turns = sum(routes.values())
+    if turns:
+        fast = turns - routes.get(("llm",), 0)
+        print(f"\nserved without an LLM call: {fast / turns:.1%} of {turns:g} chatbot turns")
+    print(
+        f"\nrequests: {total}  errors: {result['errors']}  "
+        f"throughput: {total / result['elapsed']:.1f} req/s  peak RSS: {rss_mb:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
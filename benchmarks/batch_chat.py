@@ -0,0 +1,84 @@
+"""Throughput of /chat/batch versus the same conversations sent one by one.
+
+Runs the FastAPI app in-process against the offline fake model. The same
+workload (model -> tools questions, with every `--buy-every`-th item a buy that
+parks at approval) is sent as sequential /chat calls and as /chat/batch
+requests of `--batch-size` items.
+
+    python benchmarks/batch_chat.py --items 500 --batch-size 100 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections import Counter
+
+
+def _items(n: int, buy_every: int) -> list[dict]:
+    return [
+        {"message": f"Buy {i % 50 + 1} MSFT" if buy_every and i % buy_every == 0
+         else "How is AAPL trading today?"}
+        for i in range(n)
+    ]
+
+
+async def _run(app, items: list[dict], batch_size: int, concurrency: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for item in items:
+            response = await client.post("/chat", json=item, timeout=None)
+            response.raise_for_status()
+        sequential = time.perf_counter() - start
+
+        statuses: Counter = Counter()
+        start = time.perf_counter()
+        for offset in range(0, len(items), batch_size):
+            response = await client.post(
+                "/chat/batch",
+                json={
+                    "items": items[offset : offset + batch_size],
+                    "max_concurrency": concurrency,
+                },
+                timeout=None,
+            )
+            response.raise_for_status()
+            statuses.update(r["status"] for r in response.json()["results"])
+        batched = time.perf_counter() - start
+
+    return {"sequential": sequential, "batched": batched, "statuses": statuses}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32, help="runs in flight per batch")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="median model latency")
+    parser.add_argument("--buy-every", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ["LANGGRAPH_CB_MODEL"] = "fake"
+    os.environ["LANGGRAPH_CB_FAKE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LANGGRAPH_CB_FAKE_LATENCY_SIGMA"] = "0"
+    os.environ.setdefault("LANGGRAPH_CB_BATCH_CONCURRENCY", str(args.concurrency))
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+    from langgraph_cb.api import app
+
+    items = _items(args.items, args.buy_every)
+    result = asyncio.run(_run(app, items, args.batch_size, args.concurrency))
+
+    n = len(items)
+    print(f"{'mode':<12} {'seconds':>8} {'items/s':>9}")
+    for mode in ("sequential", "batched"):
+        print(f"{mode:<12} {result[mode]:>8.2f} {n / result[mode]:>9.1f}")
+    print(f"\nspeedup: {result['sequential'] / result['batched']:.1f}x")
+    print("batch statuses: " + ", ".join(f"{k}={v}" for k, v in sorted(result["statuses"].items())))
+
+
+if __name__ == "__main__":
+    main()
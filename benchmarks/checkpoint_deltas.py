@@ -0,0 +1,103 @@
+"""Checkpoint write amplification on long threads: full snapshots vs deltas.
+
+Runs `--turns` chat turns per thread through the HITL graph (offline fake
+model, no context trimming, so the message list grows every step) against
+the in-memory and SQLite savers, first with `snapshot_every=1` (every write
+is a full snapshot, the old behaviour) and then with message deltas. Reports
+bytes serialized per checkpoint write, time spent in `put`, and the latency
+of loading the final state.
+
+    python benchmarks/checkpoint_deltas.py --turns 500 --snapshot-every 32
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+
+def _instrument(saver, stats: dict) -> None:
+    dumps = saver.serde.dumps_typed
+    put = saver.put
+
+    def counting_dumps(obj):
+        type_, data = dumps(obj)
+        stats["bytes"] += len(data)
+        return type_, data
+
+    def timed_put(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return put(*args, **kwargs)
+        finally:
+            stats["put_seconds"] += time.perf_counter() - start
+            stats["puts"] += 1
+
+    saver.serde.dumps_typed = counting_dumps
+    saver.put = timed_put
+
+
+def _run(saver, turns: int, threads: int) -> dict:
+    from langgraph_cb.graphs.hitl import build_graph
+    from langgraph_cb.models.fake import FakeChatModel
+
+    stats = {"bytes": 0, "put_seconds": 0.0, "puts": 0}
+    _instrument(saver, stats)
+    graph = build_graph(saver, model_factory=lambda cache: FakeChatModel(), context_tokens=0)
+    configs = [{"configurable": {"thread_id": f"long-{i}"}} for i in range(threads)]
+    for turn in range(turns):
+        for config in configs:
+            graph.invoke(
+                {"messages": [{"role": "user", "content": f"How is MSFT trading today? ({turn})"}]},
+                config,
+            )
+    reads = []
+    for config in configs:
+        start = time.perf_counter()
+        state = graph.get_state(config)
+        reads.append(time.perf_counter() - start)
+    stats["messages"] = len(state.values["messages"])
+    stats["read_ms"] = statistics.mean(reads) * 1000
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--snapshot-every", type=int, default=32)
+    args = parser.parse_args()
+
+    from langgraph_cb.checkpoint.memory import BoundedMemorySaver
+    from langgraph_cb.checkpoint.sqlite import DurableSqliteSaver
+
+    print(
+        f"{args.turns} turns x {args.threads} thread(s)\n\n"
+        f"{'saver':<8} {'mode':<10} {'puts':>6} {'KiB/put':>9} {'put ms':>8} "
+        f"{'total s':>8} {'read ms':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("memory", "sqlite"):
+            for mode, every in (("snapshots", 1), ("deltas", args.snapshot_every)):
+                if name == "memory":
+                    saver = BoundedMemorySaver(snapshot_every=every, ttl_seconds=None, max_bytes=None)
+                else:
+                    saver = DurableSqliteSaver(
+                        os.path.join(tmp, f"{mode}.db"), snapshot_every=every, compact_interval=None
+                    )
+                stats = _run(saver, args.turns, args.threads)
+                if name == "sqlite":
+                    saver.close()
+                puts = stats["puts"]
+                print(
+                    f"{name:<8} {mode:<10} {puts:>6} {stats['bytes'] / puts / 1024:>9.1f} "
+                    f"{stats['put_seconds'] / puts * 1000:>8.3f} {stats['put_seconds']:>8.2f} "
+                    f"{stats['read_ms']:>8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Checkpoint write latency per graph step: in-memory vs SQLite.
+
+Drives the HITL graph through "buy -> approve" flows, which take the rule-based
+buy fast path and never call the model, and times every checkpoint write.
+
+    python benchmarks/checkpoint_latency.py --threads 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+from langgraph.types import Command
+
+from _stats import pct
+
+from langgraph_cb.checkpoint.memory import BoundedMemorySaver
+from langgraph_cb.checkpoint.sqlite import DurableSqliteSaver
+from langgraph_cb.graphs.hitl import build_graph
+
+
+def _timed(samples: list[float], fn):
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+
+    return wrapper
+
+
+async def _run(saver, threads: int, concurrency: int) -> list[float]:
+    samples: list[float] = []
+    saver.aput = _timed(samples, saver.aput)
+    saver.aput_writes = _timed(samples, saver.aput_writes)
+    graph = build_graph(saver)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def flow(i: int) -> None:
+        config = {"configurable": {"thread_id": f"bench-{i}"}}
+        async with slots:
+            await graph.ainvoke(
+                {"messages": [{"role": "user", "content": "Buy 10 MSFT"}]}, config
+            )
+            await graph.ainvoke(Command(resume="yes"), config)
+
+    await asyncio.gather(*(flow(i) for i in range(threads)))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        savers = {
+            "memory": BoundedMemorySaver(),
+            "sqlite": DurableSqliteSaver(os.path.join(tmp, "bench.db")),
+        }
+        print(f"{'backend':<8} {'writes':>7} {'mean ms':>8} {'p50':>7} {'p95':>7} {'p99':>7}")
+        for name, saver in savers.items():
+            samples = asyncio.run(_run(saver, args.threads, args.concurrency))
+            print(
+                f"{name:<8} {len(samples):>7} {statistics.mean(samples) * 1000:>8.3f} "
+                f"{pct(samples, 0.50):>7.3f} {pct(samples, 0.95):>7.3f} "
+                f"{pct(samples, 0.99):>7.3f}"
+            )
+        savers["sqlite"].close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Prompt tokens per turn with and without the context manager.
+
+Simulates a long conversation, runs the context node before every model call
+and reports the tokens that would be sent to the model. The summarizer is a
+local fake model, so no network access is needed.
+
+    python benchmarks/context_budget.py --turns 200 --max-tokens 2000
+"""
+
+import argparse
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from langgraph_cb.graphs.context import ContextManager, with_summary
+
+USER_TURN = "What is the price of {n} MSFT stocks, and how does it compare to AAPL today?"
+AI_TURN = "10 MSFT stocks cost $2003.00 at $200.30 each; AAPL trades at $100.40. " * 3
+
+
+def _apply(messages: list, update: dict) -> list:
+    removed = {m.id for m in update.get("messages", []) if isinstance(m, RemoveMessage)}
+    return [m for m in messages if m.id not in removed]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--max-tokens", type=int, default=2000)
+    parser.add_argument("--every", type=int, default=20)
+    args = parser.parse_args()
+
+    summarizer = FakeListChatModel(responses=["User compared MSFT and AAPL prices. " * 8])
+    context = ContextManager(summarizer, max_tokens=args.max_tokens)
+
+    state = {"messages": [], "summary": ""}
+    untrimmed = 0
+    print(f"{'turn':>5} {'untrimmed':>10} {'managed':>8} {'kept msgs':>10}")
+    for turn in range(1, args.turns + 1):
+        human = HumanMessage(content=USER_TURN.format(n=turn), id=f"h{turn}")
+        state["messages"].append(human)
+        untrimmed += count_tokens_approximately([human])
+
+        update = context(state)
+        if update:
+            state["messages"] = _apply(state["messages"], update)
+            state["summary"] = update["summary"]
+        prompt = with_summary(state["messages"], state["summary"])
+
+        if turn % args.every == 0 or turn == 1:
+            print(
+                f"{turn:>5} {untrimmed:>10} {count_tokens_approximately(prompt):>8} "
+                f"{len(state['messages']):>10}"
+            )
+
+        ai = AIMessage(content=AI_TURN, id=f"a{turn}")
+        state["messages"].append(ai)
+        untrimmed += count_tokens_approximately([ai])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Price lookup latency: TTL cache over a slow provider vs a background-fed snapshot.
+
+Reads random symbols for `--seconds` (one read every `--every-ms`) from
+
+- `cache`: `QuoteCache` with a `--ttl` second TTL in front of a provider
+  that takes `--provider-ms` per fetch, so a read after expiry blocks on
+  the fetch (the request-path behaviour of the real-API examples);
+- `snapshot`: `QuoteSnapshot` kept fresh by a `PollingQuoteFeed` polling the
+  same provider every `--ttl` seconds on a background thread.
+
+Reports read latency percentiles, the share of reads slower than 1 ms and
+the oldest quote served. Then writes `--ticks` ticks to a temporary tick
+file and replays it into a snapshot as fast as possible (memory-mapped).
+
+    python benchmarks/market_data.py --seconds 5 --provider-ms 50 --ticks 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from _stats import pct
+
+
+def _provider(latency: float, symbols: list[str]):
+    from langgraph_cb.tools.quotes import QuoteProvider
+
+    class SlowProvider(QuoteProvider):
+        """Random-walk prices after `latency` seconds, like a remote API."""
+
+        def __init__(self):
+            self.prices = {symbol: 100.0 for symbol in symbols}
+
+        def fetch(self, wanted: list[str]) -> dict[str, float]:
+            time.sleep(latency)
+            for symbol in wanted:
+                self.prices[symbol] *= 1 + random.gauss(0, 0.001)
+            return {symbol: self.prices[symbol] for symbol in wanted}
+
+    return SlowProvider()
+
+
+def _reads(source, symbols: list[str], seconds: float, every: float, age) -> dict:
+    latency: list[float] = []
+    oldest = 0.0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        symbol = random.choice(symbols)
+        start = time.perf_counter()
+        source.get(symbol)
+        latency.append(time.perf_counter() - start)
+        oldest = max(oldest, age(symbol))
+        time.sleep(every)
+    return {"latency": latency, "oldest": oldest}
+
+
+def _replay(ticks: int, symbols: list[str]) -> tuple[float, int]:
+    from langgraph_cb.tools.market_data import QuoteSnapshot, TickFileReplay, write_tick_file
+
+    fd, path = tempfile.mkstemp(suffix=".ticks")
+    os.close(fd)
+    try:
+        now = time.time()
+        write_tick_file(
+            path,
+            ((now + i / 1000, symbols[i % len(symbols)], 100.0 + i % 97) for i in range(ticks)),
+        )
+        snapshot = QuoteSnapshot()
+        replay = TickFileReplay(path, speed=0, loop=False, snapshot=snapshot)
+        start = time.perf_counter()
+        replay.run()
+        return time.perf_counter() - start, replay.stats["ticks"]
+    finally:
+        os.unlink(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="read time per source")
+    parser.add_argument("--every-ms", type=float, default=1.0, help="pause between reads")
+    parser.add_argument("--provider-ms", type=float, default=50.0, help="provider fetch time")
+    parser.add_argument("--ttl", type=float, default=1.0, help="cache TTL / poll interval")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    from langgraph_cb.tools.market_data import PollingQuoteFeed
+    from langgraph_cb.tools.quotes import QuoteCache
+
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    latency, every = args.provider_ms / 1000, args.every_ms / 1000
+
+    cache = QuoteCache(_provider(latency, symbols), ttl_seconds=args.ttl)
+
+    def cache_age(symbol: str) -> float:
+        entry = cache._prices.get(symbol)
+        return time.monotonic() - entry[1] if entry else 0.0
+
+    results = {"cache": _reads(cache, symbols, args.seconds, every, cache_age)}
+
+    feed = PollingQuoteFeed(_provider(latency, symbols), symbols, interval=args.ttl).start()
+    while len(feed.snapshot) < len(symbols):
+        time.sleep(0.01)
+    snapshot = feed.snapshot
+    results["snapshot"] = _reads(snapshot, symbols, args.seconds, every, snapshot.age)
+    feed.stop()
+
+    print(
+        f"{args.symbols} symbols, {args.provider_ms:g} ms provider, "
+        f"{args.ttl:g} s TTL / poll interval\n"
+    )
+    print(f"{'':>9} {'reads':>7} {'p50':>8} {'p99':>9} {'max':>9} {'>1ms':>6} {'oldest':>7}")
+    for name, r in results.items():
+        samples = r["latency"]
+        slow = sum(s > 1e-3 for s in samples) / len(samples)
+        print(
+            f"{name:>9} {len(samples):>7} {pct(samples, 0.5, scale=1e6):>6.1f}us "
+            f"{pct(samples, 0.99, scale=1e6):>7.1f}us {max(samples) * 1e6:>7.0f}us "
+            f"{slow:>6.1%} {r['oldest']:>6.2f}s"
+        )
+
+    elapsed, applied = _replay(args.ticks, symbols)
+    print(f"\nreplayed {applied} ticks in {elapsed:.2f} s ({applied / elapsed:,.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Per-step routing and state-merge overhead on long threads.
+
+Builds a thread of `--messages` messages (human / AI-with-tool-call / tool
+turns, with provider `response_metadata` like real OpenAI replies) and times,
+per graph step:
+
+- `route_from_chatbot` (field checks on normalized state) against the old
+  defensive routing that accepted dicts or objects and scanned the last
+  message's text for a `REQUEST_BUY::` prefix;
+- merging one new AI message with `add_normalized_messages` against plain
+  `add_messages`;
+- the serialized size of the thread as checkpointed.
+
+    python benchmarks/message_routing.py --messages 1000
+"""
+
+import argparse
+import timeit
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+
+def _thread(n: int) -> list:
+    metadata = {
+        "finish_reason": "tool_calls",
+        "model_name": "gpt-4o-mini-2024-07-18",
+        "system_fingerprint": "fp_0ba0d124f1",
+        "token_usage": {"completion_tokens": 18, "prompt_tokens": 412, "total_tokens": 430},
+        "logprobs": None,
+    }
+    messages = []
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            messages.append(HumanMessage(content=f"What is the price of MSFT? ({i})", id=f"h{i}"))
+        elif kind == 1:
+            messages.append(
+                AIMessage(
+                    content="",
+                    id=f"a{i}",
+                    tool_calls=[{"name": "get_stock_price", "args": {"symbol": "MSFT"}, "id": f"c{i}"}],
+                    response_metadata=metadata,
+                )
+            )
+        else:
+            messages.append(ToolMessage(content="200.3", tool_call_id=f"c{i - 1}", id=f"t{i}"))
+    return messages
+
+
+def _legacy_route(state: dict) -> str:
+    def is_tool_message(msg) -> bool:
+        if isinstance(msg, ToolMessage) or getattr(msg, "type", None) == "tool":
+            return True
+        if isinstance(msg, dict):
+            return msg.get("role") == "tool"
+        return False
+
+    def get_content(msg) -> str:
+        if isinstance(msg, dict):
+            return str(msg.get("content", ""))
+        return str(getattr(msg, "content", ""))
+
+    last = state["messages"][-1]
+    content = get_content(last)
+    if is_tool_message(last) and content.startswith("REQUEST_BUY::"):
+        return "approval"
+    if isinstance(last, AIMessage) and getattr(last, "tool_calls", None):
+        return "tools"
+    return "__end__"
+
+
+def _per_call_us(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing")
+    args = parser.parse_args()
+
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph.graph.message import add_messages
+
+    from langgraph_cb.graphs.hitl import route_from_chatbot
+    from langgraph_cb.graphs.messages import add_normalized_messages
+
+    raw = _thread(args.messages)
+    normalized = add_normalized_messages([], raw)
+    state = {"messages": normalized, "trade": ()}
+    reply = _thread(2)[1]
+
+    rows = [
+        ("route: legacy string checks", _per_call_us(lambda: _legacy_route(state), args.number)),
+        ("route: route_from_chatbot", _per_call_us(lambda: route_from_chatbot(state), args.number)),
+        (
+            "merge: add_messages",
+            _per_call_us(lambda: add_messages(normalized, [reply]), args.number // 10),
+        ),
+        (
+            "merge: add_normalized_messages",
+            _per_call_us(lambda: add_normalized_messages(normalized, [reply]), args.number // 10),
+        ),
+    ]
+    print(f"thread of {args.messages} messages\n")
+    print(f"{'per step':<34} {'us':>9}")
+    for name, us in rows:
+        print(f"{name:<34} {us:>9.2f}")
+
+    serde = JsonPlusSerializer()
+    before = len(serde.dumps_typed(raw)[1])
+    after = len(serde.dumps_typed(normalized)[1])
+    print(f"\ncheckpointed messages: {before / 1024:.1f} KiB raw, {after / 1024:.1f} KiB normalized")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Per-turn cost of the multi-agent graph as the thread grows, and routing.
+
+Runs `--turns` knowledge turns on threads that already hold `--history`
+messages through two graphs with the same offline constant-time model and
+the in-memory checkpointer:
+
+- `legacy`: the shape of `examples/chatbot_multiagent.py` (a pydantic state
+  of dict messages, a router node writing `route`, agents that copy the
+  message list and return all of it, so the caller resends the thread);
+- `package`: `langgraph_cb.graphs.multiagent` (routing on an edge, agents
+  return only new messages, append-only reducer).
+
+Then compares the `IntentClassifier` with the example's substring router on
+a small labelled set of questions.
+
+    python benchmarks/multiagent.py --history 10 100 1000 5000
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+STOCK = [
+    "What is the price of AAPL stock?",
+    "price of IBM",
+    "Is GOOG up today?",
+    "how many shares of AMZN can I get for 1000 dollars",
+    "what's nvidia trading at",
+    "How is Tesla doing in the market",
+    "What is a stock split?",
+    "what is MSFT worth right now",
+    "quote me apple",
+    "how much does a share of netflix cost",
+    "did the market go up",
+    "AAPL vs MSFT",
+    "tsla price",
+    "how are my shares of amazon doing",
+    "what's the dividend on coca cola",
+]
+KNOWLEDGE = [
+    "Explain what LangGraph is in simple terms",
+    "what is DNA",
+    "what is the boiling point of water",
+    "Who painted the Mona Lisa",
+    "Explain what an API is",
+    "tell me about the EU",
+    "how tall is mount everest in meters",
+    "translate hello to french",
+    "who invented the telephone",
+    "how do airplanes fly",
+    "what year did WW2 end",
+    "write a poem about the sea",
+    "what is the speed of light",
+    "define entropy",
+    "what is an LLM",
+    "recommend a good book",
+    "what are the key principles of stoicism",
+]
+
+
+def _legacy_graph(model, checkpointer):
+    from langgraph.graph import END, START, StateGraph
+    from pydantic import BaseModel
+
+    class State(BaseModel):
+        messages: list[dict]
+        route: str | None = None
+
+    def router_agent(state: State):
+        text = state.messages[-1]["content"].lower()
+        return {"route": "stock" if "price" in text or "stock" in text else "knowledge"}
+
+    def agent(state: State):
+        response = model.invoke(state.messages)
+        messages = list(state.messages)
+        messages.append({"role": "assistant", "content": response.content})
+        return {"messages": messages}
+
+    builder = StateGraph(State)
+    builder.add_node("router", router_agent)
+    builder.add_node("stock", agent)
+    builder.add_node("knowledge", agent)
+    builder.add_edge(START, "router")
+    builder.add_conditional_edges("router", lambda s: s.route, ["stock", "knowledge"])
+    builder.add_edge("stock", END)
+    builder.add_edge("knowledge", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def _history(n: int) -> list[dict]:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i} about history"}
+        for i in range(n)
+    ]
+
+
+MODEL_SECONDS: list[float] = []
+
+
+def _timed_model():
+    """Fake model that records time spent inside `invoke` (prompt included)."""
+    from langgraph_cb.models.fake import FakeChatModel
+
+    class TimedModel(FakeChatModel):
+        def invoke(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return super().invoke(*args, **kwargs)
+            finally:
+                MODEL_SECONDS.append(time.perf_counter() - start)
+
+    return TimedModel()
+
+
+def _turns(kind: str, history: int, turns: int) -> tuple[float, float]:
+    """Median seconds per turn, in total and outside the model call, after
+    seeding a thread with `history` messages."""
+    from langgraph_cb.checkpoint.memory import BoundedMemorySaver
+    from langgraph_cb.graphs.multiagent import build_multiagent_graph
+
+    model = _timed_model()
+    saver = BoundedMemorySaver()
+    config = {"configurable": {"thread_id": f"{kind}-{history}"}}
+    if kind == "legacy":
+        graph = _legacy_graph(model, saver)
+        graph.invoke({"messages": _history(history)}, config)
+    else:
+        graph = build_multiagent_graph(saver, model_factory=lambda cache: model, context_tokens=0)
+        graph.invoke({"messages": _history(history)}, config)
+
+    samples, graph_samples = [], []
+    for i in range(turns):
+        question = {"role": "user", "content": f"Explain topic {i} in simple terms"}
+        MODEL_SECONDS.clear()
+        start = time.perf_counter()
+        if kind == "legacy":
+            # No reducer: the caller resends the whole thread every turn.
+            thread = graph.get_state(config).values["messages"]
+            state = graph.invoke({"messages": [*thread, question]}, config)
+        else:
+            state = graph.invoke({"messages": [question]}, config)
+        samples.append(time.perf_counter() - start)
+        graph_samples.append(samples[-1] - sum(MODEL_SECONDS))
+    assert len(state["messages"]) == history + 1 + 2 * turns
+    return statistics.median(samples), statistics.median(graph_samples)
+
+
+def _substring(text: str) -> str:
+    text = text.lower()
+    return "stock" if "price" in text or "stock" in text else "knowledge"
+
+
+def _routing() -> None:
+    from langgraph_cb.graphs.multiagent import IntentClassifier
+
+    classifier = IntentClassifier()
+    labelled = [(q, "stock") for q in STOCK] + [(q, "knowledge") for q in KNOWLEDGE]
+    print(f"\n{'router':>10} {'accuracy':>9} {'stock recall':>13} {'us/route':>9}")
+    for name, route in (("substring", _substring), ("classifier", classifier.classify)):
+        correct = sum(route(q) == label for q, label in labelled)
+        recall = sum(route(q) == "stock" for q in STOCK) / len(STOCK)
+        start = time.perf_counter()
+        for _ in range(20):
+            for q, _label in labelled:
+                route(q)
+        per_call = (time.perf_counter() - start) / (20 * len(labelled))
+        print(f"{name:>10} {correct / len(labelled):>9.1%} {recall:>13.1%} {per_call * 1e6:>9.1f}")
+    misses = [q for q, label in labelled if classifier.classify(q) != label]
+    print(f"classifier misroutes: {misses}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+
+    # "graph" excludes the model call, whose prompt is the whole thread in
+    # both graphs (bounded in production by LANGGRAPH_CB_CONTEXT_TOKENS).
+    print(f"{'':>8} {'legacy ms/turn':>22} {'package ms/turn':>22}")
+    print(f"{'history':>8} {'total':>11} {'graph':>10} {'total':>11} {'graph':>10}")
+    for history in args.history:
+        legacy = _turns("legacy", history, args.turns)
+        package = _turns("package", history, args.turns)
+        print(
+            f"{history:>8} {legacy[0] * 1000:>11.2f} {legacy[1] * 1000:>10.2f} "
+            f"{package[0] * 1000:>11.2f} {package[1] * 1000:>10.2f}"
+        )
+    _routing()
+
+
+if __name__ == "__main__":
+    main()
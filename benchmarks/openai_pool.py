@@ -0,0 +1,179 @@
+"""OpenAI model calls over the shared pooled clients versus unpooled clients.
+
+Starts a local OpenAI-compatible stub server (chat completions only) that
+counts TCP connections, charges `--connect-ms` for each new connection (a
+stand-in for the TLS handshake), answers after `--server-ms`, and fails every
+`--fail-every`-th request with 503 + `retry-after-ms` so retries are
+exercised. Then sends `--calls` requests, sync and async, through
+`openai_model()` (pooled, keep-alive, retries in the transport) and through
+a ChatOpenAI whose clients close each connection after one request.
+
+    python benchmarks/openai_pool.py --calls 400 --concurrency 50 --fail-every 20
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_COMPLETION = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [
+        {"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}
+    ],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, server_ms: float, connect_ms: float, fail_every: int):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.server_ms = server_ms
+        self.connect_ms = connect_ms
+        self.fail_every = fail_every
+        self.requests = itertools.count(1)
+        self.connections = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connections = self.failures = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+        time.sleep(self.server.connect_ms / 1000)
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.server_ms / 1000)
+        fail_every = self.server.fail_every
+        if fail_every and next(self.server.requests) % fail_every == 0:
+            with self.server._lock:
+                self.server.failures += 1
+            self._send(503, {"error": {"message": "overloaded"}}, {"retry-after-ms": "10"})
+        else:
+            self._send(200, _COMPLETION)
+
+    def _send(self, status: int, body: dict, headers: dict | None = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _unpooled_model():
+    import httpx
+    from langchain_openai import ChatOpenAI
+
+    limits = httpx.Limits(max_keepalive_connections=0)
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0,
+        http_client=httpx.Client(limits=limits),
+        http_async_client=httpx.AsyncClient(limits=limits),
+    )
+
+
+def _sync(model, calls: int) -> tuple[list[float], int]:
+    latencies, errors = [], 0
+    for _ in range(calls):
+        start = time.perf_counter()
+        try:
+            model.invoke("hi")
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+async def _async(model, calls: int, concurrency: int) -> tuple[list[float], int]:
+    slots = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one() -> None:
+        nonlocal errors
+        async with slots:
+            start = time.perf_counter()
+            try:
+                await model.ainvoke("hi")
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--server-ms", type=float, default=5.0)
+    parser.add_argument("--connect-ms", type=float, default=20.0, help="cost of a new connection")
+    parser.add_argument("--fail-every", type=int, default=20, help="0 disables failures")
+    args = parser.parse_args()
+
+    server = StubServer(args.server_ms, args.connect_ms, args.fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+    from langgraph_cb.models import openai_model
+    from langgraph_cb.models.http import aclose_http_clients, http_clients
+
+    print(
+        f"{'client':<9} {'path':<6} {'calls':>6} {'conns':>6} {'503s':>5} {'errors':>6} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'seconds':>8}"
+    )
+    for name, make_model in (("unpooled", _unpooled_model), ("pooled", openai_model)):
+        model = make_model()
+        for path in ("sync", "async"):
+            server.reset()
+            start = time.perf_counter()
+            if path == "sync":
+                latencies, errors = _sync(model, args.calls // 4)
+            else:
+                latencies, errors = asyncio.run(_async(model, args.calls, args.concurrency))
+            elapsed = time.perf_counter() - start
+            q = statistics.quantiles(latencies, n=100)
+            print(
+                f"{name:<9} {path:<6} {len(latencies):>6} {server.connections:>6} "
+                f"{server.failures:>5} {errors:>6} {q[49] * 1000:>8.2f} {q[98] * 1000:>8.2f} {elapsed:>8.2f}"
+            )
+
+    client, async_client = http_clients()
+    stats = client._transport.stats + async_client._transport.stats
+    print(f"\npooled transport: {stats['requests']} requests, {stats['retries']} retries")
+    asyncio.run(aclose_http_clients())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
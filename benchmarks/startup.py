@@ -0,0 +1,72 @@
+"""Cold-start cost of the CLI and the API, each measured in a fresh interpreter.
+
+Reports the median over `--runs` of: importing `langgraph_cb.__main__` (the
+`langgraph-cb` console script), importing `langgraph_cb.api`, the app's
+lifespan startup (graph construction) and the first /chat request. Uses the
+offline fake model.
+
+    python benchmarks/startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_CLI_PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import langgraph_cb.__main__
+print(json.dumps({"import cli": time.perf_counter() - t0}))
+"""
+
+_API_PROBE = r"""
+import json, time
+t1 = time.perf_counter()
+import langgraph_cb.api
+t2 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(langgraph_cb.api.app) as client:
+    t3 = time.perf_counter()
+    client.post("/chat", json={"message": "How is MSFT trading today?"}).raise_for_status()
+    t4 = time.perf_counter()
+    client.post("/chat", json={"message": "How is AAPL trading today?"}).raise_for_status()
+    t5 = time.perf_counter()
+print(json.dumps({
+    "import api": t2 - t1,
+    "lifespan startup": t3 - t2,
+    "first /chat": t4 - t3,
+    "second /chat": t5 - t4,
+    "time to first response": t4 - t1,
+}))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(
+        os.environ,
+        LANGGRAPH_CB_MODEL="fake",
+        LANGCHAIN_TRACING_V2="false",
+    )
+    samples: dict[str, list[float]] = {}
+    for _ in range(args.runs):
+        for probe in (_CLI_PROBE, _API_PROBE):
+            out = subprocess.run(
+                [sys.executable, "-c", probe], env=env, check=True, capture_output=True, text=True
+            ).stdout
+            for phase, seconds in json.loads(out.splitlines()[-1]).items():
+                samples.setdefault(phase, []).append(seconds)
+
+    print(f"{'phase':<24} {'median ms':>10} {'min ms':>8}")
+    for phase, values in samples.items():
+        print(f"{phase:<24} {statistics.median(values) * 1000:>10.1f} {min(values) * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
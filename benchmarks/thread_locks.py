@@ -0,0 +1,140 @@
+"""Concurrent requests on one thread_id: lost turns, queueing and 429s.
+
+Fires `--burst` simultaneous chat turns at each of `--threads` threads,
+first straight at the graph (what the API did before per-thread locking)
+and then through `/chat`. Counts accepted turns missing from each thread's
+final history (runs that started from the same checkpoint and overwrote
+each other), the API's status codes, the per-thread wait from
+`langgraph_cb_thread_wait_seconds`, and wall time. Runs on different
+threads still overlap, so with many threads the locked burst takes about as
+long as the racing one.
+
+    python benchmarks/thread_locks.py --threads 50 --burst 6 --latency-ms 100
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections import Counter
+
+
+def _question(thread: int, turn: int) -> str:
+    return f"Tell me something interesting, part {thread}-{turn}"
+
+
+def _lost(messages: list, expected: list[str]) -> int:
+    asked = {m.content for m in messages if m.type == "human"}
+    return sum(question not in asked for question in expected)
+
+
+async def _direct(threads: int, burst: int) -> dict:
+    from langgraph_cb.api import _run_config, get_graph
+
+    graph = get_graph()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            graph.ainvoke(
+                {"messages": [{"role": "user", "content": _question(t, turn)}]},
+                config=_run_config(f"direct-{t}"),
+            )
+            for t in range(threads)
+            for turn in range(burst)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    lost = 0
+    for t in range(threads):
+        state = await graph.aget_state(_run_config(f"direct-{t}"))
+        lost += _lost(state.values["messages"], [_question(t, i) for i in range(burst)])
+    return {"elapsed": elapsed, "lost": lost, "accepted": threads * burst}
+
+
+async def _api(app, threads: int, burst: int) -> dict:
+    import httpx
+
+    from langgraph_cb.api import _run_config, get_graph
+
+    statuses: Counter[int] = Counter()
+    accepted: dict[int, list[str]] = {t: [] for t in range(threads)}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def turn(t: int, i: int) -> None:
+            response = await client.post(
+                "/chat",
+                json={"message": _question(t, i), "thread_id": f"api-{t}"},
+                timeout=None,
+            )
+            statuses[response.status_code] += 1
+            if response.status_code == 200:
+                accepted[t].append(_question(t, i))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(turn(t, i) for t in range(threads) for i in range(burst)))
+        elapsed = time.perf_counter() - start
+
+    graph = get_graph()
+    lost = 0
+    for t in range(threads):
+        state = await graph.aget_state(_run_config(f"api-{t}"))
+        lost += _lost(state.values["messages"], accepted[t])
+    return {
+        "elapsed": elapsed,
+        "lost": lost,
+        "accepted": sum(map(len, accepted.values())),
+        "statuses": statuses,
+    }
+
+
+def _wait_quantiles() -> tuple[float, float, int]:
+    """p50 / p99 upper bucket bounds of the thread wait histogram, and count."""
+    from langgraph_cb.metrics import metrics
+
+    histogram = metrics.thread_wait
+    series = next(iter(histogram._series.values()))
+    total = sum(series[:-1])
+    bounds = [*histogram.buckets, float("inf")]
+
+    def quantile(q: float) -> float:
+        seen = 0.0
+        for bound, count in zip(bounds, series):
+            seen += count
+            if seen >= q * total:
+                return bound
+        return bounds[-1]
+
+    return quantile(0.5), quantile(0.99), int(total)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=50)
+    parser.add_argument("--burst", type=int, default=6, help="simultaneous turns per thread")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--max-waiting", type=int, default=4)
+    args = parser.parse_args()
+
+    os.environ["LANGGRAPH_CB_MODEL"] = "fake"
+    os.environ["LANGGRAPH_CB_FAKE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LANGGRAPH_CB_THREAD_MAX_WAITING"] = str(args.max_waiting)
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+    from langgraph_cb.api import app
+
+    async def run() -> tuple[dict, dict]:
+        return await _direct(args.threads, args.burst), await _api(app, args.threads, args.burst)
+
+    direct, api = asyncio.run(run())
+    print(f"{args.threads} threads x {args.burst} simultaneous turns, {args.latency_ms:g} ms model")
+    print(f"\n{'':>10} {'accepted':>9} {'lost':>6} {'wall s':>7}")
+    for name, result in (("unlocked", direct), ("/chat", api)):
+        print(f"{name:>10} {result['accepted']:>9} {result['lost']:>6} {result['elapsed']:>7.2f}")
+    print(f"\n/chat statuses: {dict(sorted(api['statuses'].items()))}")
+    p50, p99, count = _wait_quantiles()
+    print(f"thread wait over {count} runs: p50 <= {p50 * 1000:g} ms, p99 <= {p99 * 1000:g} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Chat on one API worker and approve on another.
+
+Starts two API processes that share a SQLite checkpoint database and approvals
+index in a temporary directory, sends a buy request to the first, and lists
+and approves it on the second. This is the same situation as
+`uvicorn --workers N`, where /chat and /approve for one thread can land on
+different processes. The repo has no test suite, so this doubles as the
+integration check: it exits non-zero if any step fails.
+
+    python examples/multiworker_hitl.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+
+def start_worker(port: int, data_dir: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "LANGGRAPH_CB_CHECKPOINTER": "sqlite",
+        "LANGGRAPH_CB_SQLITE_PATH": os.path.join(data_dir, "checkpoints.db"),
+        "LANGGRAPH_CB_APPROVALS_PATH": os.path.join(data_dir, "approvals.db"),
+    }
+    # The buy fast path never calls the model, so any key works here.
+    env.setdefault("OPENAI_API_KEY", "sk-demo")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "langgraph_cb.api:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_healthy(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).ok:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{base_url} did not become healthy")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        workers = [start_worker(8001, tmp), start_worker(8002, tmp)]
+        try:
+            worker_a, worker_b = "http://127.0.0.1:8001", "http://127.0.0.1:8002"
+            wait_healthy(worker_a)
+            wait_healthy(worker_b)
+
+            chat = requests.post(
+                f"{worker_a}/chat",
+                json={"message": "Buy 10 MSFT stocks at current price.", "thread_id": "mw-1"},
+                timeout=30,
+            ).json()
+            print("worker A /chat:", chat)
+            assert chat["status"] == "approval_required", chat
+
+            pending = requests.get(f"{worker_b}/approvals", timeout=30).json()
+            print("worker B /approvals:", pending)
+            assert [item["thread_id"] for item in pending["items"]] == ["mw-1"], pending
+
+            approval = requests.post(
+                f"{worker_b}/approve",
+                json={"thread_id": "mw-1", "decision": "yes"},
+                timeout=30,
+            ).json()
+            print("worker B /approve:", approval)
+            assert approval["status"] == "completed", approval
+            assert approval["response"].startswith("Approved"), approval
+            print("OK")
+        finally:
+            for worker in workers:
+                worker.terminate()
+                worker.wait()
+
+
+if __name__ == "__main__":
+    main()
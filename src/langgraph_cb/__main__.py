@@ -1,7 +1,7 @@
-from langgraph_cb.graphs.hitl import run_demo
-
-
 def main() -> None:
+    # Imported here so `python -m langgraph_cb` pays for langgraph only when run.
+    from langgraph_cb.graphs.hitl import run_demo
+
     run_demo()
 
 
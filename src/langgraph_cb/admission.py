@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Mapping, NamedTuple, Optional
+
+
+class Budget(NamedTuple):
+    """Slots one class of work may hold, and how many may queue for them.
+
+    `max_waiting=None` never sheds: callers wait however long it takes.
+    """
+
+    limit: int
+    max_waiting: Optional[int] = None
+
+
+class Overloaded(RuntimeError):
+    """The class's queue is full; try again after `retry_after` seconds."""
+
+    def __init__(self, kind: str, retry_after: int):
+        super().__init__(f"{kind} capacity exhausted, retry after {retry_after}s")
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Graph-run slots shared by classes of work with priorities and budgets.
+
+    At most `capacity` slots are held in total, and at most `budgets[kind].limit`
+    by one class. Classes are served in the order `budgets` lists them: when
+    a slot frees up, waiting work of an earlier class gets it first, and a
+    later class cannot take a slot an earlier one is waiting for. Within a
+    class, callers are served in arrival order, and a multi-slot request (a
+    batch) is granted all at once so two batches never split the pool.
+
+    When a class already has `max_waiting` callers queued, `acquire` raises
+    `Overloaded` at once, with a `retry_after` estimated from how long that
+    class has recently held its slots.
+
+    Immediate, queued, shed and cancelled counts per class are in `stats`.
+    """
+
+    def __init__(self, capacity: int, budgets: Mapping[str, Budget]):
+        self.capacity = capacity
+        self.budgets = dict(budgets)
+        self.stats: Counter[str] = Counter()
+        self._in_use = dict.fromkeys(self.budgets, 0)
+        self._total = 0
+        # kind -> (slots, future) in arrival order.
+        self._waiting: dict[str, deque[tuple[int, asyncio.Future]]] = {
+            kind: deque() for kind in self.budgets
+        }
+        # kind -> moving average of seconds a slot is held.
+        self._hold = dict.fromkeys(self.budgets, 1.0)
+
+    def in_use(self, kind: Optional[str] = None) -> int:
+        return self._total if kind is None else self._in_use[kind]
+
+    def waiting(self, kind: str) -> int:
+        return sum(not future.done() for _, future in self._waiting[kind])
+
+    def saturated(self, kind: str) -> bool:
+        """Whether new `kind` work would queue past its limit and be shed."""
+        budget = self.budgets[kind]
+        return budget.max_waiting is not None and self.waiting(kind) >= budget.max_waiting
+
+    def retry_after(self, kind: str) -> int:
+        """Whole seconds until a queued `kind` caller could expect a slot."""
+        budget = self.budgets[kind]
+        ahead = self.waiting(kind) + 1
+        return max(1, math.ceil(self._hold[kind] * ahead / min(budget.limit, self.capacity)))
+
+    async def acquire(self, kind: str, slots: int = 1) -> float:
+        """Take `slots` for `kind`; returns the seconds spent queued."""
+        budget = self.budgets[kind]
+        if not 1 <= slots <= min(budget.limit, self.capacity):
+            raise ValueError(f"{kind} requests take 1 to {budget.limit} slots, not {slots}")
+        queue = self._waiting[kind]
+        turn = asyncio.get_running_loop().create_future()
+        queue.append((slots, turn))
+        self._dispatch()
+        if turn.done():
+            self.stats[f"{kind}_immediate"] += 1
+            return 0.0
+        if budget.max_waiting is not None and self.waiting(kind) > budget.max_waiting:
+            queue.remove((slots, turn))
+            self.stats[f"{kind}_shed"] += 1
+            raise Overloaded(kind, self.retry_after(kind))
+        start = time.perf_counter()
+        try:
+            await turn
+        except asyncio.CancelledError:
+            self.stats[f"{kind}_cancelled"] += 1
+            if not turn.cancelled():
+                # Granted just as we were cancelled: give the slots back.
+                self.release(kind, slots)
+            raise
+        self.stats[f"{kind}_queued"] += 1
+        return time.perf_counter() - start
+
+    def release(self, kind: str, slots: int = 1, held: Optional[float] = None) -> None:
+        self._in_use[kind] -= slots
+        self._total -= slots
+        if held is not None:
+            self._hold[kind] += 0.2 * (held - self._hold[kind])
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant queued requests that fit, highest priority first."""
+        for kind, budget in self.budgets.items():
+            queue = self._waiting[kind]
+            while queue:
+                slots, turn = queue[0]
+                if turn.done():
+                    queue.popleft()
+                    continue
+                if self._in_use[kind] + slots > budget.limit:
+                    # Held back by its own budget: later classes may go ahead.
+                    break
+                if self._total + slots > self.capacity:
+                    # Keep the next free slots for this class.
+                    return
+                queue.popleft()
+                self._in_use[kind] += slots
+                self._total += slots
+                turn.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, kind: str, slots: int = 1) -> AsyncIterator[float]:
+        """`acquire` / `release` as a context manager yielding the wait."""
+        waited = await self.acquire(kind, slots)
+        start = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            self.release(kind, slots, time.perf_counter() - start)
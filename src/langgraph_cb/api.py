@@ -1,20 +1,242 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
+import time
 import uuid
-from typing import Optional
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Optional
 
-from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
-from langgraph.errors import GraphInterrupt
-from langgraph.types import Command
+from langgraph_cb.admission import AdmissionController, Budget, Overloaded
+from langgraph_cb.approvals import PendingApproval, build_approval_index
+from langgraph_cb.cache import build_answer_cache, build_response_cache
+from langgraph_cb.checkpoint import build_checkpointer
+from langgraph_cb.config import get_settings
+from langgraph_cb.metrics import instrument_checkpointer, metrics
+from langgraph_cb.thread_locks import ThreadBusyError, ThreadLocks
+from langgraph_cb.tools import build_quote_feed
+from langgraph_cb.tools.trades import TradeRequest
 
-from langgraph_cb.graphs.hitl import build_graph
+logger = logging.getLogger(__name__)
 
+# Built by `get_graph()` rather than at import, so importing this module (the
+# CLI, tooling, each uvicorn worker before it binds) does not pay for the model
+# client, the checkpointer or graph compilation.
+checkpointer = None
+llm_cache = None
+answer_cache = None
+graph = None
+agents_graph = None
+approvals = None
+quote_feed = None
+# Price source the feed's snapshot replaced, put back on shutdown.
+_previous_quotes = None
 
-app = FastAPI(title="LangGraph HITL API", version="0.1.0")
+# Read once per worker; every builder below takes its options from here.
+settings = get_settings()
 
-graph = build_graph()
+# Pending trades older than this are declined automatically (0 disables).
+APPROVAL_TTL = settings.approval_ttl
+
+
+def get_graph():
+    """The compiled graph, built on first use.
+
+    The lifespan hook calls this at startup so the first request does not pay
+    for it; apps driven without lifespan (e.g. `httpx.ASGITransport`) build
+    it on their first request instead.
+    """
+    global checkpointer, llm_cache, answer_cache, graph
+    if graph is None:
+        from langgraph_cb.graphs.hitl import build_graph
+
+        get_quote_feed()
+        checkpointer = instrument_checkpointer(build_checkpointer(settings=settings), metrics)
+        llm_cache = build_response_cache(settings=settings)
+        answer_cache = build_answer_cache(settings=settings)
+        graph = build_graph(
+            checkpointer, llm_cache=llm_cache, settings=settings, answer_cache=answer_cache
+        )
+    return graph
+
+
+def get_agents_graph():
+    """The router / stock / knowledge graph behind `/agents/chat`.
+
+    Shares the checkpointer, caches and model settings of `get_graph()`.
+    Built on the first `/agents/chat` request rather than at startup, so
+    deployments that do not use it do not load the classifier.
+    """
+    global agents_graph
+    if agents_graph is None:
+        from langgraph_cb.graphs.multiagent import build_multiagent_graph
+
+        get_graph()
+        agents_graph = build_multiagent_graph(
+            checkpointer, llm_cache=llm_cache, settings=settings, answer_cache=answer_cache
+        )
+    return agents_graph
+
+
+def get_quote_feed():
+    """The background price feed (None for static prices), started on first use.
+
+    Once running, the price tools read its snapshot instead of the
+    built-in table, so no quote lookup does I/O on the request path.
+    """
+    global quote_feed, _previous_quotes
+    if quote_feed is None:
+        quote_feed = build_quote_feed(settings=settings)
+        if quote_feed is not None:
+            from langgraph_cb.tools.stocks import set_quote_snapshot
+
+            _previous_quotes = set_quote_snapshot(quote_feed.snapshot)
+            quote_feed.start()
+    return quote_feed
+
+
+def get_approvals():
+    """The pending-approvals index, built on first use like the graph."""
+    global approvals
+    if approvals is None:
+        approvals = build_approval_index(settings=settings)
+    return approvals
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    global checkpointer, llm_cache, answer_cache, graph, agents_graph, approvals
+    global quote_feed, _previous_quotes
+    get_graph()
+    get_approvals()
+    expiry = asyncio.create_task(_expire_approvals()) if APPROVAL_TTL > 0 else None
+    yield
+    if expiry is not None:
+        expiry.cancel()
+    for resource in (checkpointer, llm_cache, approvals):
+        close = getattr(resource, "close", None)
+        if close is not None:
+            close()
+    if quote_feed is not None:
+        from langgraph_cb.tools.stocks import restore_quotes
+
+        quote_feed.stop()
+        restore_quotes(_previous_quotes)
+    from langgraph_cb.models.http import aclose_http_clients
+
+    await aclose_http_clients()
+    checkpointer = llm_cache = answer_cache = graph = agents_graph = approvals = None
+    quote_feed = _previous_quotes = None
+
+
+app = FastAPI(title="LangGraph HITL API", version="0.1.0", lifespan=lifespan)
+
+# Upper bound on graph runs in flight per worker. Handlers are async, so idle
+# requests waiting on the LLM hold no thread; this only caps upstream fan-out.
+MAX_CONCURRENCY = settings.max_concurrency
+# Approvals resume a parked run: cheap, and a person is waiting on them. They
+# are served before queued chats and may use every slot, while new chats
+# (the LLM-heavy work) leave `approval_slots` slots free and are shed with
+# 503 + Retry-After once `chat_max_waiting` of them are queued.
+CHAT_CONCURRENCY = MAX_CONCURRENCY - settings.approval_slots
+_admission = AdmissionController(
+    MAX_CONCURRENCY,
+    {
+        "resume": Budget(MAX_CONCURRENCY),
+        "chat": Budget(CHAT_CONCURRENCY, settings.chat_max_waiting),
+    },
+)
+
+# /chat/batch limits: items per request, and runs in flight per batch. A batch
+# takes its share of chat slots in one grant, so two batches can never each
+# hold half the slots.
+BATCH_MAX_ITEMS = settings.batch_max_items
+BATCH_CONCURRENCY = settings.batch_concurrency
+
+
+def _shed(kind: str, retry_after: int) -> HTTPException:
+    if metrics.enabled:
+        metrics.shed.inc(kind=kind)
+    return HTTPException(
+        503, f"{kind} capacity exhausted", headers={"Retry-After": str(retry_after)}
+    )
+
+
+@asynccontextmanager
+async def _admitted(kind: str, slots: int = 1):
+    """Hold `slots` run slots of `kind` ("resume" or "chat"); 503 when shed."""
+    async with AsyncExitStack() as stack:
+        try:
+            waited = await stack.enter_async_context(_admission.slot(kind, slots))
+        except Overloaded as exc:
+            raise _shed(kind, exc.retry_after) from None
+        if metrics.enabled:
+            metrics.admission_wait.observe(waited, kind=kind)
+        yield
+
+
+# Runs on one thread_id go one at a time, in arrival order; see ThreadLocks.
+_thread_locks = ThreadLocks(settings.thread_max_waiting)
+
+
+def _thread_busy(thread_id: str) -> HTTPException:
+    if metrics.enabled:
+        metrics.thread_rejected.inc()
+    return HTTPException(429, f"thread {thread_id} has too many requests in progress")
+
+
+@asynccontextmanager
+async def _thread_turn(thread_id: str):
+    """Hold `thread_id` for one run; 429 when its queue is full.
+
+    Taken before an admission slot, so requests queued behind a busy
+    thread do not hold capacity other threads could use.
+    """
+    async with AsyncExitStack() as stack:
+        try:
+            waited = await stack.enter_async_context(_thread_locks.hold(thread_id))
+        except ThreadBusyError:
+            raise _thread_busy(thread_id) from None
+        if metrics.enabled:
+            metrics.thread_wait.observe(waited)
+        yield
+
+
+@asynccontextmanager
+async def _thread_turns(thread_ids: list[str]):
+    """Hold several threads at once, taken in sorted order so that two
+    batches sharing threads cannot each wait on the other."""
+    async with AsyncExitStack() as stack:
+        for thread_id in sorted(set(thread_ids)):
+            await stack.enter_async_context(_thread_turn(thread_id))
+        yield
+
+
+_callbacks = metrics.callbacks()
+
+
+def _run_config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}, "callbacks": _callbacks}
+
+
+if metrics.enabled:
+
+    @app.middleware("http")
+    async def record_latency(request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        route = request.scope.get("route")
+        metrics.http_latency.observe(
+            time.perf_counter() - start,
+            path=getattr(route, "path", "unmatched"),
+            status=response.status_code,
+        )
+        return response
 
 
 class ChatRequest(BaseModel):
@@ -30,69 +252,414 @@ class ChatResponse(BaseModel):
     interrupt_id: Optional[str] = None
 
 
+class BatchChatRequest(BaseModel):
+    items: list[ChatRequest]
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+
+
+class BatchChatResponse(BaseModel):
+    results: list[ChatResponse]
+
+
 class ApprovalRequest(BaseModel):
     thread_id: str
     decision: str
 
 
+class PendingApprovalItem(BaseModel):
+    thread_id: str
+    interrupt_id: Optional[str] = None
+    symbol: str
+    quantity: int
+    total_price: float
+    approval_prompt: str
+    age_seconds: float
+
+
+class ApprovalListResponse(BaseModel):
+    items: list[PendingApprovalItem]
+    total: int
+    next_offset: Optional[int] = None
+
+
+class BulkApprovalRequest(BaseModel):
+    decision: str
+    thread_ids: Optional[list[str]] = None
+    symbol: Optional[str] = None
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+
+
 @app.get("/health")
 def health() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+async def _record_pending(thread_id: str, interrupt, trade: TradeRequest) -> None:
+    await get_approvals().aadd(
+        PendingApproval.from_trade(thread_id, interrupt.id, trade, prompt=str(interrupt.value))
+    )
+
+
+async def _clear_pending(thread_ids: list[str]) -> None:
+    """Drop the index entries of threads starting a new turn.
+
+    A new message replaces a trade still waiting for a decision (see
+    `_new_turn` in the graph), so the entry must not be resolved or expired
+    later. A run that parks again records a new one.
+    """
+    await get_approvals().aclaim(thread_ids)
+
+
+async def _chat_response(thread_id: str, state: dict) -> ChatResponse:
+    interrupts = state.get("__interrupt__")
+    trade = TradeRequest.from_compact(state.get("trade"))
+    if interrupts:
+        if metrics.enabled:
+            metrics.interrupts.inc()
+        if trade is not None:
+            await _record_pending(thread_id, interrupts[0], trade)
+        return ChatResponse(
+            status="approval_required",
+            thread_id=thread_id,
+            approval_prompt=str(interrupts[0].value),
+            interrupt_id=interrupts[0].id,
+        )
+    return ChatResponse(
+        status="completed",
+        thread_id=thread_id,
+        response=state["messages"][-1].content,
+    )
+
+
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest) -> ChatResponse:
+async def chat(req: ChatRequest) -> ChatResponse:
     thread_id = req.thread_id or str(uuid.uuid4())
-    config = {"configurable": {"thread_id": thread_id}}
+    config = _run_config(thread_id)
 
-    try:
-        state = graph.invoke({"messages": [{"role": "user", "content": req.message}]}, config=config)
-        last = state["messages"][-1]
-        content = getattr(last, "content", None) or (
-            last.get("content") if isinstance(last, dict) else None
+    # `ainvoke` reports an interrupt in the result's `__interrupt__`, not by raising.
+    async with _thread_turn(thread_id), _admitted("chat"):
+        await _clear_pending([thread_id])
+        state = await get_graph().ainvoke(
+            {"messages": [{"role": "user", "content": req.message}]}, config=config
         )
-        if isinstance(content, str) and content.startswith("REQUEST_BUY::"):
-            return ChatResponse(
-                status="approval_required",
-                thread_id=thread_id,
-                approval_prompt=content,
-            )
-        return ChatResponse(
-            status="completed",
-            thread_id=thread_id,
-            response=content,
+    return await _chat_response(thread_id, state)
+
+
+@app.post("/agents/chat", response_model=ChatResponse)
+async def agents_chat(req: ChatRequest) -> ChatResponse:
+    """Chat through the multi-agent graph: price questions go to the stock
+    agent (tools, no trading), everything else to the knowledge agent."""
+    thread_id = req.thread_id or str(uuid.uuid4())
+    # Own namespace in the shared checkpointer: a /chat thread with the same
+    # id has a different state schema.
+    key = f"agents:{thread_id}"
+    config = _run_config(key)
+    async with _thread_turn(key), _admitted("chat"):
+        state = await get_agents_graph().ainvoke(
+            {"messages": [{"role": "user", "content": req.message}]}, config=config
+        )
+    return ChatResponse(
+        status="completed", thread_id=thread_id, response=state["messages"][-1].content
+    )
+
+
+@app.post("/chat/batch", response_model=BatchChatResponse)
+async def chat_batch(req: BatchChatRequest) -> BatchChatResponse:
+    """Run independent conversations in one request.
+
+    Items go through `graph.abatch` with bounded concurrency and come back in
+    request order. A failed item is reported with status "error" instead of
+    failing the whole batch.
+    """
+    if len(req.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(413, f"at most {BATCH_MAX_ITEMS} items per batch")
+    thread_ids = [item.thread_id or str(uuid.uuid4()) for item in req.items]
+    if len(set(thread_ids)) != len(thread_ids):
+        # Two runs on one thread would race on its checkpoints.
+        raise HTTPException(422, "thread_id must be unique within a batch")
+    if not thread_ids:
+        return BatchChatResponse(results=[])
+
+    concurrency = min(
+        req.max_concurrency or BATCH_CONCURRENCY,
+        BATCH_CONCURRENCY,
+        CHAT_CONCURRENCY,
+        len(thread_ids),
+    )
+    async with _thread_turns(thread_ids), _admitted("chat", concurrency):
+        await _clear_pending(thread_ids)
+        states = await get_graph().abatch(
+            [
+                {"messages": [{"role": "user", "content": item.message}]}
+                for item in req.items
+            ],
+            [_run_config(thread_id) for thread_id in thread_ids],
+            max_concurrency=concurrency,
+            return_exceptions=True,
         )
-    except GraphInterrupt as exc:
-        interrupts = list(exc.args[0]) if exc.args else []
-        if interrupts:
-            interrupt = interrupts[0]
-            return ChatResponse(
-                status="approval_required",
-                thread_id=thread_id,
-                approval_prompt=str(interrupt.value),
-                interrupt_id=interrupt.id,
+
+    results = []
+    for thread_id, state in zip(thread_ids, states):
+        if isinstance(state, Exception):
+            results.append(
+                ChatResponse(status="error", thread_id=thread_id, response=str(state))
             )
-        return ChatResponse(status="approval_required", thread_id=thread_id)
+        else:
+            results.append(await _chat_response(thread_id, state))
+    return BatchChatResponse(results=results)
+
+
+def _trade_in_update(update) -> TradeRequest | None:
+    """The trade a node update proposes, if any (`prepare_buy` or the fast path)."""
+    # ToolNode reports the updates of Commands returned by tools as a list.
+    for item in update if isinstance(update, list) else [update]:
+        if isinstance(item, dict) and isinstance(item.get("trade"), TradeRequest):
+            return item["trade"]
+    return None
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_run(graph_input, thread_id: str) -> AsyncIterator[str]:
+    config = _run_config(thread_id)
+    yield _sse("start", {"thread_id": thread_id})
+    trade = None
+
+    try:
+        async with _thread_turn(thread_id), _admitted("chat"):
+            await _clear_pending([thread_id])
+            async for mode, chunk in get_graph().astream(
+                graph_input, config=config, stream_mode=["messages", "updates"]
+            ):
+                if mode == "messages":
+                    message, metadata = chunk
+                    content = message.content
+                    if (
+                        metadata.get("langgraph_node") == "chatbot"
+                        and message.type != "tool"
+                        and isinstance(content, str)
+                        and content
+                    ):
+                        yield _sse("token", {"content": content})
+                    continue
+
+                for node, update in chunk.items():
+                    if node == "__interrupt__":
+                        if metrics.enabled:
+                            metrics.interrupts.inc()
+                        interrupt = update[0]
+                        if trade is not None:
+                            await _record_pending(thread_id, interrupt, trade)
+                        yield _sse(
+                            "approval_required",
+                            {
+                                "thread_id": thread_id,
+                                "approval_prompt": str(interrupt.value),
+                                "interrupt_id": interrupt.id,
+                            },
+                        )
+                        return
+                    trade = _trade_in_update(update) or trade
+                    yield _sse("node", {"node": node})
+    except HTTPException as exc:
+        # The thread's queue or the chat queue filled up after
+        # `chat_stream` checked them.
+        yield _sse(
+            "error", {"thread_id": thread_id, "status": exc.status_code, "detail": exc.detail}
+        )
+        return
+
+    yield _sse("done", {"thread_id": thread_id})
+
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatRequest) -> StreamingResponse:
+    thread_id = req.thread_id or str(uuid.uuid4())
+    # Reject before the stream starts, while a status code can still say so.
+    if _thread_locks.full(thread_id):
+        raise _thread_busy(thread_id)
+    if _admission.saturated("chat"):
+        raise _shed("chat", _admission.retry_after("chat"))
+    graph_input = {"messages": [{"role": "user", "content": req.message}]}
+    return StreamingResponse(
+        _stream_run(graph_input, thread_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/approve", response_model=ChatResponse)
-def approve(req: ApprovalRequest) -> ChatResponse:
-    config = {"configurable": {"thread_id": req.thread_id}}
+async def approve(req: ApprovalRequest) -> ChatResponse:
+    from langgraph.types import Command
+
+    # Claimed before resuming, like `/approvals/resolve`: a thread resolved
+    # or expired elsewhere is not resumed twice, and one that is not parked
+    # (unknown, already decided, or moved on to a new turn) is not resumed.
+    index = get_approvals()
+    claimed = await index.aclaim([req.thread_id])
+    if not claimed:
+        return ChatResponse(status="not_pending", thread_id=req.thread_id)
+    config = _run_config(req.thread_id)
     try:
-        state = graph.invoke(Command(resume=req.decision), config=config)
-        return ChatResponse(
-            status="completed",
-            thread_id=req.thread_id,
-            response=state["messages"][-1].content,
+        async with _thread_turn(req.thread_id), _admitted("resume"):
+            state = await get_graph().ainvoke(Command(resume=req.decision), config=config)
+    except Exception:
+        # Still parked; put it back so the decision can be retried.
+        await index.aadd(claimed[0])
+        raise
+    if not state.get("messages"):
+        # Indexed, but the checkpointer has no such thread (e.g. lost on restart).
+        return ChatResponse(status="not_pending", thread_id=req.thread_id)
+    return await _chat_response(req.thread_id, state)
+
+
+def _pending_item(entry: PendingApproval, now: float) -> PendingApprovalItem:
+    return PendingApprovalItem(
+        thread_id=entry.thread_id,
+        interrupt_id=entry.interrupt_id,
+        symbol=entry.symbol,
+        quantity=entry.quantity,
+        total_price=entry.total_price,
+        approval_prompt=entry.prompt,
+        age_seconds=round(now - entry.created_at, 3),
+    )
+
+
+@app.get("/approvals", response_model=ApprovalListResponse)
+def list_approvals(
+    symbol: Optional[str] = None,
+    min_age_seconds: Optional[float] = None,
+    max_age_seconds: Optional[float] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+) -> ApprovalListResponse:
+    """Trades waiting for a decision, oldest first. Reads only the index."""
+    if APPROVAL_TTL > 0:
+        # Hide entries the expiry task has not swept yet.
+        max_age_seconds = (
+            APPROVAL_TTL if max_age_seconds is None else min(max_age_seconds, APPROVAL_TTL)
         )
-    except GraphInterrupt as exc:
-        interrupts = list(exc.args[0]) if exc.args else []
-        if interrupts:
-            interrupt = interrupts[0]
-            return ChatResponse(
-                status="approval_required",
-                thread_id=req.thread_id,
-                approval_prompt=str(interrupt.value),
-                interrupt_id=interrupt.id,
+    now = time.time()
+    entries, total = get_approvals().list(
+        symbol=symbol.upper() if symbol else None,
+        min_age=min_age_seconds,
+        max_age=max_age_seconds,
+        limit=limit,
+        offset=offset,
+        now=now,
+    )
+    next_offset = offset + len(entries)
+    return ApprovalListResponse(
+        items=[_pending_item(entry, now) for entry in entries],
+        total=total,
+        next_offset=next_offset if next_offset < total else None,
+    )
+
+
+async def _resume_many(
+    entries: list[PendingApproval], decision: str, max_concurrency: int
+) -> list:
+    """Resume parked threads concurrently; exceptions are returned per item."""
+    from langgraph.types import Command
+
+    if not entries:
+        return []
+    concurrency = min(max_concurrency, BATCH_CONCURRENCY, MAX_CONCURRENCY, len(entries))
+    thread_ids = [entry.thread_id for entry in entries]
+    async with _thread_turns(thread_ids), _admitted("resume", concurrency):
+        return await get_graph().abatch(
+            [Command(resume=decision)] * len(entries),
+            [_run_config(entry.thread_id) for entry in entries],
+            max_concurrency=concurrency,
+            return_exceptions=True,
+        )
+
+
+@app.post("/approvals/resolve", response_model=BatchChatResponse)
+async def resolve_approvals(req: BulkApprovalRequest) -> BatchChatResponse:
+    """Approve or decline many pending trades at once.
+
+    Targets the given `thread_ids`, or every pending trade for `symbol`. Each
+    thread is claimed from the index before it is resumed, so a thread being
+    resolved elsewhere is reported as "not_pending" rather than resumed twice.
+    """
+    index = get_approvals()
+    if req.thread_ids is not None:
+        requested = list(dict.fromkeys(req.thread_ids))
+    elif req.symbol:
+        requested = []
+        offset = 0
+        while True:
+            page, total = await index.alist(
+                symbol=req.symbol.upper(), limit=500, offset=offset
+            )
+            requested += [entry.thread_id for entry in page]
+            offset += len(page)
+            if not page or offset >= total:
+                break
+    else:
+        raise HTTPException(422, "give thread_ids or symbol")
+    if len(requested) > BATCH_MAX_ITEMS:
+        raise HTTPException(413, f"at most {BATCH_MAX_ITEMS} threads per request")
+
+    claimed = {entry.thread_id: entry for entry in await index.aclaim(requested)}
+    entries = list(claimed.values())
+    try:
+        states = await _resume_many(
+            entries, req.decision, req.max_concurrency or BATCH_CONCURRENCY
+        )
+    except HTTPException:
+        # A thread's queue was full; release the claims so the call can be retried.
+        for entry in entries:
+            await index.aadd(entry)
+        raise
+    resumed = dict(zip((entry.thread_id for entry in entries), states))
+
+    results = []
+    for thread_id in requested:
+        state = resumed.get(thread_id)
+        if thread_id not in claimed:
+            results.append(ChatResponse(status="not_pending", thread_id=thread_id))
+        elif isinstance(state, Exception):
+            # Put it back so the decision can be retried.
+            await index.aadd(claimed[thread_id])
+            results.append(
+                ChatResponse(status="error", thread_id=thread_id, response=str(state))
             )
-        return ChatResponse(status="approval_required", thread_id=req.thread_id)
+        else:
+            results.append(
+                ChatResponse(
+                    status="completed",
+                    thread_id=thread_id,
+                    response=state["messages"][-1].content,
+                )
+            )
+    return BatchChatResponse(results=results)
+
+
+async def _expire_approvals() -> None:
+    """Decline trades that have waited longer than `APPROVAL_TTL`."""
+    interval = min(max(APPROVAL_TTL / 4, 1.0), 60.0)
+    while True:
+        await asyncio.sleep(interval)
+        index = get_approvals()
+        expired = await index.aexpire(APPROVAL_TTL)
+        try:
+            states = await _resume_many(expired, "expired", BATCH_CONCURRENCY)
+        except HTTPException:
+            # A thread is busy; retry the whole sweep next time.
+            for entry in expired:
+                await index.aadd(entry)
+            continue
+        for entry, state in zip(expired, states):
+            if isinstance(state, Exception):
+                # Still parked; retried on the next sweep.
+                logger.warning("could not expire %s: %s", entry.thread_id, state)
+                await index.aadd(entry)
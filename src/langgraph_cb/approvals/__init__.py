@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+
+from langgraph_cb.approvals.index import (
+    MemoryApprovalIndex,
+    PendingApproval,
+    SqliteApprovalIndex,
+)
+from langgraph_cb.config import Settings, get_settings
+
+__all__ = [
+    "MemoryApprovalIndex",
+    "PendingApproval",
+    "SqliteApprovalIndex",
+    "build_approval_index",
+]
+
+
+def build_approval_index(
+    backend: str | None = None, settings: Settings | None = None
+) -> MemoryApprovalIndex | SqliteApprovalIndex:
+    """Create the pending-approvals index selected by `backend` or the settings.
+
+    Backends: `memory` and `sqlite` (at `settings.approvals_path`). Defaults
+    to the same kind as the checkpointer, so the index is shared between
+    workers exactly when the parked threads are.
+    """
+    settings = settings or get_settings()
+    backend = (backend or settings.approvals_backend).lower()
+
+    if backend == "memory":
+        return MemoryApprovalIndex()
+
+    if backend == "sqlite":
+        path = settings.approvals_path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        return SqliteApprovalIndex(path)
+
+    raise ValueError(f"Unknown approvals backend: {backend!r}")
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Iterable, NamedTuple, Optional
+
+from langgraph_cb.tools.trades import TradeRequest
+
+
+class PendingApproval(NamedTuple):
+    """A thread parked at the approval interrupt, waiting for a decision."""
+
+    thread_id: str
+    interrupt_id: Optional[str]
+    symbol: str
+    quantity: int
+    total_price: float
+    prompt: str
+    created_at: float
+
+    @classmethod
+    def from_trade(
+        cls,
+        thread_id: str,
+        interrupt_id: Optional[str],
+        trade: TradeRequest,
+        prompt: str,
+        created_at: Optional[float] = None,
+    ) -> "PendingApproval":
+        return cls(
+            thread_id,
+            interrupt_id,
+            trade.symbol,
+            trade.quantity,
+            trade.total_price,
+            prompt,
+            time.time() if created_at is None else created_at,
+        )
+
+
+def _age_bounds(
+    now: float, min_age: Optional[float], max_age: Optional[float]
+) -> tuple[float, float]:
+    """`created_at` range (inclusive) for entries aged between min_age and max_age."""
+    newest = now - min_age if min_age is not None else float("inf")
+    oldest = now - max_age if max_age is not None else float("-inf")
+    return oldest, newest
+
+
+class _AsyncMethods:
+    """`a`-prefixed counterparts of the index methods, for the event loop."""
+
+    async def _run(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    async def aadd(self, entry: PendingApproval) -> None:
+        await self._run(self.add, entry)
+
+    async def aclaim(self, thread_ids: Iterable[str]) -> list[PendingApproval]:
+        return await self._run(self.claim, list(thread_ids))
+
+    async def adiscard(self, thread_id: str) -> None:
+        await self._run(self.discard, thread_id)
+
+    async def alist(self, **kwargs) -> tuple[list[PendingApproval], int]:
+        return await self._run(self.list, **kwargs)
+
+    async def aexpire(self, max_age: float, now: Optional[float] = None) -> list[PendingApproval]:
+        return await self._run(self.expire, max_age, now)
+
+
+class MemoryApprovalIndex(_AsyncMethods):
+    """In-process index of pending approvals, keyed by thread id.
+
+    Entries are kept in creation order per symbol, so listings are a scan of
+    the matching symbol only and never touch graph state. Counts of recorded,
+    resolved and expired entries are available in `stats`.
+    """
+
+    def __init__(self):
+        self.stats: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._entries: dict[str, PendingApproval] = {}
+        # symbol -> {thread_id: entry}, oldest first.
+        self._by_symbol: defaultdict[str, dict[str, PendingApproval]] = defaultdict(dict)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry: PendingApproval) -> None:
+        with self._lock:
+            self._remove(entry.thread_id)
+            self._entries[entry.thread_id] = entry
+            self._by_symbol[entry.symbol][entry.thread_id] = entry
+            self.stats["recorded"] += 1
+
+    def claim(self, thread_ids: Iterable[str]) -> list[PendingApproval]:
+        """Remove and return the entries for `thread_ids` that are pending.
+
+        Each entry is handed out once, so concurrent resolutions of the same
+        thread cannot both resume it.
+        """
+        with self._lock:
+            claimed = [e for e in map(self._remove, thread_ids) if e is not None]
+            self.stats["resolved"] += len(claimed)
+        return claimed
+
+    def discard(self, thread_id: str) -> None:
+        self.claim([thread_id])
+
+    def list(
+        self,
+        *,
+        symbol: Optional[str] = None,
+        min_age: Optional[float] = None,
+        max_age: Optional[float] = None,
+        limit: int = 50,
+        offset: int = 0,
+        now: Optional[float] = None,
+    ) -> tuple[list[PendingApproval], int]:
+        """Oldest-first page of pending entries and the total matching count."""
+        oldest, newest = _age_bounds(time.time() if now is None else now, min_age, max_age)
+        with self._lock:
+            source = self._by_symbol.get(symbol, {}) if symbol else self._entries
+            matching = [e for e in source.values() if oldest <= e.created_at <= newest]
+        matching.sort(key=lambda e: e.created_at)
+        return matching[offset : offset + limit], len(matching)
+
+    def expire(self, max_age: float, now: Optional[float] = None) -> list[PendingApproval]:
+        """Claim every entry older than `max_age` seconds."""
+        cutoff = (time.time() if now is None else now) - max_age
+        with self._lock:
+            stale = [t for t, e in self._entries.items() if e.created_at < cutoff]
+            expired = [self._remove(thread_id) for thread_id in stale]
+            self.stats["expired"] += len(expired)
+        return expired
+
+    def _remove(self, thread_id: str) -> PendingApproval | None:
+        entry = self._entries.pop(thread_id, None)
+        if entry is not None:
+            by_symbol = self._by_symbol[entry.symbol]
+            by_symbol.pop(thread_id, None)
+            if not by_symbol:
+                del self._by_symbol[entry.symbol]
+        return entry
+
+
+class SqliteApprovalIndex(_AsyncMethods):
+    """Pending approvals in a SQLite table, shared by all workers on a host.
+
+    Use alongside the SQLite checkpointer so a trade parked by one worker is
+    listed and can be resolved by any other. Claims are a single
+    `DELETE ... RETURNING`, so only one worker resumes a given thread. The
+    async methods run the queries in a worker thread: under write contention
+    a statement can wait out the busy timeout, which must not stall the loop.
+    """
+
+    async def _run(self, fn, *args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def __init__(self, path: str):
+        self.stats: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pending_approvals ("
+            "thread_id TEXT PRIMARY KEY, interrupt_id TEXT, symbol TEXT NOT NULL, "
+            "quantity INTEGER NOT NULL, total_price REAL NOT NULL, "
+            "prompt TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS pending_approvals_created "
+            "ON pending_approvals (created_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS pending_approvals_symbol "
+            "ON pending_approvals (symbol, created_at)"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM pending_approvals").fetchone()[0]
+
+    def add(self, entry: PendingApproval) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pending_approvals VALUES (?, ?, ?, ?, ?, ?, ?)",
+                entry,
+            )
+            self.stats["recorded"] += 1
+
+    def claim(self, thread_ids: Iterable[str]) -> list[PendingApproval]:
+        thread_ids = list(thread_ids)
+        if not thread_ids:
+            return []
+        marks = ",".join("?" * len(thread_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"DELETE FROM pending_approvals WHERE thread_id IN ({marks}) RETURNING *",
+                thread_ids,
+            ).fetchall()
+            self.stats["resolved"] += len(rows)
+        return [PendingApproval(*row) for row in rows]
+
+    def discard(self, thread_id: str) -> None:
+        self.claim([thread_id])
+
+    def list(
+        self,
+        *,
+        symbol: Optional[str] = None,
+        min_age: Optional[float] = None,
+        max_age: Optional[float] = None,
+        limit: int = 50,
+        offset: int = 0,
+        now: Optional[float] = None,
+    ) -> tuple[list[PendingApproval], int]:
+        oldest, newest = _age_bounds(time.time() if now is None else now, min_age, max_age)
+        where = "created_at BETWEEN ? AND ?"
+        params: list = [oldest, newest]
+        if symbol:
+            where += " AND symbol = ?"
+            params.append(symbol)
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT count(*) FROM pending_approvals WHERE {where}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT * FROM pending_approvals WHERE {where} "
+                "ORDER BY created_at LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        return [PendingApproval(*row) for row in rows], total
+
+    def expire(self, max_age: float, now: Optional[float] = None) -> list[PendingApproval]:
+        cutoff = (time.time() if now is None else now) - max_age
+        with self._lock:
+            rows = self._conn.execute(
+                "DELETE FROM pending_approvals WHERE created_at < ? RETURNING *", (cutoff,)
+            ).fetchall()
+            self.stats["expired"] += len(rows)
+        return [PendingApproval(*row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from langgraph_cb.config import Settings, get_settings
+
+if TYPE_CHECKING:
+    from langchain_core.caches import BaseCache
+
+    from langgraph_cb.cache.semantic import SemanticAnswerCache
+
+
+def build_response_cache(
+    backend: str | None = None, settings: Settings | None = None
+) -> BaseCache | None:
+    """Create the LLM response cache selected by `backend` or the settings.
+
+    Backends: `off` (default), `memory` (LRU) and `disk` (SQLite file at
+    `settings.llm_cache_path`), sized by `llm_cache_size` and expiring after
+    `llm_cache_ttl` seconds.
+    """
+    settings = settings or get_settings()
+    backend = (backend or settings.llm_cache).lower()
+    if backend == "off":
+        return None
+
+    from langgraph_cb.cache.response import DiskResponseCache, LRUResponseCache
+
+    kwargs = {}
+    if settings.llm_cache_size is not None:
+        kwargs["max_entries"] = settings.llm_cache_size
+    if settings.llm_cache_ttl is not None:
+        kwargs["ttl_seconds"] = settings.llm_cache_ttl or None
+
+    if backend == "memory":
+        return LRUResponseCache(**kwargs)
+
+    if backend == "disk":
+        path = settings.llm_cache_path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        return DiskResponseCache(path, **kwargs)
+
+    raise ValueError(f"Unknown LLM cache backend: {backend!r}")
+
+
+def build_answer_cache(
+    backend: str | None = None, settings: Settings | None = None
+) -> SemanticAnswerCache | None:
+    """Create the semantic answer cache selected by `backend` or the settings.
+
+    Backends: `off` (default) and `memory`, holding `answer_cache_size`
+    questions and serving matches scoring at least `answer_cache_threshold`.
+    """
+    settings = settings or get_settings()
+    backend = (backend or settings.answer_cache).lower()
+    if backend == "off":
+        return None
+
+    if backend == "memory":
+        from langgraph_cb.cache.semantic import SemanticAnswerCache
+
+        return SemanticAnswerCache(
+            max_entries=settings.answer_cache_size,
+            threshold=settings.answer_cache_threshold,
+            ttl_seconds=settings.answer_cache_ttl or None,
+        )
+
+    raise ValueError(f"Unknown answer cache backend: {backend!r}")
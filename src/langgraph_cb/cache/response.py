@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import messages_from_dict, messages_to_dict
+from langchain_core.outputs import ChatGeneration
+
+# Per-message fields that differ between otherwise identical conversations
+# (random ids, token usage, provider metadata) and must not affect the key.
+_VOLATILE_KWARGS = ("id", "response_metadata", "usage_metadata")
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Hash a serialized message list and model/tool parameters into a cache key.
+
+    `prompt` is the `langchain_core.load.dumps` form of the messages and
+    `llm_string` covers the model name, temperature and bound tools.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        canonical = prompt
+    else:
+        for message in messages if isinstance(messages, list) else ():
+            kwargs = message.get("kwargs") if isinstance(message, dict) else None
+            if isinstance(kwargs, dict):
+                for field in _VOLATILE_KWARGS:
+                    kwargs.pop(field, None)
+        canonical = json.dumps(messages, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(canonical.encode())
+    digest.update(b"\0")
+    digest.update(llm_string.encode())
+    return digest.hexdigest()
+
+
+class LRUResponseCache(BaseCache):
+    """In-process LLM response cache with LRU eviction and an optional TTL.
+
+    Hit, miss and eviction counts are available in `stats`.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: Optional[float] = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats: Counter[str] = Counter()
+        self._entries: OrderedDict[str, tuple[float, RETURN_VAL_TYPE]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                self.stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), return_val)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # Lookups are dict operations; skip the executor hop of the defaults.
+    async def alookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        return self.lookup(prompt, llm_string)
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        self.update(prompt, llm_string, return_val)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        self.clear()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl_seconds is not None and time.monotonic() - created > self.ttl_seconds
+
+
+class DiskResponseCache(BaseCache):
+    """SQLite-backed chat model response cache that survives restarts.
+
+    Entries older than `ttl_seconds` are ignored and the least recently used
+    ones are deleted once `max_entries` is exceeded (checked every
+    `_TRIM_EVERY` writes, so the table can briefly overshoot).
+    """
+
+    _TRIM_EVERY = 256
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100_000,
+        ttl_seconds: Optional[float] = 24 * 3600.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and (
+                self.ttl_seconds is not None and now - row[1] > self.ttl_seconds
+            ):
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats["expired"] += 1
+                row = None
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self.stats["hits"] += 1
+        return [ChatGeneration(message=m) for m in messages_from_dict(json.loads(row[0]))]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        # Chat models only produce ChatGenerations; storing their messages keeps
+        # the file plain JSON rather than pickled/constructor payloads.
+        value = json.dumps(messages_to_dict([g.message for g in return_val]))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._writes += 1
+            if self._writes % self._TRIM_EVERY:
+                return
+            evicted = self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            self.stats["evictions"] += max(evicted, 0)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z0-9]+")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_NEGATION = re.compile(
+    r"\b(not|no|never|none|nor|neither|nothing|nobody|nowhere|without)\b|n['’]t\b",
+    re.IGNORECASE,
+)
+_STOPWORDS = frozenset(
+    "a about an and are as at be been by can could define describe did do does "
+    "explain for give has have how i in is me name of on or please tell the to "
+    "was were what whats when where which who whom why would you".split()
+)
+_SUFFIXES = ("ing", "ed", "es", "s")
+
+# Questions whose answer depends on live data or on an order in flight, or on
+# earlier turns of the conversation. These always go to the model.
+_MARKET = re.compile(
+    r"\b(buy|bought|sell|sold|trade[sd]?|trading|order|price[sd]?|cost[s]?|worth|"
+    r"quotes?|stocks?|shares?|portfolio|market|invest\w*)\b|[$%]",
+    re.IGNORECASE,
+)
+_TICKER = re.compile(r"\b[A-Z]{2,5}\b")
+_VOLATILE = re.compile(
+    r"\b(today|tonight|now|current(ly)?|latest|recent(ly)?|yesterday|tomorrow|"
+    r"news|weather)\b",
+    re.IGNORECASE,
+)
+_CONTEXTUAL = re.compile(
+    r"\b(it|its|this|that|these|those|they|them|their|he|him|his|she|her|"
+    r"above|previous|earlier|again|else)\b",
+    re.IGNORECASE,
+)
+# About the person asking ("what is my name", "what do you know about us"):
+# the answer comes from their conversation, not from general knowledge.
+# Courtesy phrases are dropped first so "tell me" / "can you" stay cacheable.
+_COURTESY = re.compile(
+    r"\b(?:(?:can|could|would|will)\s+you|(?:tell|show|give)\s+me|please)\b",
+    re.IGNORECASE,
+)
+_PERSONAL = re.compile(
+    r"\b(i|i'm|i've|me|my|mine|myself|we|us|our|ours|ourselves|"
+    r"you|you're|your|yours|yourself)\b",
+    re.IGNORECASE,
+)
+
+
+def cacheable_question(text: str) -> bool:
+    """Whether an answer to `text` may be stored or served from the cache.
+
+    Price and trade questions (keywords, tickers, currency), time-sensitive
+    ones, follow-ups that lean on earlier turns and questions about the
+    asker are never cached.
+    """
+    return not (
+        _MARKET.search(text)
+        or _TICKER.search(text)
+        or _VOLATILE.search(text)
+        or _CONTEXTUAL.search(text)
+        or _PERSONAL.search(_COURTESY.sub(" ", text))
+    )
+
+
+def _guards(question: str) -> frozenset[str]:
+    """Numbers and negations: two questions can only share an answer if these match."""
+    negations = {(m.group(1) or "not").lower() for m in _NEGATION.finditer(question)}
+    return frozenset(_NUMBER.findall(question)) | negations
+
+
+def _stem(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+class HashingEmbedder:
+    """CPU-only text embedding from hashed word and character n-grams.
+
+    Words are lower-cased, stripped of stopwords and crudely stemmed; each word
+    and each of its character trigrams is hashed into one of `dim` buckets with
+    a hashed sign, and the vector is L2-normalized. It captures rewording,
+    reordering, inflection and small typos, not synonyms.
+    """
+
+    def __init__(self, dim: int = 1024, char_weight: float = 0.5):
+        self.dim = dim
+        self.char_weight = char_weight
+
+    def _features(self, text: str) -> list[tuple[str, float]]:
+        words = [_stem(w) for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+        features = [(f"w:{w}", 1.0) for w in words]
+        for word in words:
+            padded = f" {word} "
+            features.extend(
+                (f"c:{padded[i:i + 3]}", self.char_weight) for i in range(len(padded) - 2)
+            )
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in self._features(text):
+            h = zlib.crc32(feature.encode())
+            vector[h % self.dim] += weight if h & 0x80000000 else -weight
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+
+class SemanticAnswerCache:
+    """Answers to standalone knowledge questions, matched by cosine similarity.
+
+    Question vectors live in one float32 matrix, so a lookup is a single
+    matrix-vector product over all entries. A cached answer is served when the
+    closest question scores at least `threshold` and has the same numbers and
+    negations ("world war 1" is not "world war 2", "is a tomato not a fruit"
+    is not "is a tomato a fruit"). The hashed embedding sees shared words, not
+    synonyms: rewordings of the same question ("Who was the first man to walk
+    on the moon?") hit at the default threshold, while paraphrases sharing
+    few words ("first person on the moon?") miss. Entries expire after `ttl_seconds`;
+    when `max_entries` is reached the least recently used one is replaced.
+    Questions failing `cacheable_question` are neither served nor stored.
+
+    Hit, miss, unsafe, store and eviction counts are available in `stats`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        threshold: float = 0.8,
+        ttl_seconds: Optional[float] = 86_400.0,
+        embedder: Optional[HashingEmbedder] = None,
+    ):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.embedder = embedder or HashingEmbedder()
+        self.stats: Counter[str] = Counter()
+        capacity = min(max_entries, 256)
+        self._vectors = np.zeros((capacity, self.embedder.dim), dtype=np.float32)
+        self._created = np.zeros(capacity)
+        self._used = np.zeros(capacity)
+        self._guards: list[frozenset[str]] = []
+        self._answers: list[str] = []
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _best(self, vector: np.ndarray, now: float) -> tuple[int, float]:
+        scores = self._vectors[: self._size] @ vector
+        if self.ttl_seconds is not None:
+            scores[self._created[: self._size] < now - self.ttl_seconds] = -1.0
+        index = int(np.argmax(scores))
+        return index, float(scores[index])
+
+    def lookup(self, question: str) -> Optional[str]:
+        if not cacheable_question(question):
+            self.stats["unsafe"] += 1
+            return None
+        vector = self.embedder.embed(question)
+        guards = _guards(question)
+        now = time.monotonic()
+        with self._lock:
+            if self._size:
+                index, score = self._best(vector, now)
+                if score >= self.threshold and self._guards[index] == guards:
+                    self._used[index] = now
+                    self.stats["hits"] += 1
+                    return self._answers[index]
+            self.stats["misses"] += 1
+            return None
+
+    def update(self, question: str, answer: str) -> None:
+        if not cacheable_question(question):
+            self.stats["unsafe"] += 1
+            return
+        vector = self.embedder.embed(question)
+        guards = _guards(question)
+        now = time.monotonic()
+        with self._lock:
+            index = self._slot(vector, now)
+            self._vectors[index] = vector
+            self._created[index] = self._used[index] = now
+            if index == len(self._answers):
+                self._guards.append(guards)
+                self._answers.append(answer)
+            else:
+                self._guards[index] = guards
+                self._answers[index] = answer
+            self.stats["stores"] += 1
+
+    def _slot(self, vector: np.ndarray, now: float) -> int:
+        """Row for a new entry: the same question's, a free row, or the LRU one."""
+        if self._size:
+            index, score = self._best(vector, now)
+            if score >= 0.999:
+                return index
+        if self._size < self.max_entries:
+            if self._size == len(self._vectors):
+                self._grow()
+            self._size += 1
+            return self._size - 1
+        self.stats["evictions"] += 1
+        return int(np.argmin(self._used))
+
+    def _grow(self) -> None:
+        capacity = min(self.max_entries, 2 * len(self._vectors))
+        vectors = np.zeros((capacity, self.embedder.dim), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        self._vectors = vectors
+        self._created = np.resize(self._created, capacity)
+        self._used = np.resize(self._used, capacity)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._size = 0
+            self._guards.clear()
+            self._answers.clear()
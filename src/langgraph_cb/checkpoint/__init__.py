@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from langgraph_cb.config import Settings, get_settings
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+
+
+def build_checkpointer(
+    backend: str | None = None, settings: Settings | None = None
+) -> BaseCheckpointSaver:
+    """Create the checkpointer selected by `backend` or the settings.
+
+    Backends: `memory` (bounded, in-process) and `sqlite` (durable, at
+    `settings.sqlite_path`); see `Settings.checkpointer_backend` for the
+    default. Message history is stored as deltas with a full snapshot every
+    `settings.snapshot_every` writes (1 disables deltas).
+    """
+    settings = settings or get_settings()
+    backend = (backend or settings.checkpointer_backend).lower()
+    snapshot_every = settings.snapshot_every
+
+    if backend == "memory":
+        from langgraph_cb.checkpoint.memory import BoundedMemorySaver
+
+        return BoundedMemorySaver(snapshot_every=snapshot_every)
+
+    if backend == "sqlite":
+        from langgraph_cb.checkpoint.sqlite import DurableSqliteSaver
+
+        path = settings.sqlite_path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        return DurableSqliteSaver(path, snapshot_every=snapshot_every)
+
+    raise ValueError(f"Unknown checkpointer backend: {backend!r}")
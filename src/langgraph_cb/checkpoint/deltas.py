@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+# Channels whose value is a list that normally only grows between steps.
+DELTA_CHANNELS = frozenset({"messages"})
+
+
+class _Stored(NamedTuple):
+    version: str
+    items: tuple
+    depth: int
+
+
+class Delta(NamedTuple):
+    """How to store one channel version.
+
+    `base` is None for a full snapshot (`payload` is the whole list);
+    otherwise `payload` is the items appended since version `base`.
+    """
+
+    base: Optional[str]
+    payload: Any
+
+
+class DeltaTracker:
+    """Remembers the last stored value of each append-only channel per thread.
+
+    `encode` compares the new list with the remembered one (by identity
+    first, so within a run this is a pointer scan rather than a comparison of
+    messages) and returns only the appended tail when the old value is a
+    prefix. A full snapshot is taken when there is nothing to compare with,
+    when messages were removed or replaced, and after `snapshot_every`
+    consecutive deltas, which bounds the work to rebuild a value on read.
+    At most `max_threads` threads are remembered, least recently used first.
+    """
+
+    def __init__(self, snapshot_every: int = 32, max_threads: int = 10_000):
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be >= 1")
+        self.snapshot_every = snapshot_every
+        self.max_threads = max_threads
+        self._lock = threading.Lock()
+        # thread_id -> {(checkpoint_ns, channel): _Stored}
+        self._threads: OrderedDict[str, dict[tuple[str, str], _Stored]] = OrderedDict()
+
+    def encode(
+        self, thread_id: str, checkpoint_ns: str, channel: str, version: str, value: Any
+    ) -> Delta:
+        items = tuple(value) if isinstance(value, list) else None
+        with self._lock:
+            last = self._threads.get(thread_id, {}).get((checkpoint_ns, channel))
+            if (
+                items is not None
+                and last is not None
+                and last.depth + 1 < self.snapshot_every
+                and len(items) >= len(last.items)
+                and all(a is b or a == b for a, b in zip(last.items, items))
+            ):
+                delta = Delta(last.version, list(items[len(last.items) :]))
+                depth = last.depth + 1
+            else:
+                delta = Delta(None, value)
+                depth = 0
+            if items is not None:
+                self._remember(thread_id, checkpoint_ns, channel, _Stored(version, items, depth))
+        return delta
+
+    def stored_version(self, thread_id: str, checkpoint_ns: str, channel: str) -> Optional[str]:
+        """Version last written or read for the channel, if remembered."""
+        with self._lock:
+            last = self._threads.get(thread_id, {}).get((checkpoint_ns, channel))
+        return last.version if last is not None else None
+
+    def cached(
+        self, thread_id: str, checkpoint_ns: str, channel: str, version: str
+    ) -> Optional[list]:
+        """The remembered value, if it is the one at `version`.
+
+        Lets an in-process saver skip deserializing the whole thread on the
+        common read of the checkpoint it just wrote. Items are shared, not
+        copied: messages in graph state are never mutated in place.
+        """
+        with self._lock:
+            last = self._threads.get(thread_id, {}).get((checkpoint_ns, channel))
+            if last is None or last.version != version:
+                return None
+            self._threads.move_to_end(thread_id)
+            return list(last.items)
+
+    def loaded(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: str,
+        value: Any,
+        depth: int,
+    ) -> None:
+        """Record a value rebuilt on read, so the next write can be a delta."""
+        if isinstance(value, list):
+            with self._lock:
+                self._remember(
+                    thread_id, checkpoint_ns, channel, _Stored(version, tuple(value), depth)
+                )
+
+    def forget(self, thread_id: str) -> None:
+        with self._lock:
+            self._threads.pop(thread_id, None)
+
+    def _remember(self, thread_id: str, checkpoint_ns: str, channel: str, stored: _Stored) -> None:
+        channels = self._threads.get(thread_id)
+        if channels is None:
+            channels = self._threads[thread_id] = {}
+            while len(self._threads) > self.max_threads:
+                self._threads.popitem(last=False)
+        else:
+            self._threads.move_to_end(thread_id)
+        channels[(checkpoint_ns, channel)] = stored
+
+
+def apply_deltas(snapshot: Any, deltas: list[list]) -> Any:
+    """Rebuild a value from its snapshot and the deltas after it, oldest first."""
+    value = list(snapshot)
+    for items in deltas:
+        value.extend(items)
+    return value
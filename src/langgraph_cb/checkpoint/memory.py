@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Iterator, Sequence
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+from langgraph_cb.checkpoint.deltas import DELTA_CHANNELS, DeltaTracker, apply_deltas
+
+# Channel LangGraph writes when a node calls `interrupt(...)`.
+_INTERRUPT = "__interrupt__"
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """In-memory checkpointer with a bounded footprint.
+
+    Idle threads are evicted least-recently-used first once `max_threads` or
+    `max_bytes` is exceeded, or after `ttl_seconds` without activity. Only the
+    latest `keep_last` checkpoints of each thread are retained. Threads parked
+    at an `interrupt` (e.g. a trade waiting for approval) are never evicted,
+    so they can always be resumed.
+
+    The message list is stored as deltas: each step keeps only the messages
+    appended since the previous version, with a full snapshot every
+    `snapshot_every` versions (see `DeltaTracker`), so a step costs
+    O(new messages) to serialize instead of O(history). Reading back the
+    version last written or read reuses the remembered list instead of
+    deserializing the thread again.
+
+    Eviction, pruning and cached-read counts are available in `stats`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_threads: int = 10_000,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 3600.0,
+        keep_last: int = 2,
+        snapshot_every: int = 32,
+        serde=None,
+    ) -> None:
+        super().__init__(serde=serde)
+        if keep_last < 1:
+            raise ValueError("keep_last must be >= 1")
+        self.max_threads = max_threads
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.keep_last = keep_last
+        self.stats: Counter[str] = Counter()
+
+        self._lock = threading.RLock()
+        # thread_id -> last access time, least recently used first.
+        self._lru: OrderedDict[str, float] = OrderedDict()
+        # Threads waiting on an interrupt; exempt from eviction.
+        self._parked: set[str] = set()
+        self._thread_bytes: defaultdict[str, int] = defaultdict(int)
+        self._total_bytes = 0
+        self._blob_keys: defaultdict[str, set] = defaultdict(set)
+        self._versions: dict[tuple[str, str, str], ChannelVersions] = {}
+        self._deltas = DeltaTracker(snapshot_every, max_threads=max_threads)
+        # Blob key of a delta -> version of the blob it extends.
+        self._delta_bases: dict[tuple[str, str, str, str], str] = {}
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            if thread_id not in self.storage:
+                return None
+            self._touch(thread_id)
+            return super().get_tuple(config)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            if config and config["configurable"]["thread_id"] not in self.storage:
+                return iter(())
+            return iter(
+                list(super().list(config, filter=filter, before=before, limit=limit))
+            )
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values = checkpoint["channel_values"]
+        encoded = {
+            channel: self._deltas.encode(
+                thread_id, checkpoint_ns, channel, version, values[channel]
+            )
+            for channel, version in new_versions.items()
+            if channel in DELTA_CHANNELS and channel in values
+        }
+        if encoded:
+            checkpoint = {
+                **checkpoint,
+                "channel_values": {k: v for k, v in values.items() if k not in encoded},
+            }
+        with self._lock:
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            for channel, delta in encoded.items():
+                key = (thread_id, checkpoint_ns, channel, new_versions[channel])
+                self.blobs[key] = self.serde.dumps_typed(delta.payload)
+                if delta.base is not None:
+                    self._delta_bases[key] = delta.base
+
+            saved = self.storage[thread_id][checkpoint_ns][checkpoint["id"]]
+            added = len(saved[0][1]) + len(saved[1][1])
+            for channel, version in new_versions.items():
+                key = (thread_id, checkpoint_ns, channel, version)
+                self._blob_keys[thread_id].add(key)
+                added += len(self.blobs[key][1])
+            self._versions[(thread_id, checkpoint_ns, checkpoint["id"])] = dict(
+                checkpoint["channel_versions"]
+            )
+            self._add_bytes(thread_id, added)
+
+            # A new checkpoint means any earlier interrupt has been resumed;
+            # put_writes parks the thread again if this step interrupts too.
+            self._parked.discard(thread_id)
+            self._touch(thread_id)
+            self._prune(thread_id, checkpoint_ns)
+            self._evict()
+            return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        key = (thread_id, checkpoint_ns, checkpoint_id)
+        with self._lock:
+            before = self._writes_bytes(key)
+            super().put_writes(config, writes, task_id, task_path)
+            self._add_bytes(thread_id, self._writes_bytes(key) - before)
+            if any(channel == _INTERRUPT for channel, _ in writes):
+                self._parked.add(thread_id)
+                self._lru.pop(thread_id, None)
+            else:
+                self._touch(thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            namespaces = self.storage.pop(thread_id, {})
+            for checkpoint_ns, checkpoints in namespaces.items():
+                for checkpoint_id in checkpoints:
+                    self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+                    self._versions.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            for key in self._blob_keys.pop(thread_id, ()):
+                self.blobs.pop(key, None)
+                self._delta_bases.pop(key, None)
+            self._deltas.forget(thread_id)
+            self._total_bytes -= self._thread_bytes.pop(thread_id, 0)
+            self._lru.pop(thread_id, None)
+            self._parked.discard(thread_id)
+
+    def _load_blobs(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> dict[str, Any]:
+        result = super()._load_blobs(
+            thread_id,
+            checkpoint_ns,
+            {k: v for k, v in versions.items() if k not in DELTA_CHANNELS},
+        )
+        for channel in DELTA_CHANNELS.intersection(versions):
+            key = (thread_id, checkpoint_ns, channel, versions[channel])
+            cached = self._deltas.cached(thread_id, checkpoint_ns, channel, versions[channel])
+            if cached is not None and key in self.blobs:
+                self.stats["cached_reads"] += 1
+                result[channel] = cached
+                continue
+            deltas = []
+            while key in self._delta_bases:
+                deltas.append(self.serde.loads_typed(self.blobs[key]))
+                key = (thread_id, checkpoint_ns, channel, self._delta_bases[key])
+            blob = self.blobs.get(key)
+            if blob is None or blob[0] == "empty":
+                continue
+            value = self.serde.loads_typed(blob)
+            if deltas:
+                value = apply_deltas(value, deltas[::-1])
+            result[channel] = value
+            self._deltas.loaded(
+                thread_id, checkpoint_ns, channel, versions[channel], value, len(deltas)
+            )
+        return result
+
+    def _touch(self, thread_id: str) -> None:
+        if thread_id in self._parked:
+            return
+        self._lru[thread_id] = time.monotonic()
+        self._lru.move_to_end(thread_id)
+
+    def _add_bytes(self, thread_id: str, size: int) -> None:
+        self._thread_bytes[thread_id] += size
+        self._total_bytes += size
+
+    def _writes_bytes(self, key: tuple[str, str, str]) -> int:
+        return sum(len(w[2][1]) for w in self.writes.get(key, {}).values())
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.keep_last:
+            return
+
+        freed = 0
+        for checkpoint_id in sorted(checkpoints)[: -self.keep_last]:
+            saved = checkpoints.pop(checkpoint_id)
+            freed += len(saved[0][1]) + len(saved[1][1])
+            freed += self._writes_bytes((thread_id, checkpoint_ns, checkpoint_id))
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            self._versions.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            self.stats["pruned_checkpoints"] += 1
+
+        live = {
+            (channel, version)
+            for checkpoint_id in checkpoints
+            for channel, version in self._versions.get(
+                (thread_id, checkpoint_ns, checkpoint_id), {}
+            ).items()
+        }
+        # Deltas still in use keep the versions they extend alive.
+        for channel, version in list(live):
+            key = (thread_id, checkpoint_ns, channel, version)
+            while key in self._delta_bases:
+                key = (thread_id, checkpoint_ns, channel, self._delta_bases[key])
+                live.add((channel, key[3]))
+        blob_keys = self._blob_keys[thread_id]
+        for key in [k for k in blob_keys if k[1] == checkpoint_ns]:
+            if (key[2], key[3]) not in live:
+                blob_keys.discard(key)
+                self._delta_bases.pop(key, None)
+                freed += len(self.blobs.pop(key)[1])
+        self._add_bytes(thread_id, -freed)
+
+    def _evict(self) -> None:
+        if self.ttl_seconds is not None:
+            cutoff = time.monotonic() - self.ttl_seconds
+            while self._lru:
+                thread_id, last_used = next(iter(self._lru.items()))
+                if last_used > cutoff:
+                    break
+                self.delete_thread(thread_id)
+                self.stats["evicted_ttl"] += 1
+
+        while len(self._lru) > self.max_threads:
+            self.delete_thread(next(iter(self._lru)))
+            self.stats["evicted_lru"] += 1
+
+        if self.max_bytes is not None:
+            # Never evict the most recently used thread: it is the one being written.
+            while self._total_bytes > self.max_bytes and len(self._lru) > 1:
+                self.delete_thread(next(iter(self._lru)))
+                self.stats["evicted_memory"] += 1
@@ -0,0 +1,622 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import random
+import sqlite3
+import threading
+from collections.abc import AsyncIterator, Iterator, Sequence
+from concurrent.futures import Future
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from langgraph_cb.checkpoint.deltas import DELTA_CHANNELS, DeltaTracker, apply_deltas
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    base_version TEXT,
+    root_version TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+"""
+
+# Snapshot first, then each delta after it, oldest first.
+_LOAD_CHAIN = """
+WITH RECURSIVE chain(version, base_version, type, value, depth) AS (
+    SELECT version, base_version, type, value, 0 FROM blobs
+    WHERE thread_id = ?1 AND checkpoint_ns = ?2 AND channel = ?3 AND version = ?4
+    UNION ALL
+    SELECT b.version, b.base_version, b.type, b.value, chain.depth + 1
+    FROM blobs b JOIN chain
+      ON b.thread_id = ?1 AND b.checkpoint_ns = ?2 AND b.channel = ?3
+     AND b.version = chain.base_version
+)
+SELECT version, type, value FROM chain ORDER BY depth DESC
+"""
+
+_PRUNE_CHECKPOINTS = """
+DELETE FROM checkpoints WHERE rowid IN (
+    SELECT rowid FROM (
+        SELECT rowid, ROW_NUMBER() OVER (
+            PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+        ) AS rn
+        FROM checkpoints
+    ) WHERE rn > ?
+)
+"""
+
+_PRUNE_WRITES = """
+DELETE FROM writes WHERE NOT EXISTS (
+    SELECT 1 FROM checkpoints c
+    WHERE c.thread_id = writes.thread_id
+      AND c.checkpoint_ns = writes.checkpoint_ns
+      AND c.checkpoint_id = writes.checkpoint_id
+)
+"""
+
+# Channel versions only grow along a thread, so a blob is still needed while
+# it is at or after the snapshot some retained checkpoint's chain starts from.
+_PRUNE_BLOBS = """
+DELETE FROM blobs WHERE NOT EXISTS (
+    SELECT 1 FROM checkpoints c
+    WHERE c.thread_id = blobs.thread_id
+      AND c.checkpoint_ns = blobs.checkpoint_ns
+      AND blobs.version >= c.blob_root
+)
+"""
+
+_ROOT_OF = (
+    "(SELECT root_version FROM blobs WHERE thread_id = ? "
+    "AND checkpoint_ns = ? AND channel = ? AND version = ?)"
+)
+_ROOT_OF_BASE = (
+    "SELECT root_version FROM blobs WHERE thread_id = ?1 "
+    "AND checkpoint_ns = ?2 AND channel = ?3 AND version = ?5"
+)
+
+_INSERT_WRITE = (
+    "INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, "
+    "idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_STOP = object()
+
+
+class DurableSqliteSaver(BaseCheckpointSaver[str]):
+    """SQLite checkpointer tuned for a concurrent API server.
+
+    - The database runs in WAL mode, so readers never block the writer.
+    - Every OS thread gets its own read connection.
+    - All writes go through a single writer thread that group-commits
+      whatever is queued into one transaction. Callers still wait for their
+      own commit, so a returned `put` is durable.
+    - A background job keeps the latest `keep_last` checkpoints per thread,
+      deletes the rest with their writes, and returns freed pages to the OS.
+    - The message list lives in a `blobs` table as deltas (the messages
+      appended since the previous version) with a full snapshot every
+      `snapshot_every` versions, so a step writes O(new messages) rather
+      than the whole history. Reads rebuild it with one recursive query.
+
+    Unlike `langgraph.checkpoint.sqlite.SqliteSaver`, this saver supports
+    both `graph.invoke` and `graph.ainvoke`, and several processes on one host
+    (e.g. `uvicorn --workers 4`) can share the same database file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        keep_last: Optional[int] = 2,
+        compact_interval: Optional[float] = 300.0,
+        max_batch: int = 256,
+        snapshot_every: int = 32,
+        serde=None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.path = path
+        self.keep_last = keep_last
+        self.max_batch = max_batch
+        self._deltas = DeltaTracker(snapshot_every)
+
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = threading.Event()
+
+        setup = self._connect()
+        # auto_vacuum only takes effect if set before the first table exists.
+        setup.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        setup.executescript(_SCHEMA)
+        columns = {row[1] for row in setup.execute("PRAGMA table_info(checkpoints)")}
+        if "blob_root" not in columns:
+            # Oldest blob version a checkpoint depends on; NULL for checkpoints
+            # with every channel inline (including files from before blobs).
+            setup.execute("ALTER TABLE checkpoints ADD COLUMN blob_root TEXT")
+        setup.commit()
+
+        self._writer = threading.Thread(
+            target=self._write_loop, name="sqlite-checkpoint-writer", daemon=True
+        )
+        self._writer.start()
+
+        self._compactor: Optional[threading.Thread] = None
+        if keep_last is not None and compact_interval:
+            self._compactor = threading.Thread(
+                target=self._compact_loop,
+                args=(compact_interval,),
+                name="sqlite-checkpoint-compactor",
+                daemon=True,
+            )
+            self._compactor.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # Set first: other processes sharing the file may hold the write lock.
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is crash-safe in WAL mode and skips an fsync per commit.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    @property
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _submit(self, ops: list[tuple[str, Any]]) -> Future:
+        if self._closed.is_set():
+            raise RuntimeError("DurableSqliteSaver is closed")
+        future: Future = Future()
+        self._queue.put((ops, future))
+        return future
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    self._queue.put(_STOP)
+                    break
+                batch.append(nxt)
+            self._commit_batch(conn, batch)
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: list) -> None:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            results = [self._apply(conn, ops) for ops, _ in batch]
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # Retry one by one so a single bad write does not fail its neighbours.
+            for ops, future in batch:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    result = self._apply(conn, ops)
+                    conn.execute("COMMIT")
+                except Exception as exc:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, ops: list[tuple[str, Any]]) -> int:
+        changed = 0
+        for sql, params in ops:
+            if isinstance(params, list):
+                changed += conn.executemany(sql, params).rowcount
+            else:
+                changed += conn.execute(sql, params).rowcount
+        return changed
+
+    def compact(self) -> int:
+        """Prune superseded checkpoints now. Returns the number of rows deleted."""
+        if self.keep_last is None:
+            return 0
+        deleted = self._submit(
+            [
+                (_PRUNE_CHECKPOINTS, (self.keep_last,)),
+                (_PRUNE_WRITES, ()),
+                (_PRUNE_BLOBS, ()),
+            ]
+        ).result()
+        if deleted:
+            conn = self._reader
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return deleted
+
+    def _compact_loop(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            try:
+                self.compact()
+            except Exception:
+                # Compaction is best effort; the next tick retries.
+                continue
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._queue.put(_STOP)
+        self._writer.join()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    def _row_to_tuple(
+        self, thread_id: str, checkpoint_ns: str, row: tuple
+    ) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata = row
+        checkpoint = self.serde.loads_typed((type_, checkpoint))
+        for channel in DELTA_CHANNELS.intersection(checkpoint["channel_versions"]):
+            if channel not in checkpoint["channel_values"]:
+                self._load_channel(thread_id, checkpoint_ns, checkpoint, channel)
+        writes = self._reader.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=checkpoint,
+            metadata=json.loads(metadata),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((wtype, value)))
+                for task_id, channel, wtype, value in writes
+            ],
+        )
+
+    def _load_channel(
+        self, thread_id: str, checkpoint_ns: str, checkpoint: Checkpoint, channel: str
+    ) -> None:
+        version = checkpoint["channel_versions"][channel]
+        chain = self._reader.execute(
+            _LOAD_CHAIN, (thread_id, checkpoint_ns, channel, version)
+        ).fetchall()
+        if not chain or chain[0][1] == "empty":
+            return
+        _, type_, value = chain[0]
+        value = self.serde.loads_typed((type_, value))
+        if len(chain) > 1:
+            value = apply_deltas(
+                value, [self.serde.loads_typed((t, v)) for _, t, v in chain[1:]]
+            )
+        checkpoint["channel_values"][channel] = value
+        self._deltas.loaded(
+            thread_id, checkpoint_ns, channel, version, value, len(chain) - 1
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata"
+        if checkpoint_id := get_checkpoint_id(config):
+            row = self._reader.execute(
+                f"SELECT {columns} FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            ).fetchone()
+        else:
+            row = self._reader.execute(
+                f"SELECT {columns} FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? "
+                "ORDER BY checkpoint_id DESC LIMIT 1",
+                (thread_id, checkpoint_ns),
+            ).fetchone()
+        if row is None:
+            return None
+        return self._row_to_tuple(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(str(config["configurable"]["thread_id"]))
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._reader.execute(
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            f"type, checkpoint, metadata FROM checkpoints {where} "
+            "ORDER BY checkpoint_id DESC",
+            params,
+        ).fetchall()
+
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and limit <= 0:
+                return
+            if filter:
+                metadata = json.loads(row[4])
+                if not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+            if limit is not None:
+                limit -= 1
+            yield self._row_to_tuple(thread_id, checkpoint_ns, tuple(row))
+
+    def _put_ops(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> tuple[list[tuple[str, Any]], RunnableConfig]:
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values = checkpoint["channel_values"]
+        versions = checkpoint["channel_versions"]
+        blob_channels = sorted(DELTA_CHANNELS.intersection(values).intersection(versions))
+        ops = [
+            self._blob_op(thread_id, checkpoint_ns, channel, versions[channel], values[channel])
+            for channel in blob_channels
+            if channel in new_versions
+            or self._deltas.stored_version(thread_id, checkpoint_ns, channel)
+            != versions[channel]
+        ]
+        if blob_channels:
+            checkpoint = {
+                **checkpoint,
+                "channel_values": {
+                    k: v for k, v in values.items() if k not in blob_channels
+                },
+            }
+        type_, serialized = self.serde.dumps_typed(checkpoint)
+        serialized_metadata = json.dumps(
+            get_checkpoint_metadata(config, metadata), default=str
+        ).encode()
+        # The checkpoint depends on every blob from its chains' snapshots on.
+        roots = [_ROOT_OF] * len(blob_channels)
+        blob_root = (
+            "NULL" if not roots else roots[0] if len(roots) == 1 else f"min({', '.join(roots)})"
+        )
+        ops.append(
+            (
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, "
+                "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata, "
+                f"blob_root) VALUES (?, ?, ?, ?, ?, ?, ?, {blob_root})",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    serialized,
+                    serialized_metadata,
+                    *(
+                        p
+                        for channel in blob_channels
+                        for p in (thread_id, checkpoint_ns, channel, versions[channel])
+                    ),
+                ),
+            )
+        )
+        next_config = {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+        return ops, next_config
+
+    def _blob_op(
+        self, thread_id: str, checkpoint_ns: str, channel: str, version: str, value: Any
+    ) -> tuple[str, Any]:
+        delta = self._deltas.encode(thread_id, checkpoint_ns, channel, version, value)
+        type_, payload = self.serde.dumps_typed(delta.payload)
+        if delta.base is None:
+            # OR IGNORE: an existing row for this version (say, a delta written
+            # by another worker) already holds the same value.
+            return (
+                "INSERT OR IGNORE INTO blobs (thread_id, checkpoint_ns, channel, "
+                "version, base_version, root_version, type, value) "
+                "VALUES (?1, ?2, ?3, ?4, NULL, ?4, ?5, ?6)",
+                (thread_id, checkpoint_ns, channel, version, type_, payload),
+            )
+        return (
+            "INSERT OR REPLACE INTO blobs (thread_id, checkpoint_ns, channel, "
+            "version, base_version, root_version, type, value) "
+            f"VALUES (?1, ?2, ?3, ?4, ?5, ({_ROOT_OF_BASE}), ?6, ?7)",
+            (thread_id, checkpoint_ns, channel, version, delta.base, type_, payload),
+        )
+
+    def _put_writes_ops(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str,
+    ) -> list[tuple[str, Any]]:
+        verb = (
+            "INSERT OR REPLACE"
+            if all(w[0] in WRITES_IDX_MAP for w in writes)
+            else "INSERT OR IGNORE"
+        )
+        rows = [
+            (
+                str(config["configurable"]["thread_id"]),
+                str(config["configurable"].get("checkpoint_ns", "")),
+                str(config["configurable"]["checkpoint_id"]),
+                task_id,
+                task_path,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value),
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        return [(f"{verb} {_INSERT_WRITE}", rows)]
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        ops, next_config = self._put_ops(config, checkpoint, metadata, new_versions)
+        self._submit(ops).result()
+        return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self._submit(self._put_writes_ops(config, writes, task_id, task_path)).result()
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._submit(
+            [
+                ("DELETE FROM checkpoints WHERE thread_id = ?", (str(thread_id),)),
+                ("DELETE FROM writes WHERE thread_id = ?", (str(thread_id),)),
+                ("DELETE FROM blobs WHERE thread_id = ?", (str(thread_id),)),
+            ]
+        ).result()
+        self._deltas.forget(str(thread_id))
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        ops, next_config = self._put_ops(config, checkpoint, metadata, new_versions)
+        await asyncio.wrap_future(self._submit(ops))
+        return next_config
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.wrap_future(
+            self._submit(self._put_writes_ops(config, writes, task_id, task_path))
+        )
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        next_v = current_v + 1
+        next_h = random.random()
+        return f"{next_v:032}.{next_h:016}"
@@ -1,6 +1,292 @@
+"""Deployment settings, loaded once per process.
+
+`get_settings()` reads `.env` (without overriding variables already set),
+then the optional TOML file named by `LANGGRAPH_CB_SETTINGS_FILE`, then the
+environment; later sources win. File keys are the field names below, with
+the HTTP client options in an `[http]` table:
+
+    model = "openai"
+    checkpointer = "sqlite"
+    max_concurrency = 200
+
+    [http]
+    max_keepalive_connections = 50
+
+Each field's environment variable is listed next to it. Invalid values
+raise `ValueError` naming the variable, at startup rather than mid-request.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import os
+from dataclasses import dataclass, field
+from typing import Any, Optional, get_type_hints
+
 from dotenv import load_dotenv
 
+TOOLS = ("get_stock_price", "get_stock_prices", "prepare_buy")
+QUOTE_SYMBOLS = ("MSFT", "AAPL", "AMZN", "RIL")
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off")
+
 
 def load_env() -> None:
     """Load environment variables from a .env file if present."""
     load_dotenv()
+
+
+def _env(name: str, default: Any) -> Any:
+    return field(default=default, metadata={"env": name})
+
+
+def _coerce(hint: Any, value: Any, source: str) -> Any:
+    optional = hint in (Optional[int], Optional[float], Optional[str])
+    if optional:
+        if value is None or value == "":
+            return None
+        hint = hint.__args__[0]
+    try:
+        if hint is bool:
+            if isinstance(value, bool):
+                return value
+            text = str(value).strip().lower()
+            if text in _TRUE or text in _FALSE:
+                return text in _TRUE
+            raise ValueError
+        if hint is int:
+            if isinstance(value, float) or isinstance(value, bool):
+                raise ValueError
+            return int(value)
+        if hint is float:
+            return float(value)
+        if hint is str:
+            return str(value)
+        if hint == tuple[str, ...]:
+            items = value.split(",") if isinstance(value, str) else value
+            return tuple(str(item).strip() for item in items if str(item).strip())
+    except (TypeError, ValueError):
+        pass
+    else:
+        raise TypeError(f"Unsupported settings type: {hint!r}")
+    raise ValueError(f"{source}: expected {getattr(hint, '__name__', hint)}, got {value!r}")
+
+
+def _load(cls, values: dict[str, Any]):
+    """Build `cls` from file `values` overridden by its fields' variables."""
+    hints = get_type_hints(cls)
+    unknown = set(values) - {f.name for f in dataclasses.fields(cls)}
+    if unknown:
+        raise ValueError(f"Unknown {cls.__name__} keys: {', '.join(sorted(unknown))}")
+    kwargs = {}
+    for f in dataclasses.fields(cls):
+        env = f.metadata.get("env")
+        if env is not None and os.getenv(env) is not None:
+            kwargs[f.name] = _coerce(hints[f.name], os.environ[env], env)
+        elif f.name in values:
+            kwargs[f.name] = _coerce(hints[f.name], values[f.name], f.name)
+    return cls(**kwargs)
+
+
+def _check(condition: bool, message: str) -> None:
+    if not condition:
+        raise ValueError(message)
+
+
+@dataclass(frozen=True)
+class HttpClientConfig:
+    """Connection pool, timeout and retry settings for the OpenAI HTTP clients.
+
+    Timeouts are in seconds. Retries cover connection errors and 408/409/429/5xx
+    responses, waiting a random time up to `backoff_base * 2**attempt` (capped
+    at `backoff_max`), or the server's `Retry-After` when it is shorter.
+    """
+
+    max_connections: int = _env("LANGGRAPH_CB_HTTP_MAX_CONNECTIONS", 100)
+    max_keepalive_connections: int = _env("LANGGRAPH_CB_HTTP_MAX_KEEPALIVE", 20)
+    keepalive_expiry: float = _env("LANGGRAPH_CB_HTTP_KEEPALIVE_EXPIRY", 60.0)
+    http2: bool = _env("LANGGRAPH_CB_HTTP2", False)
+    connect_timeout: float = _env("LANGGRAPH_CB_HTTP_CONNECT_TIMEOUT", 5.0)
+    read_timeout: float = _env("LANGGRAPH_CB_HTTP_READ_TIMEOUT", 60.0)
+    write_timeout: float = _env("LANGGRAPH_CB_HTTP_WRITE_TIMEOUT", 10.0)
+    pool_timeout: float = _env("LANGGRAPH_CB_HTTP_POOL_TIMEOUT", 10.0)
+    max_retries: int = _env("LANGGRAPH_CB_HTTP_MAX_RETRIES", 2)
+    backoff_base: float = _env("LANGGRAPH_CB_HTTP_BACKOFF_BASE", 0.5)
+    backoff_max: float = _env("LANGGRAPH_CB_HTTP_BACKOFF_MAX", 8.0)
+
+    def __post_init__(self) -> None:
+        _check(self.max_connections >= 1, "http.max_connections must be at least 1")
+        _check(
+            0 <= self.max_keepalive_connections <= self.max_connections,
+            "http.max_keepalive_connections must be between 0 and max_connections",
+        )
+        _check(self.max_retries >= 0, "http.max_retries must not be negative")
+        for name in ("connect_timeout", "read_timeout", "write_timeout", "pool_timeout"):
+            _check(getattr(self, name) > 0, f"http.{name} must be positive")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Everything a deployment tunes: model, storage, cache, limits, timeouts."""
+
+    # Chat model: `openai` or the offline `fake` model.
+    model: str = _env("LANGGRAPH_CB_MODEL", "openai")
+    openai_model: str = _env("LANGGRAPH_CB_OPENAI_MODEL", "gpt-4o-mini")
+    temperature: float = _env("LANGGRAPH_CB_TEMPERATURE", 0.0)
+    fake_latency_ms: float = _env("LANGGRAPH_CB_FAKE_LATENCY_MS", 0.0)
+    fake_latency_sigma: float = _env("LANGGRAPH_CB_FAKE_LATENCY_SIGMA", 0.0)
+    tools: tuple[str, ...] = _env("LANGGRAPH_CB_TOOLS", TOOLS)
+    # Token budget before old turns are summarized; 0 disables.
+    context_tokens: int = _env("LANGGRAPH_CB_CONTEXT_TOKENS", 8000)
+    tool_max_parallel: int = _env("LANGGRAPH_CB_TOOL_MAX_PARALLEL", 8)
+    # Seconds per async tool call (sync tools bound their own I/O); 0 disables.
+    tool_timeout: float = _env("LANGGRAPH_CB_TOOL_TIMEOUT", 10.0)
+
+    # Price source: `static` (built-in table), `alphavantage` (polled in the
+    # background every quote_interval seconds; needs ALPHAVANTAGE_API_KEY) or
+    # `replay` (a tick file written by `market_data.write_tick_file`). Quotes
+    # older than quote_max_age seconds are stale; trades on them are refused
+    # when reject_stale_trades is set.
+    quotes: str = _env("LANGGRAPH_CB_QUOTES", "static")
+    quote_symbols: tuple[str, ...] = _env("LANGGRAPH_CB_QUOTE_SYMBOLS", QUOTE_SYMBOLS)
+    quote_interval: float = _env("LANGGRAPH_CB_QUOTE_INTERVAL", 5.0)
+    quote_tick_file: str = _env("LANGGRAPH_CB_QUOTE_TICK_FILE", "")
+    quote_replay_speed: float = _env("LANGGRAPH_CB_QUOTE_REPLAY_SPEED", 1.0)
+    quote_max_age: float = _env("LANGGRAPH_CB_QUOTE_MAX_AGE", 60.0)
+    reject_stale_trades: bool = _env("LANGGRAPH_CB_REJECT_STALE_TRADES", False)
+
+    # Storage. An empty checkpointer picks `sqlite` when several workers run.
+    web_concurrency: int = _env("WEB_CONCURRENCY", 1)
+    checkpointer: str = _env("LANGGRAPH_CB_CHECKPOINTER", "")
+    sqlite_path: str = _env("LANGGRAPH_CB_SQLITE_PATH", "data/checkpoints.db")
+    snapshot_every: int = _env("LANGGRAPH_CB_SNAPSHOT_EVERY", 32)
+    # Empty follows the checkpointer.
+    approvals: str = _env("LANGGRAPH_CB_APPROVALS", "")
+    approvals_path: str = _env("LANGGRAPH_CB_APPROVALS_PATH", "data/approvals.db")
+    approval_ttl: float = _env("LANGGRAPH_CB_APPROVAL_TTL", 900.0)
+
+    # LLM response cache: `off`, `memory` or `disk`. Unset size/TTL keep the
+    # cache's own defaults; a TTL of 0 means entries never expire.
+    llm_cache: str = _env("LANGGRAPH_CB_LLM_CACHE", "off")
+    llm_cache_size: Optional[int] = _env("LANGGRAPH_CB_LLM_CACHE_SIZE", None)
+    llm_cache_ttl: Optional[float] = _env("LANGGRAPH_CB_LLM_CACHE_TTL", None)
+    llm_cache_path: str = _env("LANGGRAPH_CB_LLM_CACHE_PATH", "data/llm_cache.db")
+    # Semantic answer cache for standalone knowledge questions: `off` or
+    # `memory`. Served when a cached question scores at least the threshold.
+    answer_cache: str = _env("LANGGRAPH_CB_ANSWER_CACHE", "off")
+    answer_cache_size: int = _env("LANGGRAPH_CB_ANSWER_CACHE_SIZE", 10_000)
+    answer_cache_threshold: float = _env("LANGGRAPH_CB_ANSWER_CACHE_THRESHOLD", 0.8)
+    # Seconds; 0 means entries never expire.
+    answer_cache_ttl: float = _env("LANGGRAPH_CB_ANSWER_CACHE_TTL", 86_400.0)
+
+    # API limits per worker.
+    max_concurrency: int = _env("LANGGRAPH_CB_MAX_CONCURRENCY", 1000)
+    # Of those, slots new chats may not use, kept for approvals (unset: 5%, at
+    # most 50; see `approval_slots`); and how many chats may wait for a slot
+    # before the rest get 503 with Retry-After.
+    approval_reserved: Optional[int] = _env("LANGGRAPH_CB_APPROVAL_RESERVED", None)
+    chat_max_waiting: int = _env("LANGGRAPH_CB_CHAT_MAX_WAITING", 1000)
+    batch_max_items: int = _env("LANGGRAPH_CB_BATCH_MAX_ITEMS", 1000)
+    batch_concurrency: int = _env("LANGGRAPH_CB_BATCH_CONCURRENCY", 32)
+    # Runs queued behind the one in progress on a thread before we answer 429.
+    thread_max_waiting: int = _env("LANGGRAPH_CB_THREAD_MAX_WAITING", 4)
+
+    metrics: bool = _env("LANGGRAPH_CB_METRICS", True)
+    http: HttpClientConfig = field(default_factory=HttpClientConfig)
+
+    def __post_init__(self) -> None:
+        _check(self.model.lower() in ("openai", "fake"), f"Unknown model: {self.model!r}")
+        unknown = set(self.tools) - set(TOOLS)
+        _check(not unknown, f"Unknown tools: {', '.join(sorted(unknown))}")
+        for name in ("checkpointer", "approvals"):
+            value = getattr(self, name)
+            _check(value.lower() in ("", "memory", "sqlite"), f"Unknown {name} backend: {value!r}")
+        _check(
+            self.llm_cache.lower() in ("off", "memory", "disk"),
+            f"Unknown LLM cache backend: {self.llm_cache!r}",
+        )
+        _check(
+            self.answer_cache.lower() in ("off", "memory"),
+            f"Unknown answer cache backend: {self.answer_cache!r}",
+        )
+        _check(
+            self.quotes.lower() in ("static", "alphavantage", "replay"),
+            f"Unknown quote source: {self.quotes!r}",
+        )
+        _check(
+            self.quotes.lower() != "replay" or bool(self.quote_tick_file),
+            "quote_tick_file is required for quotes = 'replay'",
+        )
+        for name in ("quote_interval", "quote_max_age", "quote_replay_speed"):
+            _check(getattr(self, name) > 0, f"{name} must be positive")
+        _check(
+            0 < self.answer_cache_threshold <= 1,
+            "answer_cache_threshold must be in (0, 1]",
+        )
+        for name in (
+            "web_concurrency",
+            "snapshot_every",
+            "tool_max_parallel",
+            "max_concurrency",
+            "batch_max_items",
+            "batch_concurrency",
+            "answer_cache_size",
+        ):
+            _check(getattr(self, name) >= 1, f"{name} must be at least 1")
+        for name in (
+            "context_tokens",
+            "tool_timeout",
+            "approval_ttl",
+            "answer_cache_ttl",
+            "thread_max_waiting",
+            "chat_max_waiting",
+        ):
+            _check(getattr(self, name) >= 0, f"{name} must not be negative")
+        _check(
+            self.approval_reserved is None
+            or 0 <= self.approval_reserved < self.max_concurrency,
+            "approval_reserved must be at least 0 and less than max_concurrency",
+        )
+        _check(
+            self.llm_cache_size is None or self.llm_cache_size >= 1,
+            "llm_cache_size must be at least 1",
+        )
+
+    @property
+    def checkpointer_backend(self) -> str:
+        """The checkpointer to build: in-process state cannot be shared between
+        uvicorn workers, so `sqlite` is the default for more than one."""
+        return self.checkpointer or ("sqlite" if self.web_concurrency > 1 else "memory")
+
+    @property
+    def approvals_backend(self) -> str:
+        return self.approvals or self.checkpointer_backend
+
+    @property
+    def approval_slots(self) -> int:
+        """Slots kept for approvals: `approval_reserved`, or by default 5% of
+        `max_concurrency` capped at 50, so small limits stay valid."""
+        if self.approval_reserved is not None:
+            return self.approval_reserved
+        return min(50, self.max_concurrency // 20)
+
+    @classmethod
+    def load(cls, path: str | None = None) -> Settings:
+        """Settings from the TOML file at `path` (if any) and the environment."""
+        values: dict[str, Any] = {}
+        if path:
+            import tomllib
+
+            with open(path, "rb") as f:
+                values = tomllib.load(f)
+        http = values.pop("http", {})
+        settings = _load(cls, values)
+        return dataclasses.replace(settings, http=_load(HttpClientConfig, http))
+
+
+@functools.lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """The process-wide settings, read on first use and cached afterwards."""
+    load_env()
+    return Settings.load(os.getenv("LANGGRAPH_CB_SETTINGS_FILE"))
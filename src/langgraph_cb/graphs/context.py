@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and a "
+    "stock trading assistant. Update the summary with the new messages below. "
+    "Keep symbols, quantities, prices and decisions; drop small talk. "
+    "Reply with the updated summary only."
+)
+
+
+def with_summary(messages: list[BaseMessage], summary: str | None) -> list[BaseMessage]:
+    """Prompt for the chatbot: the rolling summary (if any) followed by recent turns."""
+    if not summary:
+        return messages
+    return [SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"), *messages]
+
+
+def _split_point(messages: list[BaseMessage], target_tokens: int) -> int:
+    """Index of the oldest human turn whose tail fits in `target_tokens`.
+
+    Cutting only at human messages keeps AI tool calls together with their
+    tool results. The latest human turn is always kept.
+    """
+    turn_starts = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+    if not turn_starts:
+        return 0
+    tail_tokens = 0
+    split = turn_starts[-1]
+    end = len(messages)
+    for start in reversed(turn_starts):
+        tail_tokens += count_tokens_approximately(messages[start:end])
+        if tail_tokens > target_tokens and start != turn_starts[-1]:
+            break
+        split, end = start, start
+    return split
+
+
+class ContextManager:
+    """Graph node that keeps the prompt within a token budget.
+
+    When the messages exceed `max_tokens`, the oldest turns are removed from
+    state (shrinking checkpoints too) until the rest fits in `target_tokens`,
+    and folded into a summary stored in `state["summary"]`. Each update only
+    summarizes the newly dropped turns on top of the previous summary, so the
+    cost does not grow with conversation length.
+    """
+
+    def __init__(self, llm, max_tokens: int = 8000, target_tokens: int | None = None):
+        self.llm = llm
+        self.max_tokens = max_tokens
+        self.target_tokens = target_tokens if target_tokens is not None else max_tokens // 2
+
+    def _plan(self, state) -> tuple[list[BaseMessage], list[BaseMessage]] | None:
+        messages = state["messages"]
+        if count_tokens_approximately(messages) <= self.max_tokens:
+            return None
+        split = _split_point(messages, self.target_tokens)
+        if split == 0:
+            return None
+        dropped = messages[:split]
+        request = [
+            SystemMessage(content=SUMMARY_PROMPT),
+            HumanMessage(
+                content=(
+                    f"Current summary:\n{state.get('summary') or '(none)'}\n\n"
+                    "New messages:\n"
+                    + "\n".join(f"{m.type}: {m.content}" for m in dropped if m.content)
+                )
+            ),
+        ]
+        return dropped, request
+
+    @staticmethod
+    def _update(dropped: list[BaseMessage], summary) -> dict:
+        return {
+            "messages": [RemoveMessage(id=m.id) for m in dropped],
+            "summary": str(summary.content),
+        }
+
+    def __call__(self, state) -> dict:
+        plan = self._plan(state)
+        if plan is None:
+            return {}
+        dropped, request = plan
+        return self._update(dropped, self.llm.invoke(request))
+
+    async def acall(self, state) -> dict:
+        plan = self._plan(state)
+        if plan is None:
+            return {}
+        dropped, request = plan
+        return self._update(dropped, await self.llm.ainvoke(request))
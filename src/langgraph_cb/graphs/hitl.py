@@ -1,127 +1,208 @@
 from __future__ import annotations
 
-from typing import Annotated
-import re
-from typing_extensions import TypedDict
+from typing import TYPE_CHECKING, Annotated
+from typing_extensions import NotRequired, TypedDict
 
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
-from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode, tools_condition
 from langgraph.types import Command, interrupt
 
-from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
-from langchain_openai import ChatOpenAI
-
-from langgraph_cb.config import load_env
-from langgraph_cb.tools.stocks import get_stock_price, prepare_buy
+from langchain_core.caches import BaseCache
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from langgraph_cb.config import Settings, get_settings
+from langgraph_cb.graphs.context import ContextManager, with_summary
+from langgraph_cb.graphs.intents import IntentRouter, stock_rules
+from langgraph_cb.graphs.messages import add_normalized_messages, opening_question
+from langgraph_cb.metrics import metrics
+from langgraph_cb.models import ModelFactory, build_model_factory
+from langgraph_cb.tools.execution import ToolCallLimiter
+from langgraph_cb.tools.stocks import (
+    get_stock_price,
+    get_stock_prices,
+    prepare_buy,
+    stale_quote,
+)
+from langgraph_cb.tools.trades import TradeRequest, store_trade
+
+if TYPE_CHECKING:
+    from langgraph_cb.cache.semantic import SemanticAnswerCache
 
 
 class State(TypedDict):
-    messages: Annotated[list, add_messages]
-
-
-def build_graph():
-    load_env()
-
-    tools = [get_stock_price, prepare_buy]
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0,
-    )
+    messages: Annotated[list, add_normalized_messages]
+    summary: NotRequired[str]
+    # Buy awaiting approval, as `TradeRequest.compact()`; cleared once decided.
+    # Typed as `tuple` so the channel starts empty and every write is reduced.
+    trade: NotRequired[Annotated[tuple, store_trade]]
+
+
+def route_from_chatbot(state: State) -> str:
+    """Next node after the chatbot: two field checks, independent of thread length.
+
+    `trade` is set here only by this turn's fast-path buy; the chatbot clears
+    any earlier, undecided one.
+    """
+    if state.get("trade"):
+        return "approval"
+    last = state["messages"][-1]
+    if last.type == "ai" and last.tool_calls:
+        return "tools"
+    return END
+
+
+_TOOLS = {tool.name: tool for tool in (get_stock_price, get_stock_prices, prepare_buy)}
+
+
+def build_graph(
+    checkpointer: BaseCheckpointSaver | None = None,
+    llm_cache: BaseCache | None = None,
+    tool_limiter: ToolCallLimiter | None = None,
+    context_tokens: int | None = None,
+    model_factory: ModelFactory | None = None,
+    intent_router: IntentRouter | None = None,
+    settings: Settings | None = None,
+    answer_cache: SemanticAnswerCache | None = None,
+):
+    """Compile the HITL graph.
+
+    The model, tools, context budget and tool limits come from `settings`
+    (`get_settings()` by default) unless passed; `context_tokens=0` disables
+    summarizing. `answer_cache` serves repeated knowledge questions and
+    stores the model's direct answers to them.
+    """
+    # Deferred so importing this module (e.g. for `State`) stays cheap.
+    from langgraph.prebuilt import ToolNode
+
+    from langgraph_cb.checkpoint.memory import BoundedMemorySaver
+
+    settings = settings or get_settings()
+    if context_tokens is None:
+        context_tokens = settings.context_tokens
+    if model_factory is None:
+        model_factory = build_model_factory(settings=settings)
+
+    tools = [_TOOLS[name] for name in settings.tools]
+    llm = model_factory(llm_cache)
     llm_with_tools = llm.bind_tools(tools)
 
-    def _parse_buy_intent(text: str) -> tuple[int, str] | None:
-        match = re.search(r"\bbuy\s+(\d+)\s+([a-zA-Z]{1,10})\b", text, re.IGNORECASE)
-        if not match:
-            return None
-        quantity = int(match.group(1))
-        symbol = match.group(2).upper()
-        return quantity, symbol
+    router = intent_router if intent_router is not None else IntentRouter(stock_rules())
 
-    def chatbot_node(state: State):
+    def _question(state: State) -> str | None:
         last = state["messages"][-1]
-        if isinstance(last, HumanMessage):
-            parsed = _parse_buy_intent(last.content)
-            if parsed:
-                quantity, symbol = parsed
-                price = get_stock_price.invoke(symbol)
-                total_price = price * quantity
-                tool_content = prepare_buy.invoke(
-                    {
-                        "symbol": symbol,
-                        "quantity": quantity,
-                        "total_price": total_price,
-                    }
-                )
-                return {
-                    "messages": [
-                        {
-                            "role": "tool",
-                            "content": tool_content,
-                            "tool_call_id": "manual_prepare_buy",
-                        }
-                    ]
-                }
-
-        response = llm_with_tools.invoke(state["messages"])
-        return {"messages": [response]}
-
-    def _is_tool_message(msg) -> bool:
-        if isinstance(msg, ToolMessage) or getattr(msg, "type", None) == "tool":
-            return True
-        if isinstance(msg, dict):
-            return msg.get("role") == "tool"
-        return False
-
-    def _get_content(msg) -> str:
-        if isinstance(msg, dict):
-            return str(msg.get("content", ""))
-        return str(getattr(msg, "content", ""))
-
-    def approval_node(state: State):
-        last_message = state["messages"][-1]
-        content = _get_content(last_message)
+        if last.type == "human" and isinstance(last.content, str):
+            return last.content
+        return None
+
+    def _standalone(state: State) -> str | None:
+        # The answer cache is shared by all threads and keyed on the question
+        # alone: only a thread's opening question may be served or stored.
+        return opening_question(state["messages"], state.get("summary"))
+
+    def _fast_path(state: State) -> dict | None:
+        question = _question(state)
+        routed = router.route(question) if question is not None else None
+        if routed is None and answer_cache is not None:
+            standalone = _standalone(state)
+            answer = answer_cache.lookup(standalone) if standalone is not None else None
+            if answer is not None:
+                routed = ("answer_cache", {"messages": [AIMessage(content=answer)]})
+        if metrics.enabled:
+            metrics.chatbot_routes.inc(route=routed[0] if routed else "llm")
+        return routed[1] if routed else None
+
+    def _remember(state: State, response) -> None:
+        # Only answers the model gave straight from the question, not ones
+        # built on tool results, which may carry live data.
+        if answer_cache is None:
+            return
+        question = _standalone(state)
+        if (
+            question is not None
+            and not response.tool_calls
+            and isinstance(response.content, str)
+            and response.content
+        ):
+            answer_cache.update(question, response.content)
+
+    def _new_turn(state: State, update: dict) -> dict:
+        # A trade still in state here was never decided: the user moved on
+        # instead of resuming the interrupt. Drop it so this turn is not sent
+        # back to approval, unless the turn proposes a trade of its own.
+        if state.get("trade") and "trade" not in update:
+            update["trade"] = None
+        return update
 
-        if _is_tool_message(last_message) and content.startswith("REQUEST_BUY::"):
-            _, symbol, quantity, total_price = content.split("::")
+    def chatbot_node(state: State):
+        update = _fast_path(state)
+        if update is not None:
+            return _new_turn(state, update)
+
+        response = llm_with_tools.invoke(
+            with_summary(state["messages"], state.get("summary"))
+        )
+        _remember(state, response)
+        return _new_turn(state, {"messages": [response]})
+
+    async def achatbot_node(state: State):
+        update = _fast_path(state)
+        if update is not None:
+            return _new_turn(state, update)
+
+        response = await llm_with_tools.ainvoke(
+            with_summary(state["messages"], state.get("summary"))
+        )
+        _remember(state, response)
+        return _new_turn(state, {"messages": [response]})
 
-            decision = interrupt(
-                f"Approve buying {quantity} {symbol} stocks for ${float(total_price):.2f}?"
+    def approval_node(state: State):
+        trade = TradeRequest.from_compact(state.get("trade"))
+        if trade is None:
+            return {}
+
+        decision = interrupt(
+            f"Approve buying {trade.quantity} {trade.symbol} stocks "
+            f"for ${trade.total_price:.2f}?"
+        )
+
+        refused = stale_quote(trade.symbol) if decision == "yes" else None
+        if refused is not None:
+            # Priced when prepared; the quote may have gone stale while waiting.
+            reply = refused
+        elif decision == "yes":
+            reply = (
+                f"Approved: Bought {trade.quantity} shares of {trade.symbol} "
+                f"for ${trade.total_price}"
             )
+        elif decision == "expired":
+            reply = "Trade request expired."
+        else:
+            reply = "Trade declined by human."
+        return {"messages": [AIMessage(content=reply)], "trade": None}
 
-            if decision == "yes":
-                return {
-                    "messages": [
-                        AIMessage(
-                            content=(
-                                f"Approved: Bought {quantity} shares of {symbol} "
-                                f"for ${total_price}"
-                            )
-                        )
-                    ]
-                }
-
-            return {"messages": [AIMessage(content="Trade declined by human.")]}
-
-        return {}
-
-    memory = MemorySaver()
+    memory = checkpointer if checkpointer is not None else BoundedMemorySaver()
     builder = StateGraph(State)
 
-    builder.add_node("chatbot", chatbot_node)
-    builder.add_node("tools", ToolNode(tools))
+    # Sync and async variants so both graph.invoke and graph.ainvoke stay native.
+    builder.add_node("chatbot", RunnableLambda(chatbot_node, afunc=achatbot_node))
+    # Tool calls from one AI message run concurrently, bounded and time-limited.
+    limiter = tool_limiter if tool_limiter is not None else ToolCallLimiter(
+        settings.tool_max_parallel, settings.tool_timeout or None
+    )
+    builder.add_node(
+        "tools",
+        ToolNode(tools, wrap_tool_call=limiter.wrap, awrap_tool_call=limiter.awrap),
+    )
     builder.add_node("approval", approval_node)
 
-    builder.add_edge(START, "chatbot")
-    def route_from_chatbot(state: State):
-        last = state["messages"][-1]
-        content = _get_content(last)
-        if _is_tool_message(last) and content.startswith("REQUEST_BUY::"):
-            return "approval"
-        if isinstance(last, AIMessage) and getattr(last, "tool_calls", None):
-            return "tools"
-        return END
+    if context_tokens:
+        context = ContextManager(llm, max_tokens=context_tokens)
+        builder.add_node("context", RunnableLambda(context, afunc=context.acall))
+        builder.add_edge(START, "context")
+        builder.add_edge("context", "chatbot")
+    else:
+        builder.add_edge(START, "chatbot")
 
     builder.add_conditional_edges("chatbot", route_from_chatbot)
     builder.add_edge("tools", "approval")
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import re
+from typing import Callable, NamedTuple, Optional
+
+from langchain_core.messages import AIMessage
+
+from langgraph_cb.tools.stocks import get_stock_prices, stale_quote
+from langgraph_cb.tools.trades import TradeRequest
+
+# Tickers are matched case-sensitively even inside case-insensitive patterns,
+# so ordinary words ("the", "stock") are never mistaken for symbols.
+_TICKER = r"(?-i:[A-Z]{1,5})"
+_ITEM = rf"(?:\d+\s+)?{_TICKER}(?:\s+(?:stocks?|shares))?"
+_ITEMS = rf"{_ITEM}(?:\s*(?:,|and|&)\s*{_ITEM})*"
+
+BUY_PATTERN = (
+    r"(?:please\s+)?buy\s+(?P<quantity>\d+)\s+(?:shares\s+of\s+)?"
+    r"(?P<symbol>[a-z]{1,10})(?:\s+(?:stocks?|shares))?"
+    r"(?:\s+(?:at|using)\s+(?:the\s+)?current\s+price)?"
+)
+PRICE_PATTERNS = (
+    rf"(?:(?:what\s+is|what's|tell\s+me|get)\s+)?(?:the\s+)?(?:current\s+)?"
+    rf"price\s+of\s+(?P<items>{_ITEMS})",
+    rf"(?:what\s+is|what's|where\s+is)\s+(?P<items>{_TICKER})\s+(?:trading\s+)?at",
+    rf"(?P<items>{_TICKER})\s+(?:stock\s+)?price",
+)
+
+_ITEM_PARTS = re.compile(rf"(?:(\d+)\s+)?({_TICKER})\b")
+_NAMED_GROUP = re.compile(r"\(\?P<\w+>")
+_TRAILING = ".?! \t\n"
+
+Handler = Callable[[re.Match], Optional[dict]]
+
+
+class Rule(NamedTuple):
+    """A full-message pattern and the handler producing the graph update."""
+
+    name: str
+    pattern: str
+    handler: Handler
+
+
+class IntentRouter:
+    """Answer well-formed requests without calling the model.
+
+    All rule patterns are compiled into one alternation, so a message that
+    matches no rule (the common case, handed to the LLM) costs one regex scan
+    regardless of how many rules are registered. Patterns must match the whole
+    message (ignoring case and trailing punctuation).
+    """
+
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+        self._compiled = [re.compile(rule.pattern, re.IGNORECASE) for rule in rules]
+        # Rules may reuse group names, so the alternation drops inner names and
+        # tags each branch instead; the winning rule re-matches for its groups.
+        self._any = re.compile(
+            "|".join(
+                f"(?P<r{i}>{_NAMED_GROUP.sub('(?:', rule.pattern)})"
+                for i, rule in enumerate(rules)
+            ),
+            re.IGNORECASE,
+        )
+
+    def route(self, text: str) -> tuple[str, dict] | None:
+        text = text.strip().rstrip(_TRAILING)
+        match = self._any.fullmatch(text)
+        if match is None:
+            return None
+        index = int(match.lastgroup[1:])
+        rule = self.rules[index]
+        update = rule.handler(self._compiled[index].fullmatch(text))
+        return (rule.name, update) if update is not None else None
+
+
+def _buy(match: re.Match) -> dict | None:
+    quantity = int(match.group("quantity"))
+    symbol = match.group("symbol").upper()
+    price = get_stock_prices.invoke({"symbols": [symbol]})[symbol]
+    if not price:
+        # Unknown symbol ("buy 5 foo"): no $0.00 trade, the model answers.
+        return None
+    refused = stale_quote(symbol)
+    if refused is not None:
+        return {"messages": [AIMessage(content=refused)]}
+    trade = TradeRequest(symbol, quantity, price * quantity)
+    # The trade travels in state; the approval node adds the reply, so no
+    # synthetic tool messages are needed in the transcript.
+    return {"trade": trade}
+
+
+def _price(match: re.Match) -> dict | None:
+    items = [
+        (int(quantity) if quantity else None, symbol)
+        for quantity, symbol in _ITEM_PARTS.findall(match.group("items"))
+    ]
+    prices = get_stock_prices.invoke({"symbols": [symbol for _, symbol in items]})
+    if not all(prices[symbol] for _, symbol in items):
+        # Unknown symbol: let the model explain instead of quoting $0.00.
+        return None
+    lines = []
+    for quantity, symbol in items:
+        price = prices[symbol]
+        if quantity:
+            total = price * quantity
+            lines.append(f"{quantity} {symbol} stocks cost ${total:.2f} (${price:.2f} each).")
+        else:
+            lines.append(f"The current price of {symbol} is ${price:.2f}.")
+    return {"messages": [AIMessage(content=" ".join(lines))]}
+
+
+def price_rules() -> list[Rule]:
+    """Price lookups only, for graphs without an approval step."""
+    return [Rule("price", pattern, _price) for pattern in PRICE_PATTERNS]
+
+
+def stock_rules() -> list[Rule]:
+    """Default rules: single buys (sent to approval) and price lookups."""
+    return [Rule("buy", BUY_PATTERN, _buy), *price_rules()]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import uuid
+from typing import Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, RemoveMessage
+from langchain_core.messages.utils import convert_to_messages
+from langgraph.graph.message import add_messages
+
+
+def _flatten(content):
+    """Text-only content blocks as one string; anything else is left as is."""
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(block.get("text", ""))
+        else:
+            return content
+    return "".join(parts)
+
+
+def normalize_message(message: BaseMessage) -> BaseMessage:
+    """Canonical form of a message entering graph state.
+
+    Text content is a plain `str`, and AI messages drop provider
+    `response_metadata` (model name, finish reason, raw token counts), which
+    nothing reads back from state but every checkpoint would otherwise carry.
+    Token usage stays available in `usage_metadata`.
+    """
+    update = {}
+    content = _flatten(message.content)
+    if content is not message.content:
+        update["content"] = content
+    if isinstance(message, AIMessage) and message.response_metadata:
+        update["response_metadata"] = {}
+    return message.model_copy(update=update) if update else message
+
+
+def add_normalized_messages(left, right):
+    """`add_messages` reducer that normalizes each incoming message once.
+
+    Dicts, tuples and strings written by nodes or API callers become
+    `BaseMessage` objects here, so nodes, routers and the API can rely on
+    attribute access (`message.type`, `message.content`) without checking for
+    other shapes.
+    """
+    if not isinstance(right, list):
+        right = [right]
+    right = [
+        m if isinstance(m, RemoveMessage) else normalize_message(m)
+        for m in convert_to_messages(right)
+    ]
+    return add_messages(left, right)
+
+
+def append_messages(left, right):
+    """Append-only message reducer: cost grows with the update, not the thread.
+
+    Incoming messages are normalized and given ids as in
+    `add_normalized_messages`, then appended; existing messages are never
+    re-converted, indexed by id or replaced, so nodes must return only their
+    new messages. An update containing a `RemoveMessage` (context trimming)
+    falls back to the full `add_messages` merge.
+    """
+    if not isinstance(right, list):
+        right = [right]
+    right = convert_to_messages(right)
+    if any(isinstance(m, RemoveMessage) for m in right):
+        return add_normalized_messages(left, right)
+    new = []
+    for message in right:
+        message = normalize_message(message)
+        if message.id is None:
+            message.id = str(uuid.uuid4())
+        new.append(message)
+    return [*(left or ()), *new]
+
+
+def opening_question(
+    messages: Sequence[BaseMessage], summary: Optional[str] = None
+) -> Optional[str]:
+    """The last message's text if it is the thread's first human turn, else None.
+
+    An answer to it depends on the question alone (no earlier turns, no
+    summary of them), so it may be shared across threads, e.g. by the
+    semantic answer cache.
+    """
+    if summary or not messages:
+        return None
+    last = messages[-1]
+    if last.type != "human" or not isinstance(last.content, str):
+        return None
+    # Scanning back stops at the previous human turn, near the end.
+    for index in range(len(messages) - 2, -1, -1):
+        if messages[index].type == "human":
+            return None
+    return last.content
@@ -0,0 +1,265 @@
+"""Router / stock agent / knowledge agent graph.
+
+Each turn is sent to one agent by `IntentClassifier`, a nearest-centroid
+classifier over the answer cache's hashed n-gram embedding, so routing
+costs one small matrix-vector product instead of an LLM call. Agents return
+only the messages they add and `State.messages` uses the append-only
+`append_messages` reducer, so the state update of a turn does not grow with
+the thread.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Annotated, Mapping, Optional, Sequence
+from typing_extensions import NotRequired, TypedDict
+
+import numpy as np
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import END, START, StateGraph
+
+from langgraph_cb.cache.semantic import HashingEmbedder
+from langgraph_cb.config import Settings, get_settings
+from langgraph_cb.graphs.context import ContextManager, with_summary
+from langgraph_cb.graphs.intents import IntentRouter, price_rules
+from langgraph_cb.graphs.messages import append_messages, opening_question
+from langgraph_cb.metrics import metrics
+from langgraph_cb.models import ModelFactory, build_model_factory
+from langgraph_cb.tools.execution import ToolCallLimiter
+from langgraph_cb.tools.stocks import get_stock_price, get_stock_prices
+
+if TYPE_CHECKING:
+    from langchain_core.caches import BaseCache
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+
+    from langgraph_cb.cache.semantic import SemanticAnswerCache
+
+AGENTS = ("stock", "knowledge")
+
+# Seed phrasings per agent. Their centroids are the whole model; add
+# examples here (or pass your own) to move the boundary.
+EXAMPLES: dict[str, tuple[str, ...]] = {
+    "stock": (
+        "What is the price of AAPL stock?",
+        "How is MSFT trading?",
+        "quote for amazon shares",
+        "how much do 10 tesla shares cost",
+        "is nvidia stock up or down",
+        "compare the prices of AAPL and AMZN",
+        "what are apple shares worth",
+        "get me the current stock price for microsoft",
+        "price check on RIL",
+        "how much is one share of google",
+        "how is the stock market doing today",
+        "what did tesla stock close at",
+    ),
+    "knowledge": (
+        "Explain what LangGraph is in simple terms",
+        "Who first walked on the moon?",
+        "what is photosynthesis",
+        "how do vaccines work",
+        "summarize the causes of the french revolution",
+        "what is the capital of japan",
+        "write a haiku about autumn",
+        "why is the sky blue",
+        "what does a compiler do",
+        "tell me a fun fact about octopuses",
+        "explain how DNA replication works",
+        "what does NASA do",
+        "who won the 2018 world cup",
+    ),
+}
+
+
+class IntentClassifier:
+    """Nearest-centroid text classifier for routing turns between agents.
+
+    Texts are embedded with `HashingEmbedder` and compared by cosine
+    similarity with the centroid of each label's examples. Open-ended
+    questions sit close to no centroid in particular, so a label other than
+    `default` has to beat the default's score by `margin` to win. Costs tens
+    of microseconds on the CPU; no model call, no substring rules.
+    """
+
+    def __init__(
+        self,
+        examples: Mapping[str, Sequence[str]] = EXAMPLES,
+        embedder: Optional[HashingEmbedder] = None,
+        default: str = "knowledge",
+        margin: float = 0.05,
+    ):
+        if default not in examples:
+            raise ValueError(f"default label {default!r} has no examples")
+        self.embedder = embedder or HashingEmbedder()
+        self.labels = tuple(examples)
+        self.default = default
+        self.margin = margin
+        self._default = self.labels.index(default)
+        centroids = np.stack(
+            [
+                np.mean([self.embedder.embed(text) for text in examples[label]], axis=0)
+                for label in self.labels
+            ]
+        )
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self._centroids = centroids / np.where(norms == 0, 1, norms)
+
+    def scores(self, text: str) -> dict[str, float]:
+        return dict(zip(self.labels, (self._centroids @ self.embedder.embed(text)).tolist()))
+
+    def classify(self, text: str) -> str:
+        scores = self._centroids @ self.embedder.embed(text)
+        best = int(np.argmax(scores))
+        if scores[best] - scores[self._default] < self.margin:
+            return self.default
+        return self.labels[best]
+
+
+class State(TypedDict):
+    messages: Annotated[list, append_messages]
+    summary: NotRequired[str]
+
+
+def _question(state: State) -> Optional[str]:
+    last = state["messages"][-1]
+    if last.type == "human" and isinstance(last.content, str):
+        return last.content
+    return None
+
+
+def build_multiagent_graph(
+    checkpointer: BaseCheckpointSaver | None = None,
+    llm_cache: BaseCache | None = None,
+    tool_limiter: ToolCallLimiter | None = None,
+    context_tokens: int | None = None,
+    model_factory: ModelFactory | None = None,
+    classifier: IntentClassifier | None = None,
+    settings: Settings | None = None,
+    answer_cache: SemanticAnswerCache | None = None,
+):
+    """Compile the multi-agent graph; arguments as for `hitl.build_graph`.
+
+    Stock questions that name their tickers ("price of AAPL and MSFT") are
+    answered by the price rules without a model call; the rest go to the
+    model with the price tools bound. Knowledge questions go to the plain
+    model, through `answer_cache` when given.
+    """
+    from langgraph.prebuilt import ToolNode
+
+    from langgraph_cb.checkpoint.memory import BoundedMemorySaver
+
+    settings = settings or get_settings()
+    if context_tokens is None:
+        context_tokens = settings.context_tokens
+    if model_factory is None:
+        model_factory = build_model_factory(settings=settings)
+    classifier = classifier if classifier is not None else IntentClassifier()
+
+    tools = [get_stock_price, get_stock_prices]
+    llm = model_factory(llm_cache)
+    llm_with_tools = llm.bind_tools(tools)
+    prices = IntentRouter(price_rules())
+
+    def route(state: State) -> str:
+        question = _question(state)
+        agent = classifier.classify(question) if question is not None else "knowledge"
+        if metrics.enabled:
+            metrics.agent_routes.inc(agent=agent)
+        return agent
+
+    def _count(route: str) -> None:
+        if metrics.enabled:
+            metrics.chatbot_routes.inc(route=route)
+
+    def _stock_fast_path(state: State) -> dict | None:
+        question = _question(state)
+        routed = prices.route(question) if question is not None else None
+        if routed is not None:
+            _count(routed[0])
+            return routed[1]
+        return None
+
+    def _prompt(state: State) -> list:
+        return with_summary(state["messages"], state.get("summary"))
+
+    def stock_agent(state: State) -> dict:
+        update = _stock_fast_path(state)
+        if update is not None:
+            return update
+        _count("llm")
+        return {"messages": [llm_with_tools.invoke(_prompt(state))]}
+
+    async def astock_agent(state: State) -> dict:
+        update = _stock_fast_path(state)
+        if update is not None:
+            return update
+        _count("llm")
+        return {"messages": [await llm_with_tools.ainvoke(_prompt(state))]}
+
+    def _standalone(state: State) -> Optional[str]:
+        # The shared answer cache is keyed on the question alone: only a
+        # thread's opening question may be served or stored.
+        if answer_cache is None:
+            return None
+        return opening_question(state["messages"], state.get("summary"))
+
+    def _cached(question: Optional[str]) -> dict | None:
+        if answer_cache is not None and question is not None:
+            answer = answer_cache.lookup(question)
+            if answer is not None:
+                _count("answer_cache")
+                return {"messages": [AIMessage(content=answer)]}
+        _count("llm")
+        return None
+
+    def _remember(question: Optional[str], response) -> None:
+        if answer_cache is not None and question is not None and response.content:
+            answer_cache.update(question, str(response.content))
+
+    def knowledge_agent(state: State) -> dict:
+        question = _standalone(state)
+        update = _cached(question)
+        if update is not None:
+            return update
+        response = llm.invoke(_prompt(state))
+        _remember(question, response)
+        return {"messages": [response]}
+
+    async def aknowledge_agent(state: State) -> dict:
+        question = _standalone(state)
+        update = _cached(question)
+        if update is not None:
+            return update
+        response = await llm.ainvoke(_prompt(state))
+        _remember(question, response)
+        return {"messages": [response]}
+
+    def after_stock(state: State) -> str:
+        last = state["messages"][-1]
+        return "tools" if last.type == "ai" and last.tool_calls else END
+
+    builder = StateGraph(State)
+    builder.add_node("stock", RunnableLambda(stock_agent, afunc=astock_agent))
+    builder.add_node("knowledge", RunnableLambda(knowledge_agent, afunc=aknowledge_agent))
+    limiter = tool_limiter if tool_limiter is not None else ToolCallLimiter(
+        settings.tool_max_parallel, settings.tool_timeout or None
+    )
+    builder.add_node(
+        "tools",
+        ToolNode(tools, wrap_tool_call=limiter.wrap, awrap_tool_call=limiter.awrap),
+    )
+
+    # Routing is an edge function, not a node: no extra step or state write.
+    if context_tokens:
+        context = ContextManager(llm, max_tokens=context_tokens)
+        builder.add_node("context", RunnableLambda(context, afunc=context.acall))
+        builder.add_edge(START, "context")
+        builder.add_conditional_edges("context", route, list(AGENTS))
+    else:
+        builder.add_conditional_edges(START, route, list(AGENTS))
+    builder.add_conditional_edges("stock", after_stock, ["tools", END])
+    builder.add_edge("tools", "stock")
+    builder.add_edge("knowledge", END)
+
+    memory = checkpointer if checkpointer is not None else BoundedMemorySaver()
+    return builder.compile(checkpointer=memory)
@@ -0,0 +1,343 @@
+"""Minimal Prometheus-compatible metrics for the graph and the API.
+
+Only counters and histograms are needed, so this renders the text exposition
+format itself instead of pulling in a client library. When `enabled` is
+False no callback handler is attached and nothing is recorded.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import threading
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from langgraph_cb.config import get_settings
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def values(self) -> dict[tuple[str, ...], float]:
+        """Current totals keyed by label values, in `labelnames` order."""
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    le = _labels(self.labelnames, key, f'le="{bound:g}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative:g}")
+                cumulative += series[len(self.buckets)]
+                le = _labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{le} {cumulative:g}")
+                labels = _labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {series[-1]:g}")
+                lines.append(f"{self.name}_count{labels} {cumulative:g}")
+        return lines
+
+
+class Metrics:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.node_latency = Histogram(
+            "langgraph_cb_node_duration_seconds", "Graph node latency.", ("node",)
+        )
+        self.tool_latency = Histogram(
+            "langgraph_cb_tool_duration_seconds", "Tool call latency.", ("tool",)
+        )
+        self.llm_latency = Histogram(
+            "langgraph_cb_llm_duration_seconds", "Chat model call latency."
+        )
+        self.llm_tokens = Counter(
+            "langgraph_cb_llm_tokens_total", "Chat model tokens.", ("kind",)
+        )
+        self.checkpoint_latency = Histogram(
+            "langgraph_cb_checkpoint_duration_seconds",
+            "Checkpointer read/write latency.",
+            ("op",),
+        )
+        self.chatbot_routes = Counter(
+            "langgraph_cb_chatbot_routes_total",
+            "Chatbot turns by route: a fast-path rule name, or llm.",
+            ("route",),
+        )
+        self.agent_routes = Counter(
+            "langgraph_cb_agent_routes_total",
+            "Multi-agent turns by the agent the classifier chose.",
+            ("agent",),
+        )
+        self.stale_trades = Counter(
+            "langgraph_cb_stale_trades_total",
+            "Trades refused because the symbol's quote was missing or stale.",
+        )
+        self.interrupts = Counter(
+            "langgraph_cb_interrupts_total", "Runs parked at an approval interrupt."
+        )
+        self.admission_wait = Histogram(
+            "langgraph_cb_admission_wait_seconds",
+            "Time a run waited for a slot, by kind (resume or chat).",
+            ("kind",),
+        )
+        self.shed = Counter(
+            "langgraph_cb_shed_total",
+            "Requests rejected with 503 because their kind's queue was full.",
+            ("kind",),
+        )
+        self.thread_wait = Histogram(
+            "langgraph_cb_thread_wait_seconds",
+            "Time a run waited for earlier runs on the same thread.",
+        )
+        self.thread_rejected = Counter(
+            "langgraph_cb_thread_rejected_total",
+            "Runs rejected with 429 because their thread's queue was full.",
+        )
+        self.http_latency = Histogram(
+            "langgraph_cb_http_request_duration_seconds",
+            "API request latency.",
+            ("path", "status"),
+        )
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in (
+            self.node_latency,
+            self.tool_latency,
+            self.llm_latency,
+            self.llm_tokens,
+            self.chatbot_routes,
+            self.agent_routes,
+            self.checkpoint_latency,
+            self.stale_trades,
+            self.interrupts,
+            self.admission_wait,
+            self.shed,
+            self.thread_wait,
+            self.thread_rejected,
+            self.http_latency,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def callbacks(self) -> list[BaseCallbackHandler]:
+        """Callback handlers to pass in a run config; empty when disabled."""
+        return [MetricsCallbackHandler(self)] if self.enabled else []
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Times graph nodes, tool calls and model calls and counts model tokens.
+
+    Runs inline (no executor hop under `ainvoke` / `astream`), so recorded
+    latencies do not include thread-pool scheduling. A model or tool call
+    that never reports its end (its run was cancelled) is dropped when the
+    chain around it ends or fails.
+    """
+
+    run_inline = True
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        self._started: dict[UUID, tuple[str, str, float]] = {}
+        # parent run -> timed runs started under it and possibly still open.
+        self._children: dict[UUID, list[UUID]] = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(
+        self,
+        serialized,
+        inputs,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata=None,
+        name=None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # Nested runnables inside a node share its metadata; time the node itself.
+        if node is not None and name == node:
+            self._start(run_id, parent_run_id, "node", node)
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_tool_start(
+        self,
+        serialized,
+        input_str,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        name=None,
+        **kwargs: Any,
+    ) -> None:
+        tool = name or (serialized or {}).get("name", "unknown")
+        self._start(run_id, parent_run_id, "tool", tool)
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chat_model_start(
+        self,
+        serialized,
+        messages,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id, parent_run_id, "llm", "")
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    tokens = self.metrics.llm_tokens
+                    tokens.inc(usage.get("input_tokens", 0), kind="input")
+                    tokens.inc(usage.get("output_tokens", 0), kind="output")
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def _start(self, run_id: UUID, parent_run_id: UUID | None, kind: str, label: str) -> None:
+        with self._lock:
+            self._started[run_id] = (kind, label, time.perf_counter())
+            if parent_run_id is not None:
+                self._children.setdefault(parent_run_id, []).append(run_id)
+
+    def _finish(self, run_id: UUID) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            # Anything still open under this run was cancelled with it.
+            for child in self._children.pop(run_id, ()):
+                self._started.pop(child, None)
+                self._children.pop(child, None)
+        if started is None:
+            return
+        kind, label, start = started
+        elapsed = time.perf_counter() - start
+        if kind == "node":
+            self.metrics.node_latency.observe(elapsed, node=label)
+        elif kind == "tool":
+            self.metrics.tool_latency.observe(elapsed, tool=label)
+        else:
+            self.metrics.llm_latency.observe(elapsed)
+
+
+def instrument_checkpointer(saver, metrics: Metrics):
+    """Time the checkpointer's read/write methods in place. No-op when disabled."""
+    if not metrics.enabled:
+        return saver
+
+    # Set while an async method is timed, so a sync method it delegates to
+    # (InMemorySaver.aput -> put) is not counted twice.
+    in_async = contextvars.ContextVar("checkpoint_in_async", default=False)
+
+    def timed(op: str, fn):
+        def wrapper(*args, **kwargs):
+            if in_async.get():
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metrics.checkpoint_latency.observe(time.perf_counter() - start, op=op)
+
+        return wrapper
+
+    def atimed(op: str, fn):
+        async def wrapper(*args, **kwargs):
+            token = in_async.set(True)
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                in_async.reset(token)
+                metrics.checkpoint_latency.observe(time.perf_counter() - start, op=op)
+
+        return wrapper
+
+    for method, op in (
+        ("get_tuple", "read"),
+        ("put", "write"),
+        ("put_writes", "write_pending"),
+    ):
+        setattr(saver, method, timed(op, getattr(saver, method)))
+        setattr(saver, f"a{method}", atimed(op, getattr(saver, f"a{method}")))
+    return saver
+
+
+metrics = Metrics(enabled=get_settings().metrics)
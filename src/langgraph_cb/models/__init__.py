@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+from langgraph_cb.config import Settings, get_settings
+
+if TYPE_CHECKING:
+    from langchain_core.caches import BaseCache
+    from langchain_core.language_models import BaseChatModel
+
+ModelFactory = Callable[[Optional["BaseCache"]], "BaseChatModel"]
+
+
+def openai_model(
+    cache: Optional[BaseCache] = None, settings: Settings | None = None
+) -> BaseChatModel:
+    from langchain_openai import ChatOpenAI
+
+    from langgraph_cb.models.http import http_clients
+
+    settings = settings or get_settings()
+    # temperature=0 (the default) makes responses deterministic enough to
+    # cache; the cache key covers the messages, model parameters and tools.
+    client, async_client = http_clients(settings.http)
+    return ChatOpenAI(
+        model=settings.openai_model,
+        temperature=settings.temperature,
+        cache=cache,
+        http_client=client,
+        http_async_client=async_client,
+        timeout=client.timeout,
+        # Retries happen in the shared transport (with jitter and Retry-After).
+        max_retries=0,
+    )
+
+
+def build_model_factory(
+    name: str | None = None, settings: Settings | None = None
+) -> ModelFactory:
+    """Chat model factory selected by `name` or `settings.model`.
+
+    `openai` (default) is `settings.openai_model` over the pooled clients
+    from `langgraph_cb.models.http`. `fake` is the offline `FakeChatModel`,
+    with its median latency and spread from `fake_latency_ms` and
+    `fake_latency_sigma`.
+    """
+    settings = settings or get_settings()
+    name = (name or settings.model).lower()
+
+    if name == "openai":
+
+        def model(cache: Optional[BaseCache] = None) -> BaseChatModel:
+            return openai_model(cache, settings)
+
+        return model
+
+    if name == "fake":
+        from langgraph_cb.models.fake import FakeChatModel
+
+        def fake_model(cache: Optional[BaseCache] = None) -> BaseChatModel:
+            return FakeChatModel(
+                latency_ms=settings.fake_latency_ms,
+                latency_sigma=settings.fake_latency_sigma,
+                cache=cache,
+            )
+
+        return fake_model
+
+    raise ValueError(f"Unknown model: {name!r}")
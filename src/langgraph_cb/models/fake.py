@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field, PrivateAttr
+
+_SYMBOL = re.compile(r"\b[A-Z]{2,5}\b")
+_PRICE_WORDS = re.compile(r"\b(price|cost|worth|trading|quote)\b", re.IGNORECASE)
+
+
+def default_script(messages: Sequence[BaseMessage]) -> AIMessage:
+    """Scripted behaviour that exercises the HITL graph like the real model.
+
+    - After a tool result: answer with it.
+    - A price question naming tickers: call `get_stock_price` per ticker.
+    - Anything else: a short canned answer.
+    """
+    last = messages[-1]
+    if isinstance(last, ToolMessage):
+        return AIMessage(content=f"The result is {last.content}.")
+    text = str(last.content)
+    if isinstance(last, HumanMessage) and _PRICE_WORDS.search(text):
+        symbols = list(dict.fromkeys(_SYMBOL.findall(text)))
+        if symbols:
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": "get_stock_price", "args": {"symbol": symbol}, "id": f"call_{i}"}
+                    for i, symbol in enumerate(symbols)
+                ],
+            )
+    return AIMessage(content=f"This is a scripted answer to: {text[:80]}")
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic local chat model for offline benchmarks and demos.
+
+    Responses come from `script` (see `default_script`). Each call waits for
+    a latency drawn from a log-normal distribution with median `latency_ms`
+    and shape `latency_sigma` (0 for a fixed delay). When streamed, text is
+    emitted word by word, with the latency spread across the tokens.
+    """
+
+    latency_ms: float = 0.0
+    latency_sigma: float = 0.0
+    seed: Optional[int] = None
+    script: Callable[[Sequence[BaseMessage]], AIMessage] = Field(
+        default=default_script, exclude=True
+    )
+
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"latency_ms": self.latency_ms, "latency_sigma": self.latency_sigma}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _delay(self) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return self._rng.lognormvariate(0.0, self.latency_sigma) * self.latency_ms / 1000
+
+    def _respond(self, messages: list[BaseMessage]) -> AIMessage:
+        message = self.script(messages)
+        prompt_tokens = sum(len(str(m.content).split()) for m in messages)
+        completion_tokens = len(str(message.content).split()) + len(message.tool_calls)
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        return message
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self._delay())
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self._delay())
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    def _chunks(self, message: AIMessage) -> list[AIMessageChunk]:
+        words = str(message.content).split(" ") if message.content else []
+        chunks = [
+            AIMessageChunk(content=word if i == 0 else f" {word}")
+            for i, word in enumerate(words)
+        ]
+        chunks.append(
+            AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {
+                        "name": call["name"],
+                        "args": json.dumps(call["args"]),
+                        "id": call["id"],
+                        "index": i,
+                    }
+                    for i, call in enumerate(message.tool_calls)
+                ],
+                usage_metadata=message.usage_metadata,
+            )
+        )
+        return chunks
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        chunks = self._chunks(self._respond(messages))
+        step = self._delay() / len(chunks)
+        for chunk in chunks:
+            time.sleep(step)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager and chunk.content:
+                run_manager.on_llm_new_token(str(chunk.content), chunk=generation)
+            yield generation
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        chunks = self._chunks(self._respond(messages))
+        step = self._delay() / len(chunks)
+        for chunk in chunks:
+            await asyncio.sleep(step)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager and chunk.content:
+                await run_manager.on_llm_new_token(str(chunk.content), chunk=generation)
+            yield generation
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from collections import Counter
+from typing import Optional
+
+import httpx
+
+from langgraph_cb.config import HttpClientConfig, get_settings
+
+RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504})
+# Failures where the request never reached the server, or a pooled keep-alive
+# connection was closed under us before a response started.
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds the server asked us to wait (`retry-after-ms` or `Retry-After`)."""
+    for header, scale in (("retry-after-ms", 1000.0), ("retry-after", 1.0)):
+        value = response.headers.get(header)
+        if value is not None:
+            try:
+                return max(float(value) / scale, 0.0)
+            except ValueError:
+                pass
+    return None
+
+
+class _RetryPolicy:
+    def __init__(self, config: HttpClientConfig):
+        self.config = config
+        self.stats: Counter = Counter()
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        cap = self.config.backoff_max
+        hint = _retry_after(response) if response is not None else None
+        if hint is not None:
+            return min(hint, cap)
+        # Full jitter: spreads retries from many clients instead of having
+        # them hit a recovering server in lockstep.
+        return random.uniform(0, min(cap, self.config.backoff_base * 2**attempt))
+
+
+class RetryTransport(_RetryPolicy, httpx.BaseTransport):
+    """Pooled keep-alive transport that retries transient failures with jitter."""
+
+    def __init__(self, config: HttpClientConfig):
+        super().__init__(config)
+        self._transport = httpx.HTTPTransport(limits=self._limits(), http2=config.http2)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats["requests"] += 1
+        for attempt in range(self.config.max_retries + 1):
+            last = attempt == self.config.max_retries
+            try:
+                response = self._transport.handle_request(request)
+            except RETRY_ERRORS:
+                if last:
+                    raise
+                self.stats["retries"] += 1
+                time.sleep(self._delay(attempt, None))
+                continue
+            if last or response.status_code not in RETRY_STATUSES:
+                return response
+            self.stats["retries"] += 1
+            delay = self._delay(attempt, response)
+            response.close()
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRetryTransport(_RetryPolicy, httpx.AsyncBaseTransport):
+    """Async counterpart of `RetryTransport`.
+
+    Pooled connections belong to the event loop that opened them, so each
+    running loop gets its own pool; a worker serving from one loop shares one.
+    """
+
+    def __init__(self, config: HttpClientConfig):
+        super().__init__(config)
+        self._transports: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(limits=self._limits(), http2=self.config.http2)
+            self._transports[loop] = transport
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        transport = self._transport()
+        self.stats["requests"] += 1
+        for attempt in range(self.config.max_retries + 1):
+            last = attempt == self.config.max_retries
+            try:
+                response = await transport.handle_async_request(request)
+            except RETRY_ERRORS:
+                if last:
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._delay(attempt, None))
+                continue
+            if last or response.status_code not in RETRY_STATUSES:
+                return response
+            self.stats["retries"] += 1
+            delay = self._delay(attempt, response)
+            await response.aclose()
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+def _timeout(config: HttpClientConfig) -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=config.connect_timeout,
+        read=config.read_timeout,
+        write=config.write_timeout,
+        pool=config.pool_timeout,
+    )
+
+
+_clients: dict[tuple[int, HttpClientConfig], tuple[httpx.Client, httpx.AsyncClient]] = {}
+_clients_lock = threading.Lock()
+
+
+def http_clients(
+    config: Optional[HttpClientConfig] = None,
+) -> tuple[httpx.Client, httpx.AsyncClient]:
+    """Sync and async clients shared by every model built in this process.
+
+    One pair is kept per config (`get_settings().http` by default), so graphs
+    built in the same worker reuse warm connections instead of each paying
+    for its own TLS handshakes. Forked children get fresh pools.
+    """
+    config = config or get_settings().http
+    key = (os.getpid(), config)
+    with _clients_lock:
+        clients = _clients.get(key)
+        if clients is None:
+            timeout = _timeout(config)
+            clients = _clients[key] = (
+                httpx.Client(transport=RetryTransport(config), timeout=timeout),
+                httpx.AsyncClient(transport=AsyncRetryTransport(config), timeout=timeout),
+            )
+    return clients
+
+
+async def aclose_http_clients() -> None:
+    """Close the shared clients; the next `http_clients` call opens new ones."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client, async_client in clients:
+        client.close()
+        await async_client.aclose()
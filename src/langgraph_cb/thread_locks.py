@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class ThreadBusyError(RuntimeError):
+    """Too many runs are already waiting for this conversation thread."""
+
+
+class ThreadLocks:
+    """One graph run at a time per conversation thread, in arrival order.
+
+    Two runs on the same `thread_id` would both start from the same checkpoint
+    and the later write would drop the earlier turn, after paying for its
+    model call. `acquire` lets the first caller through and queues the rest
+    (FIFO, at most `max_waiting` per thread; beyond that it raises
+    `ThreadBusyError` at once instead of waiting). Runs on different threads
+    never wait for each other, and an idle thread holds no state.
+
+    Works within one event loop; with several workers, requests for a thread
+    must be routed to the same worker for this to cover them.
+
+    Immediate, queued, rejected and cancelled counts are available in `stats`.
+    """
+
+    def __init__(self, max_waiting: int = 4):
+        self.max_waiting = max_waiting
+        self.stats: Counter[str] = Counter()
+        # thread_id -> runs waiting behind the current holder.
+        self._queues: dict[str, deque[asyncio.Future]] = {}
+
+    def __len__(self) -> int:
+        """Threads with a run in progress."""
+        return len(self._queues)
+
+    def waiting(self, thread_id: str) -> int:
+        queue = self._queues.get(thread_id)
+        return len(queue) if queue is not None else 0
+
+    def full(self, thread_id: str) -> bool:
+        """Whether `acquire` would reject a run on `thread_id` right now."""
+        return self.waiting(thread_id) >= self.max_waiting
+
+    async def acquire(self, thread_id: str) -> float:
+        """Wait for the thread to be free; returns the seconds spent waiting."""
+        queue = self._queues.get(thread_id)
+        if queue is None:
+            self._queues[thread_id] = deque()
+            self.stats["immediate"] += 1
+            return 0.0
+        if len(queue) >= self.max_waiting:
+            self.stats["rejected"] += 1
+            raise ThreadBusyError(f"thread {thread_id!r} already has {len(queue)} runs waiting")
+        start = time.perf_counter()
+        turn = asyncio.get_running_loop().create_future()
+        queue.append(turn)
+        try:
+            await turn
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            if turn.cancelled():
+                if turn in queue:
+                    queue.remove(turn)
+            else:
+                # Handed the thread just as we were cancelled: pass it on.
+                self.release(thread_id)
+            raise
+        self.stats["queued"] += 1
+        return time.perf_counter() - start
+
+    def release(self, thread_id: str) -> None:
+        queue = self._queues[thread_id]
+        while queue:
+            turn = queue.popleft()
+            if not turn.done():
+                turn.set_result(None)
+                return
+        del self._queues[thread_id]
+
+    @asynccontextmanager
+    async def hold(self, thread_id: str) -> AsyncIterator[float]:
+        """`acquire` / `release` as a context manager yielding the wait."""
+        waited = await self.acquire(thread_id)
+        try:
+            yield waited
+        finally:
+            self.release(thread_id)
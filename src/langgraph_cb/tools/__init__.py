@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from langgraph_cb.config import Settings, get_settings
+
+if TYPE_CHECKING:
+    from langgraph_cb.tools.market_data import QuoteFeed
+
+
+def build_quote_feed(
+    backend: str | None = None, settings: Settings | None = None
+) -> QuoteFeed | None:
+    """Create the background price feed selected by `backend` or the settings.
+
+    Backends: `static` (default; no feed, prices come from the built-in
+    table), `alphavantage` (polls `quote_symbols` every `quote_interval`
+    seconds) and `replay` (replays `quote_tick_file` at `quote_replay_speed`).
+    The feed is returned unstarted; its `snapshot` tracks `quote_max_age`.
+    """
+    settings = settings or get_settings()
+    backend = (backend or settings.quotes).lower()
+    if backend == "static":
+        return None
+
+    from langgraph_cb.tools.market_data import PollingQuoteFeed, QuoteSnapshot, TickFileReplay
+
+    snapshot = QuoteSnapshot(max_age=settings.quote_max_age)
+    if backend == "alphavantage":
+        from langgraph_cb.tools.quotes import AlphaVantageQuoteProvider
+
+        provider = AlphaVantageQuoteProvider(os.getenv("ALPHAVANTAGE_API_KEY", ""))
+        return PollingQuoteFeed(
+            provider, settings.quote_symbols, settings.quote_interval, snapshot=snapshot
+        )
+
+    if backend == "replay":
+        return TickFileReplay(
+            settings.quote_tick_file, speed=settings.quote_replay_speed, snapshot=snapshot
+        )
+
+    raise ValueError(f"Unknown quote source: {backend!r}")
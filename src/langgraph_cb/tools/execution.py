@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from typing import Awaitable, Callable, Optional
+
+from langchain_core.messages import ToolMessage
+
+
+class ToolCallLimiter:
+    """Bound and time-limit tool calls executed by a `ToolNode`.
+
+    `ToolNode` already fans out all tool calls of one AI message (a thread pool
+    under `invoke`, `asyncio.gather` under `ainvoke`) and returns results in
+    tool-call order. Pass `wrap` / `awrap` as its `wrap_tool_call` /
+    `awrap_tool_call` to cap how many run at once and, under `ainvoke`, to
+    turn a call that exceeds `timeout` seconds into an error `ToolMessage`
+    instead of stalling the whole step.
+
+    Sync calls run inline in the caller's thread, keeping its callbacks and
+    config context. A thread cannot be interrupted, so they are not
+    time-limited here; tools doing blocking I/O bound it themselves (e.g.
+    `AlphaVantageQuoteProvider(timeout=...)`).
+    """
+
+    def __init__(self, max_parallel: int = 8, timeout: Optional[float] = 10.0):
+        self.max_parallel = max_parallel
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_parallel)
+        # One semaphore per running loop: a limiter shared by graphs driven
+        # from several loops must not bind to the first.
+        self._aslots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def wrap(self, request, execute: Callable):
+        with self._slots:
+            return execute(request)
+
+    async def awrap(self, request, execute: Callable[..., Awaitable]):
+        async with self._async_slots():
+            try:
+                return await asyncio.wait_for(execute(request), self.timeout)
+            except asyncio.TimeoutError:
+                return self._timed_out(request)
+
+    def _async_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slots = self._aslots.get(loop)
+        if slots is None:
+            slots = self._aslots[loop] = asyncio.Semaphore(self.max_parallel)
+        return slots
+
+    def _timed_out(self, request) -> ToolMessage:
+        call = request.tool_call
+        return ToolMessage(
+            content=f"Error: {call['name']} timed out after {self.timeout}s",
+            name=call["name"],
+            tool_call_id=call["id"],
+            status="error",
+        )
@@ -0,0 +1,249 @@
+"""In-memory quote snapshot kept fresh off the request path.
+
+`QuoteSnapshot` holds the latest price per symbol; tools read it with a dict
+lookup and no I/O. A `QuoteFeed` running in a background thread writes to
+it: `PollingQuoteFeed` asks a `QuoteProvider` for every tracked symbol each
+`interval` seconds, and `TickFileReplay` replays a memory-mapped tick file
+(see `write_tick_file`) for tests, demos and benchmarks.
+
+Each quote records when it arrived, so readers can tell how stale it is
+(`QuoteSnapshot.age`) and trades can be refused on old prices.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import struct
+import threading
+import time
+from collections import Counter
+from typing import Iterable, Iterator, Mapping, NamedTuple, Optional
+
+from langgraph_cb.tools.quotes import QuoteProvider
+
+logger = logging.getLogger(__name__)
+
+# Tick file record: epoch seconds, symbol (ASCII, NUL-padded), price.
+TICK = struct.Struct("<d8sd")
+
+
+class Quote(NamedTuple):
+    price: float
+    # time.monotonic() when the snapshot received it.
+    received: float
+
+
+class QuoteSnapshot:
+    """Latest price per symbol; each feed update replaces the symbols it carries.
+
+    Reads are a single dict lookup (no lock: each entry is an immutable
+    `Quote` swapped in by one writer). `get` / `get_many` match `QuoteCache`,
+    so the snapshot can back the price tools directly; unknown symbols are
+    priced at 0.0 as with `StaticQuoteProvider`. Reads of quotes older than
+    `max_age` seconds still return the last price but count as stale.
+
+    Hit, miss, stale-read and update counts are available in `stats`.
+    """
+
+    def __init__(self, prices: Optional[Mapping[str, float]] = None, max_age: float = 60.0):
+        self.max_age = max_age
+        self.stats: Counter[str] = Counter()
+        self._quotes: dict[str, Quote] = {}
+        if prices:
+            self.update(prices)
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._quotes
+
+    def symbols(self) -> list[str]:
+        return list(self._quotes)
+
+    def update(self, prices: Mapping[str, float], received: Optional[float] = None) -> None:
+        received = time.monotonic() if received is None else received
+        for symbol, price in prices.items():
+            self._quotes[symbol.upper()] = Quote(float(price), received)
+        self.stats["updates"] += len(prices)
+
+    def quote(self, symbol: str) -> Optional[Quote]:
+        return self._quotes.get(symbol.upper())
+
+    def age(self, symbol: str, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since `symbol` was last updated; None if never quoted."""
+        quote = self._quotes.get(symbol.upper())
+        if quote is None:
+            return None
+        return (time.monotonic() if now is None else now) - quote.received
+
+    def get(self, symbol: str) -> float:
+        quote = self._quotes.get(symbol.upper())
+        if quote is None:
+            self.stats["misses"] += 1
+            return 0.0
+        self.stats["hits"] += 1
+        if time.monotonic() - quote.received > self.max_age:
+            self.stats["stale"] += 1
+        return quote.price
+
+    def get_many(self, symbols: Iterable[str]) -> dict[str, float]:
+        return {symbol: self.get(symbol) for symbol in dict.fromkeys(s.upper() for s in symbols)}
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._quotes.clear()
+        else:
+            self._quotes.pop(symbol.upper(), None)
+
+
+class QuoteFeed:
+    """Background thread writing prices into `snapshot` until `stop()`."""
+
+    name = "quote-feed"
+
+    def __init__(self, snapshot: Optional[QuoteSnapshot] = None):
+        self.snapshot = snapshot if snapshot is not None else QuoteSnapshot()
+        self.stats: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> QuoteFeed:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._guarded, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _guarded(self) -> None:
+        try:
+            self.run()
+        except Exception:
+            logger.exception("%s stopped", self.name)
+
+    def run(self) -> None:
+        raise NotImplementedError
+
+
+class PollingQuoteFeed(QuoteFeed):
+    """Fetch `symbols` from `provider` every `interval` seconds.
+
+    A failed fetch is logged and counted in `stats`; the snapshot keeps the
+    previous prices, which age until the next successful poll.
+    """
+
+    name = "quote-poller"
+
+    def __init__(
+        self,
+        provider: QuoteProvider,
+        symbols: Iterable[str],
+        interval: float = 5.0,
+        snapshot: Optional[QuoteSnapshot] = None,
+    ):
+        super().__init__(snapshot)
+        self.provider = provider
+        self.symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        self.interval = interval
+
+    def poll(self) -> None:
+        try:
+            prices = self.provider.fetch(self.symbols)
+        except Exception as exc:
+            self.stats["errors"] += 1
+            logger.warning("quote poll failed: %s", exc)
+            return
+        self.snapshot.update(prices)
+        self.stats["polls"] += 1
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            start = time.monotonic()
+            self.poll()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - start)))
+
+
+def write_tick_file(path: str, ticks: Iterable[tuple[float, str, float]]) -> int:
+    """Write `(epoch_seconds, symbol, price)` ticks, oldest first; returns the count."""
+    count = 0
+    with open(path, "wb") as f:
+        for timestamp, symbol, price in ticks:
+            f.write(TICK.pack(timestamp, symbol.upper().encode("ascii"), price))
+            count += 1
+    return count
+
+
+def read_ticks(buffer) -> Iterator[tuple[float, str, float]]:
+    """Ticks from a buffer of `TICK` records (e.g. an mmap), without copying it."""
+    view = memoryview(buffer)
+    usable = len(view) - len(view) % TICK.size
+    for timestamp, symbol, price in TICK.iter_unpack(view[:usable]):
+        yield timestamp, symbol.rstrip(b"\0").decode("ascii"), price
+
+
+class TickFileReplay(QuoteFeed):
+    """Replay a tick file into the snapshot, keeping the recorded spacing.
+
+    The file is memory-mapped, so replay cost does not depend on its size and
+    the page cache is shared between workers replaying the same file. Ticks
+    are applied `speed` times faster than recorded (0 applies them as fast
+    as possible, for one-shot loads); with `loop`, replay restarts from the
+    top when the file ends.
+    """
+
+    name = "tick-replay"
+
+    def __init__(
+        self,
+        path: str,
+        speed: float = 1.0,
+        loop: bool = True,
+        snapshot: Optional[QuoteSnapshot] = None,
+    ):
+        super().__init__(snapshot)
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+
+    def run(self) -> None:
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            while not self._stop.is_set():
+                self._replay(data)
+                self.stats["passes"] += 1
+                if not self.loop:
+                    return
+
+    def _replay(self, data) -> None:
+        started = time.monotonic()
+        first: Optional[float] = None
+        pending: dict[str, float] = {}
+        pending_at: Optional[float] = None
+        for timestamp, symbol, price in read_ticks(data):
+            if first is None:
+                first = timestamp
+            if pending and timestamp != pending_at:
+                self._apply(pending)
+                pending = {}
+            if self.speed > 0 and timestamp != pending_at:
+                due = started + (timestamp - first) / self.speed
+                if self._stop.wait(max(0.0, due - time.monotonic())):
+                    return
+            pending[symbol] = price
+            pending_at = timestamp
+        if pending:
+            self._apply(pending)
+
+    def _apply(self, prices: dict[str, float]) -> None:
+        self.snapshot.update(prices)
+        self.stats["ticks"] += len(prices)
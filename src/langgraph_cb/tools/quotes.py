@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Iterable, Mapping, Optional
+
+
+class QuoteProvider:
+    """Source of stock prices. `fetch` receives each missing symbol once."""
+
+    def fetch(self, symbols: list[str]) -> dict[str, float]:
+        raise NotImplementedError
+
+
+class StaticQuoteProvider(QuoteProvider):
+    """Fixed price table; unknown symbols are priced at 0.0."""
+
+    def __init__(self, prices: Mapping[str, float]):
+        self.prices = {symbol.upper(): price for symbol, price in prices.items()}
+
+    def fetch(self, symbols: list[str]) -> dict[str, float]:
+        return {symbol: self.prices.get(symbol, 0.0) for symbol in symbols}
+
+
+class AlphaVantageQuoteProvider(QuoteProvider):
+    """Alpha Vantage GLOBAL_QUOTE lookups over a pooled keep-alive session."""
+
+    url = "https://www.alphavantage.co/query"
+
+    def __init__(self, api_key: str, *, pool_size: int = 10, timeout: float = 10.0):
+        if not api_key:
+            raise ValueError("Alpha Vantage API key not set")
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.api_key = api_key
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, symbols: list[str]) -> dict[str, float]:
+        prices = {}
+        for symbol in symbols:
+            response = self.session.get(
+                self.url,
+                params={"function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": self.api_key},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            price = response.json().get("Global Quote", {}).get("05. price")
+            if not price:
+                raise ValueError(f"No price found for {symbol}")
+            prices[symbol] = float(price)
+        return prices
+
+
+class QuoteCache:
+    """Per-symbol TTL cache in front of a `QuoteProvider`.
+
+    Concurrent lookups of the same symbol share one in-flight fetch, and
+    `get_many` sends every symbol that is neither cached nor in flight to the
+    provider in a single `fetch` call.
+    """
+
+    def __init__(self, provider: QuoteProvider, ttl_seconds: float = 5.0):
+        self.provider = provider
+        self.ttl_seconds = ttl_seconds
+        self._prices: dict[str, tuple[float, float]] = {}
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str) -> float:
+        return self.get_many([symbol])[symbol.upper()]
+
+    def get_many(self, symbols: Iterable[str]) -> dict[str, float]:
+        wanted = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        result: dict[str, float] = {}
+        waiting: dict[str, Future] = {}
+        owned: dict[str, Future] = {}
+        now = time.monotonic()
+
+        with self._lock:
+            for symbol in wanted:
+                cached = self._prices.get(symbol)
+                if cached is not None and now - cached[1] < self.ttl_seconds:
+                    result[symbol] = cached[0]
+                elif symbol in self._inflight:
+                    waiting[symbol] = self._inflight[symbol]
+                else:
+                    owned[symbol] = self._inflight[symbol] = Future()
+
+        if owned:
+            self._fetch(owned)
+        for symbol, future in {**owned, **waiting}.items():
+            result[symbol] = future.result()
+        return {symbol: result[symbol] for symbol in wanted}
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        with self._lock:
+            if symbol is None:
+                self._prices.clear()
+            else:
+                self._prices.pop(symbol.upper(), None)
+
+    def _fetch(self, owned: dict[str, Future]) -> None:
+        try:
+            prices = self.provider.fetch(list(owned))
+        except Exception as exc:
+            with self._lock:
+                for symbol in owned:
+                    self._inflight.pop(symbol, None)
+            for future in owned.values():
+                future.set_exception(exc)
+            return
+
+        fetched_at = time.monotonic()
+        with self._lock:
+            for symbol in owned:
+                if symbol in prices:
+                    self._prices[symbol] = (prices[symbol], fetched_at)
+                self._inflight.pop(symbol, None)
+        for symbol, future in owned.items():
+            if symbol in prices:
+                future.set_result(prices[symbol])
+            else:
+                future.set_exception(KeyError(symbol))
@@ -1,19 +1,106 @@
-from langchain_core.tools import tool
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Annotated, Optional
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import InjectedToolCallId, tool
+from langgraph.types import Command
+
+from langgraph_cb.config import get_settings
+from langgraph_cb.metrics import metrics
+from langgraph_cb.tools.quotes import QuoteCache, QuoteProvider, StaticQuoteProvider
+from langgraph_cb.tools.trades import TradeRequest
+
+if TYPE_CHECKING:
+    from langgraph_cb.tools.market_data import QuoteSnapshot
+
+quotes = QuoteCache(
+    StaticQuoteProvider(
+        {
+            "MSFT": 200.3,
+            "AAPL": 100.4,
+            "AMZN": 150.0,
+            "RIL": 87.6,
+        }
+    )
+)
+
+
+def set_quote_provider(provider: QuoteProvider, ttl_seconds: float = 5.0) -> None:
+    """Route price lookups through `provider`, cached for `ttl_seconds` per symbol."""
+    global quotes
+    quotes = QuoteCache(provider, ttl_seconds=ttl_seconds)
+
+
+def set_quote_snapshot(snapshot: QuoteSnapshot) -> QuoteCache | QuoteSnapshot:
+    """Serve prices from `snapshot`, kept fresh by a `QuoteFeed`, with no I/O.
+
+    Returns the source it replaces; pass it to `restore_quotes` once the feed
+    stops, so prices do not freeze at the last snapshot.
+    """
+    global quotes
+    previous, quotes = quotes, snapshot
+    return previous
+
+
+def restore_quotes(source: QuoteCache | QuoteSnapshot) -> None:
+    global quotes
+    quotes = source
+
+
+def stale_quote(symbol: str) -> Optional[str]:
+    """Why a trade in `symbol` is refused on its current quote, or None.
+
+    Only with `reject_stale_trades` set, and only for snapshot-backed prices;
+    a `QuoteCache` fetches on demand and is never older than its TTL.
+    """
+    settings = get_settings()
+    age = getattr(quotes, "age", None)
+    if not settings.reject_stale_trades or age is None:
+        return None
+    symbol = symbol.upper()
+    seconds = age(symbol)
+    if seconds is not None and seconds <= settings.quote_max_age:
+        return None
+    if metrics.enabled:
+        metrics.stale_trades.inc()
+    if seconds is None:
+        return f"Trade refused: no quote for {symbol}."
+    return (
+        f"Trade refused: the {symbol} quote is {seconds:.1f}s old "
+        f"(limit {settings.quote_max_age:g}s)."
+    )
 
 
 @tool
 def get_stock_price(symbol: str) -> float:
     """Return the current price of a stock."""
-    prices = {
-        "MSFT": 200.3,
-        "AAPL": 100.4,
-        "AMZN": 150.0,
-        "RIL": 87.6,
-    }
-    return prices.get(symbol.upper(), 0.0)
+    return quotes.get(symbol)
+
+
+@tool
+def get_stock_prices(symbols: list[str]) -> dict[str, float]:
+    """Return the current prices of several stocks in one lookup."""
+    return quotes.get_many(symbols)
 
 
 @tool
-def prepare_buy(symbol: str, quantity: int, total_price: float) -> str:
+def prepare_buy(
+    symbol: str,
+    quantity: int,
+    total_price: float,
+    tool_call_id: Annotated[str, InjectedToolCallId],
+) -> Command:
     """Prepare a buy request. Human approval is handled by the graph."""
-    return f"REQUEST_BUY::{symbol}::{quantity}::{total_price}"
+    refused = stale_quote(symbol)
+    if refused is not None:
+        return Command(
+            update={"messages": [ToolMessage(content=refused, tool_call_id=tool_call_id)]}
+        )
+    trade = TradeRequest(symbol, quantity, total_price)
+    return Command(
+        update={
+            "trade": trade,
+            "messages": [ToolMessage(content=trade.describe(), tool_call_id=tool_call_id)],
+        }
+    )
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+
+@dataclass(frozen=True, slots=True)
+class TradeRequest:
+    """A buy waiting for human approval.
+
+    Graph state keeps it as the `compact()` tuple (see `store_trade`), which
+    checkpoints as a three-element array instead of a pickled-by-name object.
+    """
+
+    symbol: str
+    quantity: int
+    total_price: float
+
+    def compact(self) -> tuple[str, int, float]:
+        return (self.symbol, self.quantity, self.total_price)
+
+    @classmethod
+    def from_compact(cls, data: Optional[Sequence]) -> Optional["TradeRequest"]:
+        """Inverse of `compact()`; checkpoints hand tuples back as lists."""
+        if not data:
+            return None
+        symbol, quantity, total_price = data
+        return cls(symbol, int(quantity), float(total_price))
+
+    def describe(self) -> str:
+        return (
+            f"Buy request prepared: {self.quantity} {self.symbol} for "
+            f"${self.total_price:.2f}, awaiting human approval."
+        )
+
+
+def store_trade(current, update):
+    """State reducer for the pending trade: store the compact form; `None` clears."""
+    if isinstance(update, TradeRequest):
+        return update.compact()
+    return update or ()
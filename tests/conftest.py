@@ -0,0 +1,9 @@
+import os
+
+# Settings are read once per process, on first import of langgraph_cb: run
+# every test offline against the fake model with in-process storage.
+os.environ["LANGGRAPH_CB_MODEL"] = "fake"
+os.environ["LANGGRAPH_CB_CHECKPOINTER"] = "memory"
+os.environ["LANGGRAPH_CB_APPROVALS"] = "memory"
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from langgraph_cb.admission import AdmissionController, Budget, Overloaded
+
+
+def _controller(capacity: int = 2, chat_waiting=None) -> AdmissionController:
+    return AdmissionController(
+        capacity, {"resume": Budget(capacity), "chat": Budget(capacity - 1, chat_waiting)}
+    )
+
+
+def test_resumes_are_served_before_earlier_chats():
+    async def main():
+        admission = _controller()
+        order: list[str] = []
+        await admission.acquire("resume")
+        await admission.acquire("chat")
+
+        async def run(kind: str):
+            async with admission.slot(kind):
+                order.append(kind)
+
+        chat = asyncio.ensure_future(run("chat"))
+        await asyncio.sleep(0)
+        resume = asyncio.ensure_future(run("resume"))
+        await asyncio.sleep(0)
+        admission.release("chat")
+        admission.release("resume")
+        await asyncio.gather(chat, resume)
+        return admission, order
+
+    admission, order = asyncio.run(main())
+    assert order == ["resume", "chat"]
+    assert admission.in_use() == 0
+
+
+def test_chats_cannot_take_the_reserved_slots():
+    async def main():
+        admission = _controller(capacity=3)
+        await admission.acquire("chat")
+        await admission.acquire("chat")
+        blocked = asyncio.ensure_future(admission.acquire("chat"))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+        assert await admission.acquire("resume") == 0.0
+        blocked.cancel()
+        return admission
+
+    admission = asyncio.run(main())
+    assert admission.in_use("chat") == 2 and admission.in_use("resume") == 1
+
+
+def test_batches_are_granted_all_slots_at_once():
+    async def main():
+        admission = _controller(capacity=4)
+        await admission.acquire("chat")
+        batch = asyncio.ensure_future(admission.acquire("chat", 3))
+        await asyncio.sleep(0)
+        assert not batch.done()
+        admission.release("chat")
+        await batch
+        with pytest.raises(ValueError):
+            await admission.acquire("chat", 4)
+        return admission
+
+    assert asyncio.run(main()).in_use("chat") == 3
+
+
+def test_full_queue_is_shed_with_retry_after():
+    async def main():
+        admission = _controller(chat_waiting=1)
+        await admission.acquire("chat")
+        queued = asyncio.ensure_future(admission.acquire("chat"))
+        await asyncio.sleep(0)
+        assert admission.saturated("chat")
+        with pytest.raises(Overloaded) as shed:
+            await admission.acquire("chat")
+        queued.cancel()
+        return admission, shed.value
+
+    admission, shed = asyncio.run(main())
+    assert shed.kind == "chat" and shed.retry_after >= 1
+    assert admission.stats["chat_shed"] == 1
+
+
+def test_shed_chat_gets_503(monkeypatch):
+    from fastapi import HTTPException
+
+    from langgraph_cb import api
+
+    monkeypatch.setattr(
+        api, "_admission", AdmissionController(1, {"chat": Budget(1, max_waiting=0)})
+    )
+
+    async def main():
+        async with api._admitted("chat"):
+            with pytest.raises(HTTPException) as shed:
+                async with api._admitted("chat"):
+                    pass
+        return shed.value
+
+    shed = asyncio.run(main())
+    assert shed.status_code == 503 and "Retry-After" in shed.headers
@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+
+from langgraph_cb import api
+
+
+def _park(client, message: str = "Buy 2 MSFT") -> str:
+    body = client.post("/chat", json={"message": message}).json()
+    assert body["status"] == "approval_required"
+    return body["thread_id"]
+
+
+def _pending(client) -> set[str]:
+    return {item["thread_id"] for item in client.get("/approvals").json()["items"]}
+
+
+def test_approve_resumes_a_parked_trade_once():
+    with TestClient(api.app) as client:
+        thread_id = _park(client)
+        assert thread_id in _pending(client)
+        first = client.post("/approve", json={"thread_id": thread_id, "decision": "yes"}).json()
+        assert first["status"] == "completed"
+        again = client.post("/approve", json={"thread_id": thread_id, "decision": "yes"}).json()
+        assert again["status"] == "not_pending"
+        assert thread_id not in _pending(client)
+
+
+def test_approve_unknown_thread_is_not_pending():
+    with TestClient(api.app) as client:
+        response = client.post("/approve", json={"thread_id": "no-such-thread", "decision": "yes"})
+        assert response.status_code == 200
+        assert response.json()["status"] == "not_pending"
+
+
+def test_new_message_drops_the_pending_trade():
+    with TestClient(api.app) as client:
+        thread_id = _park(client)
+        client.post("/chat", json={"message": "Who wrote Hamlet?", "thread_id": thread_id})
+        assert thread_id not in _pending(client)
+        response = client.post("/approve", json={"thread_id": thread_id, "decision": "yes"})
+        assert response.json()["status"] == "not_pending"
+
+        streamed = _park(client, "Buy 3 AAPL")
+        client.post("/chat/stream", json={"message": "hi", "thread_id": streamed}).read()
+        batched = _park(client, "Buy 4 AAPL")
+        client.post("/chat/batch", json={"items": [{"message": "hi", "thread_id": batched}]})
+        assert not {streamed, batched} & _pending(client)
+
+
+def test_parking_again_records_a_new_entry():
+    with TestClient(api.app) as client:
+        thread_id = _park(client)
+        response = client.post("/chat", json={"message": "Buy 5 AAPL", "thread_id": thread_id})
+        assert response.json()["status"] == "approval_required"
+        assert thread_id in _pending(client)
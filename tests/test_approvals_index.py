@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from langgraph_cb.approvals import MemoryApprovalIndex, PendingApproval, SqliteApprovalIndex
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def index(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryApprovalIndex()
+    else:
+        index = SqliteApprovalIndex(str(tmp_path / "approvals.db"))
+        yield index
+        index.close()
+
+
+def _entry(thread_id: str, symbol: str = "MSFT", created_at: float = 1000.0) -> PendingApproval:
+    return PendingApproval(thread_id, f"i-{thread_id}", symbol, 2, 400.0, "Approve?", created_at)
+
+
+def test_claim_hands_out_each_entry_once(index):
+    index.add(_entry("a"))
+    index.add(_entry("b"))
+    assert [e.thread_id for e in index.claim(["a", "missing"])] == ["a"]
+    assert index.claim(["a"]) == []
+    assert [e.thread_id for e in index.list()[0]] == ["b"]
+    assert index.stats["resolved"] == 1
+
+
+def test_concurrent_claims_split_the_entries(index):
+    for i in range(20):
+        index.add(_entry(f"t{i}"))
+    thread_ids = [f"t{i}" for i in range(20)]
+
+    async def main():
+        return await asyncio.gather(*(index.aclaim(thread_ids) for _ in range(4)))
+
+    claimed = [e.thread_id for batch in asyncio.run(main()) for e in batch]
+    assert sorted(claimed) == sorted(thread_ids)
+
+
+def test_re_adding_replaces_the_entry(index):
+    index.add(_entry("a", "MSFT"))
+    index.add(_entry("a", "AAPL", created_at=2000.0))
+    entries, total = index.list()
+    assert total == 1 and entries[0].symbol == "AAPL"
+    assert index.list(symbol="MSFT") == ([], 0)
+
+
+def test_list_filters_and_pages_oldest_first(index):
+    for i in range(5):
+        index.add(_entry(f"t{i}", "AAPL" if i % 2 else "MSFT", created_at=1000.0 + i))
+    entries, total = index.list(symbol="MSFT", limit=2, offset=1, now=1010.0)
+    assert total == 3 and [e.thread_id for e in entries] == ["t2", "t4"]
+    entries, total = index.list(min_age=8, now=1010.0)
+    assert total == 3 and [e.thread_id for e in entries] == ["t0", "t1", "t2"]
+    entries, total = index.list(max_age=6.5, now=1010.0)
+    assert [e.thread_id for e in entries] == ["t4"]
+
+
+def test_expire_claims_only_old_entries(index):
+    index.add(_entry("old", created_at=1000.0))
+    index.add(_entry("new", created_at=1050.0))
+
+    async def main():
+        return await index.aexpire(30, now=1060.0)
+
+    assert [e.thread_id for e in asyncio.run(main())] == ["old"]
+    assert index.claim(["old"]) == []
+    assert [e.thread_id for e in index.list()[0]] == ["new"]
+    assert index.stats["expired"] == 1
+
+
+def test_sqlite_index_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "approvals.db")
+    first, second = SqliteApprovalIndex(path), SqliteApprovalIndex(path)
+    try:
+        first.add(_entry("a"))
+        assert [e.thread_id for e in second.claim(["a"])] == ["a"]
+        assert first.claim(["a"]) == []
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,123 @@
+import sqlite3
+
+import pytest
+from langchain_core.messages import RemoveMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from langgraph_cb.checkpoint.deltas import DeltaTracker
+from langgraph_cb.checkpoint.memory import BoundedMemorySaver
+from langgraph_cb.checkpoint.sqlite import DurableSqliteSaver
+from langgraph_cb.graphs.hitl import build_graph
+from langgraph_cb.models.fake import FakeChatModel
+
+TURNS = 12
+
+
+def _graph(saver):
+    return build_graph(saver, model_factory=lambda cache: FakeChatModel(), context_tokens=0)
+
+
+def _chat(graph, thread_id: str, turns: range) -> None:
+    config = {"configurable": {"thread_id": thread_id}}
+    for turn in turns:
+        graph.invoke({"messages": [{"role": "user", "content": f"Who wrote book {turn}?"}]}, config)
+
+
+def _messages(graph, thread_id: str) -> list[tuple[str, str]]:
+    state = graph.get_state({"configurable": {"thread_id": thread_id}})
+    return [(m.type, m.content) for m in state.values["messages"]]
+
+
+@pytest.fixture
+def expected():
+    graph = _graph(InMemorySaver())
+    _chat(graph, "t", range(TURNS))
+    return _messages(graph, "t")
+
+
+@pytest.fixture
+def sqlite_saver(tmp_path):
+    saver = DurableSqliteSaver(
+        str(tmp_path / "checkpoints.db"), snapshot_every=4, compact_interval=None
+    )
+    yield saver
+    saver.close()
+
+
+def test_sqlite_deltas_round_trip(sqlite_saver, expected):
+    graph = _graph(sqlite_saver)
+    _chat(graph, "t", range(TURNS))
+    assert _messages(graph, "t") == expected
+
+    conn = sqlite3.connect(sqlite_saver.path)
+    kinds = conn.execute(
+        "SELECT base_version IS NULL, COUNT(*) FROM blobs WHERE channel = 'messages' "
+        "GROUP BY 1 ORDER BY 1"
+    ).fetchall()
+    conn.close()
+    deltas, snapshots = kinds[0][1], kinds[1][1]
+    assert deltas > snapshots > 1
+
+
+def test_sqlite_compaction_keeps_the_latest_state(sqlite_saver, expected):
+    graph = _graph(sqlite_saver)
+    _chat(graph, "t", range(TURNS))
+    assert sqlite_saver.compact() > 0
+    assert _messages(graph, "t") == expected
+    conn = sqlite3.connect(sqlite_saver.path)
+    (kept,) = conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()
+    conn.close()
+    assert kept == sqlite_saver.keep_last
+
+    # Later turns build on the compacted chain.
+    _chat(graph, "t", range(TURNS, TURNS + 3))
+    sqlite_saver.compact()
+    assert _messages(graph, "t")[: len(expected)] == expected
+    assert len(_messages(graph, "t")) == len(expected) + 6
+
+
+def test_sqlite_reopened_file_reads_and_extends_chains(tmp_path, expected):
+    path = str(tmp_path / "checkpoints.db")
+    saver = DurableSqliteSaver(path, snapshot_every=4, compact_interval=None)
+    _chat(_graph(saver), "t", range(TURNS))
+    saver.close()
+
+    # A new process has no remembered values and starts with a snapshot.
+    saver = DurableSqliteSaver(path, snapshot_every=4, compact_interval=None)
+    try:
+        graph = _graph(saver)
+        assert _messages(graph, "t") == expected
+        _chat(graph, "t", range(TURNS, TURNS + 1))
+        assert _messages(graph, "t")[: len(expected)] == expected
+    finally:
+        saver.close()
+
+
+@pytest.mark.parametrize("make_saver", ["memory", "sqlite"])
+def test_removed_messages_are_stored_as_a_snapshot(make_saver, tmp_path):
+    if make_saver == "memory":
+        saver = BoundedMemorySaver(snapshot_every=4)
+    else:
+        saver = DurableSqliteSaver(
+            str(tmp_path / "checkpoints.db"), snapshot_every=4, compact_interval=None
+        )
+    graph = _graph(saver)
+    config = {"configurable": {"thread_id": "t"}}
+    _chat(graph, "t", range(3))
+    first = graph.get_state(config).values["messages"][0]
+    graph.update_state(config, {"messages": [RemoveMessage(id=first.id)]})
+    _chat(graph, "t", range(3, 4))
+    messages = _messages(graph, "t")
+    assert len(messages) == 7 and messages[0][1] != first.content
+    if make_saver == "sqlite":
+        saver.close()
+
+
+def test_delta_tracker_snapshots_after_limit_and_on_rewrite():
+    tracker = DeltaTracker(snapshot_every=3)
+    a, b, c, d = "a", "b", "c", "d"
+    assert tracker.encode("t", "", "messages", "1", [a]).base is None
+    assert tracker.encode("t", "", "messages", "2", [a, b]) == ("1", [b])
+    assert tracker.encode("t", "", "messages", "3", [a, b, c]) == ("2", [c])
+    assert tracker.encode("t", "", "messages", "4", [a, b, c, d]).base is None
+    assert tracker.encode("t", "", "messages", "5", [b, c, d]).base is None
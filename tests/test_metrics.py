@@ -0,0 +1,41 @@
+from fastapi.testclient import TestClient
+
+from langgraph_cb import api
+from langgraph_cb.metrics import Metrics, metrics
+
+
+def test_render_text_format():
+    m = Metrics()
+    m.shed.inc(kind="chat")
+    m.thread_wait.observe(0.003)
+    text = m.render()
+    assert 'langgraph_cb_shed_total{kind="chat"} 1' in text
+    assert 'langgraph_cb_thread_wait_seconds_bucket{le="0.005"} 1' in text
+    assert "langgraph_cb_thread_wait_seconds_count 1" in text
+
+
+def _recorded_by_api() -> list[list[str]]:
+    return [
+        metric.render()
+        for metric in (
+            metrics.interrupts,
+            metrics.shed,
+            metrics.admission_wait,
+            metrics.thread_rejected,
+            metrics.thread_wait,
+        )
+    ]
+
+
+def test_api_records_nothing_when_disabled(monkeypatch):
+    # Callbacks and the HTTP middleware are wired at import; this covers
+    # what the handlers record themselves.
+    monkeypatch.setattr(metrics, "enabled", False)
+    before = _recorded_by_api()
+    with TestClient(api.app) as client:
+        parked = client.post("/chat", json={"message": "Buy 2 MSFT"}).json()
+        assert parked["status"] == "approval_required"
+    api._shed("chat", 1)
+    api._thread_busy(parked["thread_id"])
+    assert _recorded_by_api() == before
+    assert metrics.callbacks() == []
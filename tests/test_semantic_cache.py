@@ -0,0 +1,106 @@
+import re
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from langgraph_cb.cache.semantic import SemanticAnswerCache, cacheable_question
+from langgraph_cb.graphs.hitl import build_graph
+from langgraph_cb.graphs.messages import opening_question
+from langgraph_cb.graphs.multiagent import build_multiagent_graph
+from langgraph_cb.models.fake import FakeChatModel
+
+_TOLD = re.compile(r"(my name|the code word) is (\w+)", re.IGNORECASE)
+
+
+def _remembering(messages):
+    """Answers from what earlier turns of the thread said, like a real model."""
+    question = str(messages[-1].content)
+    for message in messages[:-1]:
+        told = _TOLD.search(str(message.content))
+        if told and told.group(1).lower() in question.lower():
+            return AIMessage(content=f"It is {told.group(2)}.")
+    return AIMessage(content=f"Nobody told me: {question}")
+
+
+def _model(cache=None):
+    return FakeChatModel(script=_remembering, cache=cache)
+
+
+def _ask(graph, thread_id: str, text: str) -> str:
+    config = {"configurable": {"thread_id": thread_id}}
+    state = graph.invoke({"messages": [HumanMessage(content=text)]}, config)
+    return state["messages"][-1].content
+
+
+def _graphs():
+    cache = SemanticAnswerCache()
+    yield cache, build_graph(model_factory=_model, answer_cache=cache, context_tokens=0)
+    cache = SemanticAnswerCache()
+    yield cache, build_multiagent_graph(model_factory=_model, answer_cache=cache, context_tokens=0)
+
+
+def test_answers_do_not_leak_between_threads():
+    for fact, question, secret in (
+        ("The code word is pineapple.", "What is the code word?", "pineapple"),
+        ("My name is Bob.", "What is my name?", "Bob"),
+    ):
+        for cache, graph in _graphs():
+            _ask(graph, "a", fact)
+            assert secret in _ask(graph, "a", question)
+            assert secret not in _ask(graph, "b", question)
+            assert cache.stats["hits"] == 0
+
+
+def test_opening_questions_are_shared():
+    cache = SemanticAnswerCache()
+    graph = build_graph(model_factory=_model, answer_cache=cache, context_tokens=0)
+    first = _ask(graph, "a", "Who discovered penicillin?")
+    assert _ask(graph, "b", "who first discovered penicillin") == first
+    assert cache.stats["hits"] == 1
+
+
+def test_opening_question():
+    human, ai = HumanMessage(content="Who wrote Hamlet?"), AIMessage(content="Shakespeare.")
+    assert opening_question([human]) == "Who wrote Hamlet?"
+    assert opening_question([human], summary="Earlier: ...") is None
+    assert opening_question([human, ai, HumanMessage(content="When?")]) is None
+    assert opening_question([human, ai]) is None
+    assert opening_question([]) is None
+
+
+def test_unsafe_questions_are_never_cached():
+    for question in (
+        "What is the price of AAPL?",
+        "Buy 10 shares of Tesla",
+        "How is the market doing today?",
+        "Who wrote it?",
+        "What is my name?",
+        "What do you know about us?",
+    ):
+        assert not cacheable_question(question), question
+    assert cacheable_question("Can you tell me who wrote Hamlet?")
+    assert cacheable_question("Tell me the capital city of France")
+
+
+def test_numbers_and_negations_must_match():
+    cache = SemanticAnswerCache()
+    cache.update("Is a tomato a fruit?", "Yes.")
+    cache.update("When did world war 1 end?", "1918.")
+    assert cache.lookup("Is a tomato a fruit") == "Yes."
+    assert cache.lookup("Is a tomato not a fruit?") is None
+    assert cache.lookup("Isn't a tomato a fruit?") is None
+    assert cache.lookup("When did world war 2 end?") is None
+
+
+def test_lru_eviction_and_ttl():
+    cache = SemanticAnswerCache(max_entries=2, ttl_seconds=None)
+    cache.update("Who wrote Hamlet?", "Shakespeare.")
+    cache.update("Who painted the Mona Lisa?", "Leonardo.")
+    assert cache.lookup("Who wrote Hamlet?") == "Shakespeare."
+    cache.update("What is the capital of Peru?", "Lima.")
+    assert len(cache) == 2 and cache.stats["evictions"] == 1
+    assert cache.lookup("Who painted the Mona Lisa?") is None
+    assert cache.lookup("Who wrote Hamlet?") == "Shakespeare."
+
+    expired = SemanticAnswerCache(ttl_seconds=1e-9)
+    expired.update("Who wrote Hamlet?", "Shakespeare.")
+    assert expired.lookup("Who wrote Hamlet?") is None
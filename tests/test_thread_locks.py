@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from langgraph_cb.thread_locks import ThreadBusyError, ThreadLocks
+
+
+def test_runs_on_one_thread_go_in_arrival_order():
+    async def main():
+        locks = ThreadLocks(max_waiting=4)
+        order: list[int] = []
+
+        async def run(i: int):
+            async with locks.hold("t"):
+                order.append(i)
+                await asyncio.sleep(0.001)
+
+        await asyncio.gather(*(run(i) for i in range(5)))
+        return locks, order
+
+    locks, order = asyncio.run(main())
+    assert order == [0, 1, 2, 3, 4]
+    assert locks.stats == {"immediate": 1, "queued": 4}
+    assert len(locks) == 0
+
+
+def test_other_threads_do_not_wait():
+    async def main():
+        locks = ThreadLocks()
+        await locks.acquire("a")
+        waited = await asyncio.wait_for(locks.acquire("b"), 1)
+        return locks, waited
+
+    locks, waited = asyncio.run(main())
+    assert waited == 0.0 and len(locks) == 2
+
+
+def test_full_queue_is_rejected_at_once():
+    async def main():
+        locks = ThreadLocks(max_waiting=1)
+        await locks.acquire("t")
+        queued = asyncio.ensure_future(locks.acquire("t"))
+        await asyncio.sleep(0)
+        assert locks.full("t")
+        with pytest.raises(ThreadBusyError):
+            await locks.acquire("t")
+        locks.release("t")
+        await queued
+        locks.release("t")
+        return locks
+
+    locks = asyncio.run(main())
+    assert locks.stats["rejected"] == 1 and len(locks) == 0
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def main():
+        locks = ThreadLocks()
+        await locks.acquire("t")
+        first = asyncio.ensure_future(locks.acquire("t"))
+        second = asyncio.ensure_future(locks.acquire("t"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        locks.release("t")
+        await asyncio.wait_for(second, 1)
+        locks.release("t")
+        return locks
+
+    locks = asyncio.run(main())
+    assert locks.stats["cancelled"] == 1 and len(locks) == 0
+
+
+def test_busy_thread_gets_429():
+    from fastapi import HTTPException
+
+    from langgraph_cb import api
+
+    locks = api._thread_locks
+
+    async def main():
+        await locks.acquire("busy")
+        queued = [asyncio.ensure_future(locks.acquire("busy")) for _ in range(locks.max_waiting)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as rejected:
+            async with api._thread_turn("busy"):
+                pass
+        for turn in queued:
+            locks.release("busy")
+            await turn
+        locks.release("busy")
+        return rejected.value
+
+    rejected = asyncio.run(main())
+    assert rejected.status_code == 429
+    assert not locks.waiting("busy")